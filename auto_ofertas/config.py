@@ -25,6 +25,78 @@ class Config:
     OFERTAS_DIR = os.path.join(UPLOAD_DIR, "ofertas")
     GENERADAS_DIR = os.path.join(UPLOAD_DIR, "generadas")
     
+    # Caché de parseo (clave: SHA-256 del archivo + versión del parser)
+    PARSE_CACHE_ACTIVA = os.getenv("PARSE_CACHE_ACTIVA", "true").lower() == "true"
+    PARSE_CACHE_DIR = os.path.join(UPLOAD_DIR, ".cache", "parseo")
+    PARSE_CACHE_MEMORIA_MB = int(os.getenv("PARSE_CACHE_MEMORIA_MB", "64"))
+    
+    # Caché de texto por página de PDF (clave: hash del content stream de cada página)
+    PAGINAS_CACHE_ACTIVA = os.getenv("PAGINAS_CACHE_ACTIVA", "true").lower() == "true"
+    PAGINAS_CACHE_DIR = os.path.join(UPLOAD_DIR, ".cache", "paginas")
+    PAGINAS_CACHE_MEMORIA_MB = int(os.getenv("PAGINAS_CACHE_MEMORIA_MB", "32"))
+    
+    # Snapshot del corpus histórico en un único archivo para arranques rápidos
+    CORPUS_SNAPSHOT_ACTIVO = os.getenv("CORPUS_SNAPSHOT_ACTIVO", "true").lower() == "true"
+    CORPUS_SNAPSHOT_PATH = os.path.join(UPLOAD_DIR, ".cache", "corpus.snapshot")
+    
+    # Búsqueda de texto completo sobre el corpus histórico (SQLite FTS5)
+    BUSQUEDA_ACTIVA = os.getenv("BUSQUEDA_ACTIVA", "true").lower() == "true"
+    BUSQUEDA_DB_PATH = os.path.join(UPLOAD_DIR, ".cache", "busqueda.sqlite3")
+    BUSQUEDA_POR_PAGINA_MAX = int(os.getenv("BUSQUEDA_POR_PAGINA_MAX", "100"))
+    
+    # Registro de documentos cargados (metadatos, hash y resultado del parseo) para los
+    # listados y conteos; si no existe se reconstruye desde los directorios
+    REGISTRO_DB_PATH = os.path.join(UPLOAD_DIR, ".cache", "registro.sqlite3")
+    
+    # Similitud de las licitaciones nuevas con el corpus histórico (TF-IDF hasheado)
+    SIMILITUD_DIMENSION_BITS = int(os.getenv("SIMILITUD_DIMENSION_BITS", "18"))
+    SIMILITUD_VECINOS = int(os.getenv("SIMILITUD_VECINOS", "5"))
+    
+    # Duplicados al cargar (MinHash/LSH): política (marcar, rechazar o vincular) y
+    # similitud Jaccard estimada desde la que un documento se considera duplicado
+    DUPLICADOS_POLITICA = os.getenv("DUPLICADOS_POLITICA", "marcar").lower()
+    DUPLICADOS_UMBRAL = float(os.getenv("DUPLICADOS_UMBRAL", "0.8"))
+    
+    # Ejemplos históricos por sección canónica incluidos en los prompts (0 = ninguno)
+    # y caracteres de cada ejemplo
+    SECCIONES_EJEMPLOS = int(os.getenv("SECCIONES_EJEMPLOS", "2"))
+    SECCIONES_EJEMPLO_CARACTERES = int(os.getenv("SECCIONES_EJEMPLO_CARACTERES", "600"))
+    
+    # Motor de extracción de PDF: fast (PyPDF2), layout (pdfplumber) o auto
+    PDF_MOTOR = os.getenv("PDF_MOTOR", "layout").lower()
+    # Páginas que se muestrean para elegir el motor (auto) y al validar la capa de texto
+    PDF_AUTO_PAGINAS_MUESTRA = int(os.getenv("PDF_AUTO_PAGINAS_MUESTRA", "3"))
+    PDF_AUTO_DENSIDAD_MIN = int(os.getenv("PDF_AUTO_DENSIDAD_MIN", "200"))
+    
+    # Extracción paralela de PDFs grandes (0 workers = usar todos los CPUs)
+    PDF_EXTRACCION_PARALELA = os.getenv("PDF_EXTRACCION_PARALELA", "false").lower() == "true"
+    PDF_PARALELO_MIN_PAGINAS = int(os.getenv("PDF_PARALELO_MIN_PAGINAS", "40"))
+    PDF_PARALELO_MAX_WORKERS = int(os.getenv("PDF_PARALELO_MAX_WORKERS", "0"))
+    
+    # Parseo de lotes de documentos (carga del corpus histórico; 0 workers = todos los CPUs),
+    # en procesos aislados con el tiempo y la memoria máximos de PARSE_TIMEOUT_S / PARSE_MEMORIA_MAX_MB
+    PARSE_LOTE_MAX_WORKERS = int(os.getenv("PARSE_LOTE_MAX_WORKERS", "0"))
+    
+    # Parseo aislado en procesos reutilizables con tiempo y memoria máximos
+    PARSE_AISLADO = os.getenv("PARSE_AISLADO", "true").lower() == "true"
+    PARSE_AISLADO_WORKERS = int(os.getenv("PARSE_AISLADO_WORKERS", "2"))
+    PARSE_TIMEOUT_S = float(os.getenv("PARSE_TIMEOUT_S", "120"))
+    PARSE_MEMORIA_MAX_MB = int(os.getenv("PARSE_MEMORIA_MAX_MB", "1024"))
+    
+    # Consolidación de secciones: las secciones cortas (menos de SECCIONES_MIN_CARACTERES)
+    # sin evidencia de título real se unen a la anterior y quedan como máximo
+    # SECCIONES_MAX secciones por documento (0 = sin máximo)
+    CONSOLIDAR_SECCIONES = os.getenv("CONSOLIDAR_SECCIONES", "true").lower() == "true"
+    SECCIONES_MAX = int(os.getenv("SECCIONES_MAX", "40"))
+    SECCIONES_MIN_CARACTERES = int(os.getenv("SECCIONES_MIN_CARACTERES", "200"))
+    
+    # Segundos que una generación espera a que termine la carga inicial del corpus
+    # histórico antes de continuar con lo que ya esté cargado
+    CORPUS_ESPERA_MAX_S = float(os.getenv("CORPUS_ESPERA_MAX_S", "10"))
+    
+    # Validación previa de archivos subidos (0 = sin máximo de páginas)
+    VALIDACION_MAX_PAGINAS = int(os.getenv("VALIDACION_MAX_PAGINAS", "0"))
+    
     # Configuración de logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
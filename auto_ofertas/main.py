@@ -1,18 +1,25 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import uuid
 import shutil
 import time
 import logging
-from typing import List, Dict, Any
+from datetime import date
+from typing import List, Dict, Any, Optional
 
 from auto_ofertas.config import Config
 from auto_ofertas.models import GeneracionRequest, GeneracionResponse, LicitacionData, OfertaTecnicaData
-from auto_ofertas.processors.parser import parse_licitacion_dinamica
+from auto_ofertas.processors.parser import parse_licitacion_dinamica, parsear_documento, validar_motor_pdf, normalizar_limites
 from auto_ofertas.processors.ai_generator import AIGenerator
+from auto_ofertas.processors.corpus import TIPO_OFERTA, TIPO_LICITACION
 from auto_ofertas.processors.generator import generar_oferta_avanzada
+from auto_ofertas.processors.validacion import inspeccionar_archivo, ArchivoInvalido
+from auto_ofertas.processors.busqueda_texto import ConsultaInvalida
+from auto_ofertas.processors.duplicados import validar_politica_duplicados
+from auto_ofertas.processors.registro import RegistroDocumentos, TIPO_GENERADA
 
 # Configurar logging
 logger = Config.setup_logging()
@@ -43,17 +50,128 @@ app.add_middleware(
 # Inicializar componentes
 ai_generator = AIGenerator()
 logger.info("🤖 Generador de IA inicializado")
+registro = RegistroDocumentos(Config.REGISTRO_DB_PATH)
+DIRECTORIOS_REGISTRO = {TIPO_LICITACION: Config.LICITACIONES_DIR, TIPO_OFERTA: Config.OFERTAS_DIR,
+                        TIPO_GENERADA: Config.GENERADAS_DIR}
 
-@app.on_event("startup")
-async def startup_event():
-    """Cargar datos históricos al iniciar la aplicación"""
-    logger.info("📚 Iniciando carga de datos históricos...")
+def _validar_motor_pdf(motor_pdf: Optional[str]) -> str:
+    """Valida el motor de extracción de PDF solicitado en la petición"""
+    try:
+        return validar_motor_pdf(motor_pdf)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _validar_limites(max_paginas: Optional[int], paginas: Optional[str],
+                     max_secciones: Optional[int], max_caracteres: Optional[int]) -> Optional[Dict[str, Any]]:
+    """Valida las opciones de parseo parcial solicitadas en la petición"""
     try:
-        ai_generator.cargar_datos_historicos(Config.OFERTAS_DIR, Config.LICITACIONES_DIR)
-        logger.info("✅ Datos históricos cargados correctamente")
+        return normalizar_limites(max_paginas, paginas, max_secciones, max_caracteres)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _validar_politica_duplicados(politica: Optional[str]) -> str:
+    """Valida la política ante duplicados solicitada en la petición"""
+    try:
+        return validar_politica_duplicados(politica)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _buscar_duplicados(tipo: str, file_path: str, secciones: Dict[str, Any], politica: str) -> List[Dict[str, Any]]:
+    """
+    Busca el documento recién parseado entre los históricos del mismo tipo. Si es un
+    duplicado y la política no es `marcar` elimina el archivo subido; con `rechazar`
+    responde 409 y con `vincular` el llamador devuelve el documento existente
+    """
+    duplicados = ai_generator.corpus.duplicados(tipo, secciones, Config.DUPLICADOS_UMBRAL, excluir=file_path)
+    if not duplicados:
+        return duplicados
+    logger.info(f"♊ {os.path.basename(file_path)} duplica a {duplicados[0]['archivo']} "
+                f"(similitud {duplicados[0]['similitud']}, política: {politica})")
+    if politica != "marcar":
+        os.remove(file_path)
+    if politica == "rechazar":
+        raise HTTPException(status_code=409, detail={
+            "mensaje": f"El documento ya existe en el corpus histórico: {duplicados[0]['archivo']}",
+            "duplicados": duplicados
+        })
+    return duplicados
+
+def _validar_archivo(file_path: str, nombre: str) -> Dict[str, Any]:
+    """Validación previa del archivo subido: si no se puede procesar lo elimina y responde 400"""
+    try:
+        propiedades = inspeccionar_archivo(file_path, nombre)
+    except ArchivoInvalido as e:
+        logger.warning(f"❌ Archivo rechazado en la validación previa: {e}")
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"🔎 Validación previa de {nombre} en {propiedades['tiempo_ms']}ms: {propiedades}")
+    return propiedades
+
+def _registrar_documento(tipo: str, file_path: str, datos: Optional[Dict[str, Any]] = None):
+    """Registra el archivo cargado reutilizando el hash que calculó el corpus si lo incorporó"""
+    entrada = ai_generator.corpus.snapshot.entrada(file_path)
+    registro.registrar(tipo, file_path, datos, sha256=entrada.sha256 if entrada is not None else None)
+
+def _sincronizar_registro(snapshot=None):
+    """
+    Concilia el registro de documentos con los directorios (lo reconstruye si la base
+    no existía) tomando del corpus los documentos ya parseados
+    """
+    try:
+        cambios = registro.sincronizar(DIRECTORIOS_REGISTRO, snapshot)
     except Exception as e:
-        logger.error(f"❌ Error cargando datos históricos: {e}")
-        logger.exception("Detalles del error:")
+        logger.error(f"❌ Error sincronizando el registro de documentos: {e}")
+        return
+    if registro.reconstruido:
+        registro.reconstruido = False
+        logger.info(f"🗂️ Registro de documentos reconstruido desde los directorios: {cambios}")
+    elif any(cambios.values()):
+        logger.info(f"🗂️ Registro de documentos sincronizado: {cambios}")
+
+async def _listado_registro(tipo: str, clave: str) -> Response:
+    """
+    Listado de los documentos del tipo desde el registro. Los pendientes (copiados a mano
+    o cargados con parseo parcial) se parsean una sola vez, ahora, y quedan guardados
+    """
+    if registro.pendientes(tipo):
+        parseados = await run_in_threadpool(registro.parsear_pendientes, tipo, DIRECTORIOS_REGISTRO[tipo])
+        logger.info(f"🗂️ {parseados} documentos pendientes de tipo {tipo} parseados y registrados")
+    lista, total = await run_in_threadpool(registro.listado_json, tipo)
+    # El resultado del parseo ya está serializado: se devuelve sin volver a convertirlo
+    return Response(content=f'{{"{clave}": {lista}, "total": {total}}}', media_type="application/json")
+
+async def _esperar_datos_historicos():
+    """
+    Si la carga inicial del corpus histórico no terminó, espera (sin bloquear el event
+    loop) como máximo Config.CORPUS_ESPERA_MAX_S y continúa con lo ya cargado
+    """
+    if ai_generator.corpus.listo.is_set():
+        return
+    logger.info(f"⏳ Esperando la carga de datos históricos (máximo {Config.CORPUS_ESPERA_MAX_S:g}s)...")
+    if not await run_in_threadpool(ai_generator.esperar_datos_historicos, Config.CORPUS_ESPERA_MAX_S):
+        progreso = ai_generator.corpus.progreso()
+        logger.warning(f"⚠️ Generando con el corpus parcial: {progreso['documentos_cargados']}/"
+                       f"{progreso['documentos_total']} documentos cargados")
+
+@app.on_event("startup")
+async def startup_event():
+    """Iniciar la carga de datos históricos en segundo plano sin demorar el arranque"""
+    logger.info("📚 Iniciando carga de datos históricos en segundo plano...")
+    futuro = ai_generator.recargar_datos_historicos(Config.OFERTAS_DIR, Config.LICITACIONES_DIR)
+    
+    def _informar(futuro):
+        if futuro.exception() is not None:
+            logger.error(f"❌ Error cargando datos históricos: {futuro.exception()}")
+        else:
+            progreso = ai_generator.corpus.progreso()
+            logger.info(f"✅ Datos históricos cargados: {progreso['documentos_cargados']} documentos "
+                        f"en {progreso.get('tiempo_s')}s")
+            # Los documentos que el registro tenía pendientes toman el parseo del corpus
+            _sincronizar_registro(ai_generator.corpus.snapshot)
+    futuro.add_done_callback(_informar)
+    # Solo recorre los directorios (sin parsear): los listados quedan disponibles de inmediato
+    await run_in_threadpool(_sincronizar_registro)
 
 @app.get("/")
 async def root():
@@ -71,19 +189,38 @@ async def root():
             "generar_oferta_estructurada": "POST /generar-oferta-estructurada/",
             "listar_licitaciones": "GET /licitaciones/",
             "listar_ofertas": "GET /ofertas/",
-            "descargar_archivo": "GET /descargar/{tipo}/{filename}"
+            "buscar": "GET /buscar/?q=...",
+            "informe_duplicados": "GET /duplicados/",
+            "descargar_archivo": "GET /descargar/{tipo}/{filename}",
+            "recargar_historicos": "POST /recargar-historicos/",
+            "listo": "GET /listo/"
         }
     }
 
 @app.post("/cargar-licitacion/")
-async def cargar_licitacion(file: UploadFile = File(...)):
-    """Carga una licitación en formato Word o PDF"""
+async def cargar_licitacion(
+    file: UploadFile = File(...),
+    motor_pdf: Optional[str] = None,
+    max_paginas: Optional[int] = None,
+    paginas: Optional[str] = None,
+    max_secciones: Optional[int] = None,
+    max_caracteres: Optional[int] = None,
+    politica_duplicados: Optional[str] = None
+):
+    """
+    Carga una licitación en formato Word o PDF. Si duplica a una licitación histórica
+    se informa, se rechaza o se vincula a la existente según `politica_duplicados`
+    (marcar, rechazar o vincular; por defecto Config.DUPLICADOS_POLITICA)
+    """
     start_time = time.time()
     logger.info(f"📄 Iniciando carga de licitación: {file.filename}")
     
     if not (file.filename.endswith('.docx') or file.filename.endswith('.pdf')):
         logger.warning(f"❌ Formato de archivo no válido: {file.filename}")
         raise HTTPException(status_code=400, detail="Solo se aceptan archivos .docx y .pdf")
+    motor_pdf = _validar_motor_pdf(motor_pdf)
+    limites = _validar_limites(max_paginas, paginas, max_secciones, max_caracteres)
+    politica_duplicados = _validar_politica_duplicados(politica_duplicados)
     
     # Generar nombre único manteniendo la extensión original
     file_id = str(uuid.uuid4())
@@ -101,21 +238,44 @@ async def cargar_licitacion(file: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"❌ Error guardando archivo: {e}")
         raise HTTPException(status_code=500, detail=f"Error guardando archivo: {str(e)}")
+    propiedades_archivo = await run_in_threadpool(_validar_archivo, file_path, file.filename)
     
     # Parsear licitación
     logger.info(f"🔍 Iniciando parsing de licitación: {filename}")
     try:
-        licitacion_data = parse_licitacion_dinamica(file_path)
+        resultado = await run_in_threadpool(parsear_documento, file_path, motor_pdf=motor_pdf, limites=limites)
+        licitacion_data = resultado["secciones"]
+        duplicados = []
+        vinculado = False
+        if not limites:
+            # Un parseo parcial no se compara ni se incorpora; la licitación entra en la próxima sincronización
+            duplicados = await run_in_threadpool(_buscar_duplicados, TIPO_LICITACION, file_path, licitacion_data,
+                                                  politica_duplicados)
+            vinculado = bool(duplicados) and politica_duplicados == "vincular"
+            if not vinculado:
+                await run_in_threadpool(ai_generator.agregar_documento_historico, TIPO_LICITACION, file_path,
+                                        licitacion_data)
+                await run_in_threadpool(_registrar_documento, TIPO_LICITACION, file_path, licitacion_data)
+        else:
+            # Queda pendiente: el listado parseará el documento completo
+            await run_in_threadpool(_registrar_documento, TIPO_LICITACION, file_path)
         tiempo_procesamiento = round(time.time() - start_time, 2)
         logger.info(f"✅ Licitación procesada exitosamente en {tiempo_procesamiento}s")
         logger.info(f"📊 Secciones extraídas: {len(licitacion_data)}")
         
         return {
-            "mensaje": "Licitación cargada exitosamente",
-            "archivo": filename,
+            "mensaje": "La licitación ya existía: se vinculó a la existente" if vinculado
+                       else "Licitación cargada exitosamente",
+            "archivo": duplicados[0]["archivo"] if vinculado else filename,
             "datos_extraidos": licitacion_data,
+            "propiedades_archivo": propiedades_archivo,
+            "metadatos_parseo": resultado["metadatos"],
+            "duplicados": duplicados,
+            "vinculado": vinculado,
             "tiempo_procesamiento": tiempo_procesamiento
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error procesando licitación: {e}")
         logger.exception("Detalles del error:")
@@ -126,14 +286,21 @@ async def cargar_licitacion(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Error procesando licitación: {str(e)}")
 
 @app.post("/cargar-oferta/")
-async def cargar_oferta(file: UploadFile = File(...)):
-    """Carga una oferta técnica histórica en formato Word o PDF"""
+async def cargar_oferta(file: UploadFile = File(...), motor_pdf: Optional[str] = None,
+                       politica_duplicados: Optional[str] = None):
+    """
+    Carga una oferta técnica histórica en formato Word o PDF. Si duplica a una oferta
+    histórica se informa, se rechaza o se vincula a la existente según
+    `politica_duplicados` (marcar, rechazar o vincular; por defecto Config.DUPLICADOS_POLITICA)
+    """
     start_time = time.time()
     logger.info(f"📄 Iniciando carga de oferta técnica: {file.filename}")
     
     if not (file.filename.endswith('.docx') or file.filename.endswith('.pdf')):
         logger.warning(f"❌ Formato de archivo no válido: {file.filename}")
         raise HTTPException(status_code=400, detail="Solo se aceptan archivos .docx y .pdf")
+    motor_pdf = _validar_motor_pdf(motor_pdf)
+    politica_duplicados = _validar_politica_duplicados(politica_duplicados)
     
     # Generar nombre único manteniendo la extensión original
     file_id = str(uuid.uuid4())
@@ -151,26 +318,38 @@ async def cargar_oferta(file: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"❌ Error guardando archivo: {e}")
         raise HTTPException(status_code=500, detail=f"Error guardando archivo: {str(e)}")
+    propiedades_archivo = await run_in_threadpool(_validar_archivo, file_path, file.filename)
     
     # Parsear oferta
     logger.info(f"🔍 Iniciando parsing de oferta técnica: {filename}")
     try:
-        oferta_data = parse_licitacion_dinamica(file_path)
+        resultado = await run_in_threadpool(parsear_documento, file_path, motor_pdf=motor_pdf)
+        oferta_data = resultado["secciones"]
+        duplicados = await run_in_threadpool(_buscar_duplicados, TIPO_OFERTA, file_path, oferta_data, politica_duplicados)
+        vinculado = bool(duplicados) and politica_duplicados == "vincular"
         
-        logger.info("🔄 Recargando datos históricos...")
-        # Recargar datos históricos para incluir la nueva oferta
-        ai_generator.cargar_datos_historicos(Config.OFERTAS_DIR, Config.LICITACIONES_DIR)
+        # Incorporar solo la nueva oferta a los datos históricos
+        if not vinculado:
+            await run_in_threadpool(ai_generator.agregar_documento_historico, TIPO_OFERTA, file_path, oferta_data)
+            await run_in_threadpool(_registrar_documento, TIPO_OFERTA, file_path, oferta_data)
         
         tiempo_procesamiento = round(time.time() - start_time, 2)
         logger.info(f"✅ Oferta técnica procesada exitosamente en {tiempo_procesamiento}s")
         logger.info(f"📊 Secciones extraídas: {len(oferta_data)}")
         
         return {
-            "mensaje": "Oferta técnica cargada exitosamente",
-            "archivo": filename,
+            "mensaje": "La oferta técnica ya existía: se vinculó a la existente" if vinculado
+                       else "Oferta técnica cargada exitosamente",
+            "archivo": duplicados[0]["archivo"] if vinculado else filename,
             "datos_extraidos": oferta_data,
+            "propiedades_archivo": propiedades_archivo,
+            "metadatos_parseo": resultado["metadatos"],
+            "duplicados": duplicados,
+            "vinculado": vinculado,
             "tiempo_procesamiento": tiempo_procesamiento
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Error procesando oferta: {e}")
         logger.exception("Detalles del error:")
@@ -189,13 +368,22 @@ async def generar_oferta_api(request: GeneracionRequest):
     licitacion_path = os.path.join(Config.LICITACIONES_DIR, request.licitacion_id)
     if not os.path.exists(licitacion_path):
         raise HTTPException(status_code=404, detail="Licitación no encontrada")
+    motor_pdf = _validar_motor_pdf(request.motor_pdf)
+    limites = _validar_limites(request.max_paginas, request.paginas, request.max_secciones, request.max_caracteres)
     
     try:
+        await _esperar_datos_historicos()
+        licitacion_dict = await run_in_threadpool(parse_licitacion_dinamica, licitacion_path,
+                                                  motor_pdf=motor_pdf, limites=limites)
+        similitud = await run_in_threadpool(ai_generator.similitud_historica, [licitacion_dict])
         # Generar oferta usando contexto histórico
         resultado_json = ai_generator.generar_oferta_json_dinamico(
             licitacion_path=licitacion_path,
             empresa_nombre=request.empresa_nombre,
-            empresa_descripcion=request.empresa_descripcion or ""
+            empresa_descripcion=request.empresa_descripcion or "",
+            motor_pdf=motor_pdf,
+            limites=limites,
+            licitacion_dict=licitacion_dict
         )
         
         tiempo_generacion = round(time.time() - start_time, 2)
@@ -210,12 +398,15 @@ async def generar_oferta_api(request: GeneracionRequest):
                 "ofertas_historicas": len(ai_generator.ofertas_historicas),
                 "licitaciones_historicas": len(ai_generator.licitaciones_historicas)
             },
+            **similitud,
             "oferta_json": resultado_json,
             "mensaje": f"Oferta generada exitosamente usando {len(ai_generator.ofertas_historicas)} ofertas históricas como base de conocimiento"
         }
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generando oferta: {str(e)}")
 
@@ -223,7 +414,12 @@ async def generar_oferta_api(request: GeneracionRequest):
 async def generar_oferta_desde_archivo(
     licitacion_file: UploadFile = File(...),
     empresa_nombre: str = "GUX Technologies",
-    empresa_descripcion: str = ""
+    empresa_descripcion: str = "",
+    motor_pdf: Optional[str] = None,
+    max_paginas: Optional[int] = None,
+    paginas: Optional[str] = None,
+    max_secciones: Optional[int] = None,
+    max_caracteres: Optional[int] = None
 ):
     """Genera una oferta técnica desde un archivo de licitación subido usando contexto histórico"""
     import time
@@ -231,6 +427,8 @@ async def generar_oferta_desde_archivo(
     
     if not (licitacion_file.filename.endswith('.docx') or licitacion_file.filename.endswith('.pdf')):
         raise HTTPException(status_code=400, detail="Solo se aceptan archivos .docx y .pdf")
+    motor_pdf = _validar_motor_pdf(motor_pdf)
+    limites = _validar_limites(max_paginas, paginas, max_secciones, max_caracteres)
     
     # Guardar archivo temporalmente manteniendo la extensión original
     temp_file_id = str(uuid.uuid4())
@@ -241,12 +439,20 @@ async def generar_oferta_desde_archivo(
     try:
         with open(temp_file_path, "wb") as f:
             shutil.copyfileobj(licitacion_file.file, f)
+        propiedades_archivo = await run_in_threadpool(_validar_archivo, temp_file_path, licitacion_file.filename)
         
+        await _esperar_datos_historicos()
+        licitacion_dict = await run_in_threadpool(parse_licitacion_dinamica, temp_file_path,
+                                                  motor_pdf=motor_pdf, limites=limites)
+        similitud = await run_in_threadpool(ai_generator.similitud_historica, [licitacion_dict])
         # Generar oferta usando contexto histórico
         resultado_json = ai_generator.generar_oferta_json_dinamico(
             licitacion_path=temp_file_path,
             empresa_nombre=empresa_nombre,
-            empresa_descripcion=empresa_descripcion
+            empresa_descripcion=empresa_descripcion,
+            motor_pdf=motor_pdf,
+            limites=limites,
+            licitacion_dict=licitacion_dict
         )
         
         tiempo_generacion = round(time.time() - start_time, 2)
@@ -255,18 +461,22 @@ async def generar_oferta_desde_archivo(
         response = {
             "id": str(uuid.uuid4()),
             "archivo": licitacion_file.filename,
+            "propiedades_archivo": propiedades_archivo,
             "empresa": empresa_nombre,
             "tiempo_generacion": tiempo_generacion,
             "datos_historicos_usados": {
                 "ofertas_historicas": len(ai_generator.ofertas_historicas),
                 "licitaciones_historicas": len(ai_generator.licitaciones_historicas)
             },
+            **similitud,
             "oferta_json": resultado_json,
             "mensaje": f"Oferta generada exitosamente usando {len(ai_generator.ofertas_historicas)} ofertas históricas como base de conocimiento"
         }
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generando oferta: {str(e)}")
     finally:
@@ -278,7 +488,12 @@ async def generar_oferta_desde_archivo(
 async def generar_oferta_multiple(
     licitacion_files: List[UploadFile] = File(...),
     empresa_nombre: str = "GUX Technologies",
-    empresa_descripcion: str = ""
+    empresa_descripcion: str = "",
+    motor_pdf: Optional[str] = None,
+    max_paginas: Optional[int] = None,
+    paginas: Optional[str] = None,
+    max_secciones: Optional[int] = None,
+    max_caracteres: Optional[int] = None
 ):
     """Genera la mejor oferta técnica analizando múltiples archivos de licitación usando contexto histórico y IA para calcular todos los parámetros"""
     start_time = time.time()
@@ -297,6 +512,8 @@ async def generar_oferta_multiple(
         if not (file.filename.endswith('.docx') or file.filename.endswith('.pdf')):
             logger.warning(f"❌ [{request_id}] Formato de archivo no válido: {file.filename}")
             raise HTTPException(status_code=400, detail=f"Archivo {file.filename} no es un archivo .docx o .pdf válido")
+    motor_pdf = _validar_motor_pdf(motor_pdf)
+    limites = _validar_limites(max_paginas, paginas, max_secciones, max_caracteres)
     
     # Procesar todos los archivos
     licitaciones_procesadas = []
@@ -324,15 +541,18 @@ async def generar_oferta_multiple(
             except Exception as e:
                 logger.error(f"❌ [{request_id}] Error guardando archivo temporal: {e}")
                 raise HTTPException(status_code=500, detail=f"Error guardando archivo temporal: {str(e)}")
+            propiedades_archivo = await run_in_threadpool(_validar_archivo, temp_file_path, licitacion_file.filename)
             
             # Parsear licitación
             try:
                 logger.info(f"🔍 [{request_id}] Iniciando parsing de: {licitacion_file.filename}")
-                licitacion_data = parse_licitacion_dinamica(temp_file_path)
+                licitacion_data = await run_in_threadpool(parse_licitacion_dinamica, temp_file_path,
+                                                          motor_pdf=motor_pdf, limites=limites)
                 licitaciones_procesadas.append({
                     "archivo": licitacion_file.filename,
                     "datos": licitacion_data,
-                    "ruta": temp_file_path
+                    "ruta": temp_file_path,
+                    "propiedades_archivo": propiedades_archivo
                 })
                 logger.info(f"✅ [{request_id}] Parsing completado: {licitacion_file.filename} - {len(licitacion_data)} secciones")
             except Exception as e:
@@ -343,6 +563,9 @@ async def generar_oferta_multiple(
         logger.info(f"✅ [{request_id}] Todos los archivos procesados exitosamente")
         logger.info(f"🤖 [{request_id}] Iniciando generación de oferta con IA...")
         
+        await _esperar_datos_historicos()
+        similitud = await run_in_threadpool(ai_generator.similitud_historica,
+                                            [lic["datos"] for lic in licitaciones_procesadas])
         # Generar oferta usando el método mejorado que calcula todos los parámetros con IA
         resultado_json = ai_generator.generar_oferta_multiple_licitaciones(
             licitaciones=licitaciones_procesadas,
@@ -359,6 +582,7 @@ async def generar_oferta_multiple(
         response = {
             "id": request_id,
             "archivos_procesados": [lic["archivo"] for lic in licitaciones_procesadas],
+            "propiedades_archivos": {lic["archivo"]: lic["propiedades_archivo"] for lic in licitaciones_procesadas},
             "total_archivos": len(licitaciones_procesadas),
             "empresa": empresa_nombre,
             "tiempo_generacion": tiempo_generacion,
@@ -366,6 +590,7 @@ async def generar_oferta_multiple(
                 "ofertas_historicas": len(ai_generator.ofertas_historicas),
                 "licitaciones_historicas": len(ai_generator.licitaciones_historicas)
             },
+            **similitud,
             "oferta_json": resultado_json,
             "mensaje": f"Oferta generada exitosamente analizando {len(licitaciones_procesadas)} archivos usando {len(ai_generator.ofertas_historicas)} ofertas históricas como base de conocimiento. Todos los parámetros fueron calculados automáticamente por IA."
         }
@@ -373,6 +598,8 @@ async def generar_oferta_multiple(
         logger.info(f"✅ [{request_id}] Respuesta preparada y enviada")
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ [{request_id}] Error general en generación de oferta: {e}")
         logger.exception("Detalles del error:")
@@ -398,7 +625,12 @@ async def generar_oferta_estructurada(
     cliente: str = "Cliente",
     fecha: str = "2025",
     costo_total: int = 45000000,
-    plazo: str = "5 meses"
+    plazo: str = "5 meses",
+    motor_pdf: Optional[str] = None,
+    max_paginas: Optional[int] = None,
+    paginas: Optional[str] = None,
+    max_secciones: Optional[int] = None,
+    max_caracteres: Optional[int] = None
 ):
     """Genera una oferta técnica en formato estructurado con secciones organizadas"""
     import time
@@ -411,6 +643,8 @@ async def generar_oferta_estructurada(
     for file in licitacion_files:
         if not (file.filename.endswith('.docx') or file.filename.endswith('.pdf')):
             raise HTTPException(status_code=400, detail=f"Archivo {file.filename} no es un archivo .docx o .pdf válido")
+    motor_pdf = _validar_motor_pdf(motor_pdf)
+    limites = _validar_limites(max_paginas, paginas, max_secciones, max_caracteres)
     
     # Procesar todos los archivos
     licitaciones_procesadas = []
@@ -427,18 +661,24 @@ async def generar_oferta_estructurada(
             
             with open(temp_file_path, "wb") as f:
                 shutil.copyfileobj(licitacion_file.file, f)
+            propiedades_archivo = await run_in_threadpool(_validar_archivo, temp_file_path, licitacion_file.filename)
             
             # Parsear licitación
             try:
-                licitacion_data = parse_licitacion_dinamica(temp_file_path)
+                licitacion_data = await run_in_threadpool(parse_licitacion_dinamica, temp_file_path,
+                                                          motor_pdf=motor_pdf, limites=limites)
                 licitaciones_procesadas.append({
                     "archivo": licitacion_file.filename,
                     "datos": licitacion_data,
-                    "ruta": temp_file_path
+                    "ruta": temp_file_path,
+                    "propiedades_archivo": propiedades_archivo
                 })
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Error procesando {licitacion_file.filename}: {str(e)}")
         
+        await _esperar_datos_historicos()
+        similitud = await run_in_threadpool(ai_generator.similitud_historica,
+                                            [lic["datos"] for lic in licitaciones_procesadas])
         # Generar oferta estructurada
         oferta_estructurada = ai_generator.generar_oferta_estructurada(
             licitaciones=licitaciones_procesadas,
@@ -457,6 +697,7 @@ async def generar_oferta_estructurada(
         oferta_estructurada["metadata"] = {
             "id": str(uuid.uuid4()),
             "archivos_procesados": [lic["archivo"] for lic in licitaciones_procesadas],
+            "propiedades_archivos": {lic["archivo"]: lic["propiedades_archivo"] for lic in licitaciones_procesadas},
             "total_archivos": len(licitaciones_procesadas),
             "empresa": empresa_nombre,
             "tiempo_generacion": tiempo_generacion,
@@ -464,11 +705,14 @@ async def generar_oferta_estructurada(
                 "ofertas_historicas": len(ai_generator.ofertas_historicas),
                 "licitaciones_historicas": len(ai_generator.licitaciones_historicas)
             },
+            **similitud,
             "mensaje": f"Oferta estructurada generada exitosamente analizando {len(licitaciones_procesadas)} archivos usando {len(ai_generator.ofertas_historicas)} ofertas históricas como base de conocimiento"
         }
         
         return oferta_estructurada
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generando oferta: {str(e)}")
     finally:
@@ -477,73 +721,72 @@ async def generar_oferta_estructurada(
             if os.path.exists(temp_file):
                 os.remove(temp_file)
 
+@app.get("/buscar/")
+async def buscar(q: str, tipo: Optional[str] = None, desde: Optional[str] = None,
+                 hasta: Optional[str] = None, pagina: int = 1, por_pagina: int = 20):
+    """
+    Búsqueda de texto completo en los títulos y el contenido de las secciones de ofertas
+    y licitaciones históricas. `q` admite "frases exactas", prefijos (`implementa*`) y
+    los operadores OR y NOT; `tipo` (oferta o licitacion) y `desde` / `hasta`
+    (YYYY-MM-DD, fecha del archivo) filtran los documentos
+    """
+    if tipo is not None and tipo not in (TIPO_OFERTA, TIPO_LICITACION):
+        raise HTTPException(status_code=400, detail=f"Tipo inválido: use '{TIPO_OFERTA}' o '{TIPO_LICITACION}'")
+    for nombre, valor in (("desde", desde), ("hasta", hasta)):
+        if valor is not None:
+            try:
+                date.fromisoformat(valor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Fecha '{nombre}' inválida: use el formato YYYY-MM-DD")
+    if pagina < 1 or not 1 <= por_pagina <= Config.BUSQUEDA_POR_PAGINA_MAX:
+        raise HTTPException(status_code=400, detail=f"Paginación inválida: pagina >= 1 y "
+                                                    f"por_pagina entre 1 y {Config.BUSQUEDA_POR_PAGINA_MAX}")
+    try:
+        resultado = await run_in_threadpool(ai_generator.corpus.buscar_texto, q, tipo=tipo, desde=desde,
+                                            hasta=hasta, pagina=pagina, por_pagina=por_pagina)
+    except ConsultaInvalida as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    logger.info(f"🔎 Búsqueda '{q}': {resultado['total']} resultados en {resultado['tiempo_ms']}ms")
+    return resultado
+
+@app.get("/duplicados/")
+async def informe_duplicados(umbral: Optional[float] = None):
+    """
+    Informe de duplicados del corpus histórico: grupos de ofertas (o de licitaciones)
+    con similitud estimada >= `umbral` (por defecto Config.DUPLICADOS_UMBRAL)
+    """
+    umbral = Config.DUPLICADOS_UMBRAL if umbral is None else umbral
+    if not 0 < umbral <= 1:
+        raise HTTPException(status_code=400, detail="El umbral debe estar entre 0 y 1")
+    inicio = time.perf_counter()
+    informe = await run_in_threadpool(ai_generator.corpus.informe_duplicados, umbral)
+    informe["tiempo_ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+    logger.info(f"♊ Informe de duplicados: {len(informe['grupos'])} grupos, "
+                f"{informe['documentos_redundantes']} documentos redundantes en {informe['tiempo_ms']}ms")
+    return informe
+
 @app.get("/licitaciones/")
 async def listar_licitaciones():
     """Lista todas las licitaciones cargadas"""
     logger.info("📋 Consulta de listado de licitaciones")
-    
-    licitaciones = []
-    archivos_encontrados = 0
-    archivos_procesados = 0
-    archivos_con_error = 0
-    
-    for filename in os.listdir(Config.LICITACIONES_DIR):
-        if filename.endswith('.docx') or filename.endswith('.pdf'):
-            archivos_encontrados += 1
-            file_path = os.path.join(Config.LICITACIONES_DIR, filename)
-            try:
-                logger.debug(f"🔍 Procesando licitación: {filename}")
-                licitacion_data = parse_licitacion_dinamica(file_path)
-                licitaciones.append({
-                    "archivo": filename,
-                    "datos": licitacion_data
-                })
-                archivos_procesados += 1
-            except Exception as e:
-                logger.warning(f"⚠️ Error procesando licitación {filename}: {e}")
-                licitaciones.append({
-                    "archivo": filename,
-                    "error": str(e)
-                })
-                archivos_con_error += 1
-    
-    logger.info(f"✅ Listado completado: {archivos_procesados} procesados, {archivos_con_error} con error, {archivos_encontrados} total")
-    return {"licitaciones": licitaciones, "total": len(licitaciones)}
+    return await _listado_registro(TIPO_LICITACION, "licitaciones")
 
 @app.get("/ofertas/")
 async def listar_ofertas():
     """Lista todas las ofertas técnicas históricas cargadas"""
-    ofertas = []
-    
-    for filename in os.listdir(Config.OFERTAS_DIR):
-        if filename.endswith('.docx') or filename.endswith('.pdf'):
-            file_path = os.path.join(Config.OFERTAS_DIR, filename)
-            try:
-                oferta_data = parse_licitacion_dinamica(file_path)
-                ofertas.append({
-                    "archivo": filename,
-                    "datos": oferta_data
-                })
-            except Exception as e:
-                ofertas.append({
-                    "archivo": filename,
-                    "error": str(e)
-                })
-    
-    return {"ofertas": ofertas, "total": len(ofertas)}
+    return await _listado_registro(TIPO_OFERTA, "ofertas")
 
 @app.get("/generadas/")
 async def listar_ofertas_generadas():
     """Lista todas las ofertas generadas automáticamente"""
-    ofertas_generadas = []
-    
-    for filename in os.listdir(Config.GENERADAS_DIR):
-        if filename.endswith('.docx') or filename.endswith('.pdf'):
-            ofertas_generadas.append({
-                "archivo": filename,
-                "fecha_generacion": os.path.getctime(os.path.join(Config.GENERADAS_DIR, filename))
-            })
-    
+    # Ningún endpoint escribe en el directorio de generadas: se concilia con el disco
+    # (listdir + stat; solo se hashean los archivos nuevos) antes de listar
+    await run_in_threadpool(registro.sincronizar, {TIPO_GENERADA: Config.GENERADAS_DIR})
+    documentos = await run_in_threadpool(registro.listar, TIPO_GENERADA)
+    ofertas_generadas = [{"archivo": documento["archivo"], "fecha_generacion": documento["fecha"]}
+                         for documento in documentos]
     return {"ofertas_generadas": ofertas_generadas, "total": len(ofertas_generadas)}
 
 @app.get("/descargar/{tipo}/{filename}")
@@ -595,28 +838,52 @@ async def eliminar_archivo(tipo: str, filename: str):
     
     try:
         os.remove(file_path)
+        await run_in_threadpool(registro.eliminar, tipo, filename)
         
-        # Recargar datos históricos si se eliminó una oferta
-        if tipo == "oferta":
-            ai_generator.cargar_datos_historicos(Config.OFERTAS_DIR, Config.LICITACIONES_DIR)
+        # Quitar solo este documento de los datos históricos
+        if tipo in (TIPO_OFERTA, TIPO_LICITACION):
+            await run_in_threadpool(ai_generator.eliminar_documento_historico, file_path)
         
         return {"mensaje": f"Archivo {filename} eliminado exitosamente"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error eliminando archivo: {str(e)}")
 
+@app.post("/recargar-historicos/", status_code=202)
+async def recargar_historicos():
+    """Sincroniza en segundo plano los datos históricos con los directorios (archivos copiados a mano)"""
+    logger.info("🔄 Programando sincronización de datos históricos en segundo plano")
+    futuro = ai_generator.recargar_datos_historicos(Config.OFERTAS_DIR, Config.LICITACIONES_DIR)
+    # El registro se concilia con los directorios al terminar, con lo que el corpus ya parseó
+    futuro.add_done_callback(lambda futuro: _sincronizar_registro(ai_generator.corpus.snapshot))
+    snapshot = ai_generator.corpus.snapshot
+    return {
+        "mensaje": "Sincronización de datos históricos programada",
+        "version_corpus": snapshot.version,
+        "ofertas_historicas": len(snapshot.ofertas),
+        "licitaciones_historicas": len(snapshot.licitaciones)
+    }
+
+@app.get("/listo/")
+async def listo():
+    """Readiness: 200 cuando terminó la carga inicial del corpus histórico, 503 mientras tanto"""
+    progreso = ai_generator.corpus.progreso()
+    return JSONResponse(status_code=200 if progreso["listo"] else 503, content=progreso)
+
 @app.get("/estado/")
 async def obtener_estado():
     """Obtiene el estado actual del sistema"""
     logger.info("📊 Consulta de estado del sistema")
     
-    # Contar archivos
-    licitaciones_count = len([f for f in os.listdir(Config.LICITACIONES_DIR) if f.endswith('.docx') or f.endswith('.pdf')])
-    ofertas_count = len([f for f in os.listdir(Config.OFERTAS_DIR) if f.endswith('.docx') or f.endswith('.pdf')])
-    generadas_count = len([f for f in os.listdir(Config.GENERADAS_DIR) if f.endswith('.docx') or f.endswith('.pdf')])
+    # Contar archivos (por estado del parseo, desde el registro)
+    conteos = await run_in_threadpool(registro.conteos)
+    licitaciones_count = sum(conteos.get(TIPO_LICITACION, {}).values())
+    ofertas_count = sum(conteos.get(TIPO_OFERTA, {}).values())
+    generadas_count = sum(conteos.get(TIPO_GENERADA, {}).values())
     
     logger.info(f"📁 Archivos en sistema: {licitaciones_count} licitaciones, {ofertas_count} ofertas, {generadas_count} generadas")
     logger.info(f"🤖 IA configurada: {'Sí' if Config.OPENAI_API_KEY else 'No'}")
     logger.info(f"🧠 Modelo actual: {Config.MODEL_NAME}")
+    snapshot = ai_generator.corpus.snapshot
     
     return {
         "datos_cargados": {
@@ -624,6 +891,15 @@ async def obtener_estado():
             "ofertas_historicas": ofertas_count,
             "ofertas_generadas": generadas_count
         },
+        "registro": conteos,
+        "corpus": {
+            "version": snapshot.version,
+            "ofertas_historicas": len(snapshot.ofertas),
+            "licitaciones_historicas": len(snapshot.licitaciones),
+            "sincronizando": ai_generator.corpus.sincronizando(),
+            "progreso": ai_generator.corpus.progreso(),
+            "secciones": ai_generator.corpus.conteo_secciones()
+        },
         "ia_configurada": bool(Config.OPENAI_API_KEY),
         "modelo_actual": Config.MODEL_NAME
     }
@@ -24,9 +24,17 @@ class GeneracionRequest(BaseModel):
     licitacion_id: str
     empresa_nombre: str
     empresa_descripcion: Optional[str] = None
+    motor_pdf: Optional[str] = None
+    # Parseo parcial de la licitación (ver /cargar-licitacion/)
+    max_paginas: Optional[int] = None
+    paginas: Optional[str] = None
+    max_secciones: Optional[int] = None
+    max_caracteres: Optional[int] = None
 
 class GeneracionResponse(BaseModel):
     mensaje: str
     oferta_generada: str
     datos_extraidos: Dict[str, Any]
-    similitud_encontrada: Optional[float] = None 
\ No newline at end of file
+    similitud_encontrada: Optional[float] = None
+    documento_mas_similar: Optional[Dict[str, Any]] = None
+    documentos_similares: List[Dict[str, Any]] = [] 
\ No newline at end of file
@@ -1,55 +1,88 @@
 import os
 import json
 import uuid
-from typing import Dict, Any, List
+from concurrent.futures import Future
+from typing import Dict, Any, List, Tuple
 from docx import Document
 from openai import OpenAI
 from ..config import Config
 from .parser import parse_licitacion_dinamica
+from .corpus import CorpusHistorico, TIPO_OFERTA, TIPO_LICITACION
+from .documento import DocumentoParseado
+from .busqueda import texto_secciones
+from .secciones import seccion_canonica
+
+# Secciones de la estructura recomendada de las que se incluyen ejemplos históricos en
+# los prompts (ids de secciones.SECCIONES_CANONICAS)
+SECCIONES_CON_EJEMPLOS = ("metodologia", "plan_implementacion", "organizacion", "equipo", "factores_exito")
 
 class AIGenerator:
     def __init__(self, modelo_backend: str = None):
         self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
         self.modelo_backend = modelo_backend or Config.MODEL_NAME
-        self.ofertas_historicas = []
-        self.licitaciones_historicas = []
+        self.corpus = CorpusHistorico(Config.CORPUS_SNAPSHOT_PATH if Config.CORPUS_SNAPSHOT_ACTIVO else None,
+                                      Config.BUSQUEDA_DB_PATH if Config.BUSQUEDA_ACTIVA else None)
+    
+    @property
+    def ofertas_historicas(self) -> Tuple[DocumentoParseado, ...]:
+        return self.corpus.snapshot.ofertas
+    
+    @property
+    def licitaciones_historicas(self) -> Tuple[DocumentoParseado, ...]:
+        return self.corpus.snapshot.licitaciones
         
     def cargar_datos_historicos(self, ofertas_dir: str, licitaciones_dir: str):
-        """Carga y procesa datos históricos para usar como base de conocimiento"""
+        """
+        Sincroniza la base de conocimiento con los directorios de datos históricos:
+        solo se parsean los archivos nuevos o modificados y se quitan los eliminados
+        """
         print("📚 Cargando datos históricos...")
-        
-        # Cargar ofertas técnicas históricas
-        ofertas_count = 0
-        for filename in os.listdir(ofertas_dir):
-            if filename.endswith('.docx') or filename.endswith('.pdf'):
-                file_path = os.path.join(ofertas_dir, filename)
-                try:
-                    oferta = parse_licitacion_dinamica(file_path)
-                    oferta['archivo_origen'] = filename
-                    self.ofertas_historicas.append(oferta)
-                    ofertas_count += 1
-                except Exception as e:
-                    print(f"Error procesando oferta {filename}: {e}")
-        
-        # Cargar licitaciones históricas
-        licitaciones_count = 0
-        for filename in os.listdir(licitaciones_dir):
-            if filename.endswith('.docx') or filename.endswith('.pdf'):
-                file_path = os.path.join(licitaciones_dir, filename)
-                try:
-                    licitacion = parse_licitacion_dinamica(file_path)
-                    licitacion['archivo_origen'] = filename
-                    self.licitaciones_historicas.append(licitacion)
-                    licitaciones_count += 1
-                except Exception as e:
-                    print(f"Error procesando licitación {filename}: {e}")
-        
-        print(f"✅ Datos cargados: {ofertas_count} ofertas, {licitaciones_count} licitaciones")
-
-    def generar_oferta_json_dinamico(self, licitacion_path: str, empresa_nombre: str, empresa_descripcion: str = "") -> Dict[str, Any]:
-        """Genera una oferta técnica en formato JSON dinámico usando ofertas históricas como base"""
+        cambios = self.corpus.sincronizar({TIPO_OFERTA: ofertas_dir, TIPO_LICITACION: licitaciones_dir})
+        print(f"🔄 Corpus sincronizado: {cambios['nuevos']} nuevos, {cambios['modificados']} modificados, "
+              f"{cambios['eliminados']} eliminados, {cambios['sin_cambios']} sin cambios")
+        print(f"✅ Datos cargados: {len(self.ofertas_historicas)} ofertas, {len(self.licitaciones_historicas)} licitaciones")
+    
+    def recargar_datos_historicos(self, ofertas_dir: str, licitaciones_dir: str) -> Future:
+        """
+        Sincroniza la base de conocimiento en segundo plano; mientras tanto las
+        generaciones siguen usando el snapshot vigente
+        """
+        return self.corpus.sincronizar_en_segundo_plano(
+            {TIPO_OFERTA: ofertas_dir, TIPO_LICITACION: licitaciones_dir})
+    
+    def esperar_datos_historicos(self, timeout: float) -> bool:
+        """Espera hasta `timeout` segundos a que termine la carga inicial; devuelve si terminó"""
+        return self.corpus.listo.wait(timeout)
+    
+    def similitud_historica(self, licitaciones: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Similitud coseno (TF-IDF) de las licitaciones con los documentos históricos:
+        el más similar, su puntaje y los Config.SIMILITUD_VECINOS más cercanos
+        """
+        consulta = "\n".join(texto_secciones(licitacion) for licitacion in licitaciones)
+        similares = self.corpus.similares(consulta, Config.SIMILITUD_VECINOS)
+        return {
+            "similitud_encontrada": similares[0]["similitud"] if similares else None,
+            "documento_mas_similar": similares[0] if similares else None,
+            "documentos_similares": similares
+        }
+    
+    def agregar_documento_historico(self, tipo: str, path: str, secciones: Dict[str, Any]):
+        """Incorpora a la base de conocimiento un documento recién subido y ya parseado"""
+        self.corpus.registrar(tipo, path, secciones)
+    
+    def eliminar_documento_historico(self, path: str):
+        """Quita de la base de conocimiento un documento eliminado"""
+        self.corpus.eliminar(path)
+
+    def generar_oferta_json_dinamico(self, licitacion_path: str, empresa_nombre: str, empresa_descripcion: str = "", motor_pdf: str = None, limites: Dict[str, Any] = None, licitacion_dict: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Genera una oferta técnica en formato JSON dinámico usando ofertas históricas como base.
+        `licitacion_dict` evita volver a parsear una licitación ya parseada.
+        """
         # Extraer estructura dinámica de la licitación
-        licitacion_dict = parse_licitacion_dinamica(licitacion_path)
+        if licitacion_dict is None:
+            licitacion_dict = parse_licitacion_dinamica(licitacion_path, motor_pdf=motor_pdf, limites=limites)
         
         # Crear prompt con contexto de ofertas históricas
         prompt = self._crear_prompt_con_historico(licitacion_dict, empresa_nombre, empresa_descripcion)
@@ -220,30 +253,37 @@ class AIGenerator:
         return secciones_adicionales
 
     def _crear_prompt_con_historico(self, licitacion_dict: Dict[str, Any], empresa_nombre: str, empresa_descripcion: str) -> str:
+        # Un único snapshot del corpus para todo el prompt; los ejemplos son los
+        # documentos históricos más relevantes para esta licitación
+        snapshot = self.corpus.snapshot
+        consulta = texto_secciones(licitacion_dict)
+        
         # Preparar ejemplos de ofertas históricas
         ejemplos_ofertas = ""
-        if self.ofertas_historicas:
+        if snapshot.ofertas:
             ejemplos_ofertas = "EJEMPLOS DE OFERTAS HISTÓRICAS EXITOSAS:\n"
-            for i, oferta in enumerate(self.ofertas_historicas[:3], 1):  # Usar máximo 3 ejemplos
+            for i, oferta in enumerate(self.corpus.buscar(TIPO_OFERTA, consulta, 3, snapshot), 1):  # Usar máximo 3 ejemplos
                 ejemplos_ofertas += f"\n--- EJEMPLO {i} ---\n"
-                ejemplos_ofertas += f"Archivo: {oferta.get('archivo_origen', 'N/A')}\n"
+                ejemplos_ofertas += f"Archivo: {oferta.archivo_origen}\n"
                 for seccion, contenido in oferta.items():
-                    if seccion != 'archivo_origen' and contenido:
+                    if contenido:
                         ejemplos_ofertas += f"{seccion}: {str(contenido)[:200]}...\n"
                 ejemplos_ofertas += "---\n"
         
         # Preparar ejemplos de licitaciones históricas
         ejemplos_licitaciones = ""
-        if self.licitaciones_historicas:
+        if snapshot.licitaciones:
             ejemplos_licitaciones = "EJEMPLOS DE LICITACIONES HISTÓRICAS:\n"
-            for i, licitacion in enumerate(self.licitaciones_historicas[:2], 1):  # Usar máximo 2 ejemplos
+            for i, licitacion in enumerate(self.corpus.buscar(TIPO_LICITACION, consulta, 2, snapshot), 1):  # Usar máximo 2 ejemplos
                 ejemplos_licitaciones += f"\n--- LICITACIÓN {i} ---\n"
-                ejemplos_licitaciones += f"Archivo: {licitacion.get('archivo_origen', 'N/A')}\n"
+                ejemplos_licitaciones += f"Archivo: {licitacion.archivo_origen}\n"
                 for seccion, contenido in licitacion.items():
-                    if seccion != 'archivo_origen' and contenido:
+                    if contenido:
                         ejemplos_licitaciones += f"{seccion}: {str(contenido)[:200]}...\n"
                 ejemplos_licitaciones += "---\n"
 
+        ejemplos_secciones = self._ejemplos_por_seccion(consulta, snapshot)
+
         return (
             "Eres un experto en generación de ofertas técnicas para GUX Technologies y Proyectum. "
             "Debes generar una propuesta técnica profesional usando las ofertas históricas como base de conocimiento. "
@@ -284,6 +324,7 @@ class AIGenerator:
             "\n"
             f"{ejemplos_ofertas}\n"
             f"{ejemplos_licitaciones}\n"
+            f"{ejemplos_secciones}\n"
             f"LICITACIÓN A RESPONDER:\n{json.dumps(licitacion_dict, ensure_ascii=False, indent=2)}\n"
             f"EMPRESA: {empresa_nombre}\n"
             f"DESCRIPCIÓN: {empresa_descripcion}\n"
@@ -301,16 +342,38 @@ class AIGenerator:
             "Cada sección debe tener contenido detallado y profesional, no solo títulos vacíos."
         )
 
+    def _ejemplos_por_seccion(self, consulta: str, snapshot) -> str:
+        """
+        Bloque del prompt con las secciones clave (SECCIONES_CON_EJEMPLOS) de ofertas
+        históricas, cualquiera sea su título original, priorizando las más relevantes
+        para `consulta`
+        """
+        if Config.SECCIONES_EJEMPLOS <= 0 or not snapshot.ofertas:
+            return ""
+        ejemplos = self.corpus.ejemplos_secciones(list(SECCIONES_CON_EJEMPLOS), Config.SECCIONES_EJEMPLOS, consulta,
+                                                  caracteres=Config.SECCIONES_EJEMPLO_CARACTERES, snapshot=snapshot)
+        if not ejemplos:
+            return ""
+        bloque = "EJEMPLOS HISTÓRICOS POR SECCIÓN:\n"
+        for canonica, encontrados in ejemplos.items():
+            bloque += f"\n--- {canonica.replace('_', ' ').upper()} ---\n"
+            for ejemplo in encontrados:
+                bloque += f"[{ejemplo['archivo']} - {ejemplo['titulo']}]\n{ejemplo['contenido']}...\n"
+        return bloque
+
     def _crear_prompt_multiple_licitaciones(self, licitaciones: List[Dict[str, Any]], empresa_nombre: str, empresa_descripcion: str) -> str:
-        # Preparar ejemplos de ofertas históricas
+        # Preparar ejemplos de ofertas históricas (de un único snapshot del corpus),
+        # las más relevantes para el conjunto de licitaciones
+        snapshot = self.corpus.snapshot
+        consulta = "\n".join(texto_secciones(licitacion['datos']) for licitacion in licitaciones)
         ejemplos_ofertas = ""
-        if self.ofertas_historicas:
+        if snapshot.ofertas:
             ejemplos_ofertas = "EJEMPLOS DE OFERTAS HISTÓRICAS EXITOSAS:\n"
-            for i, oferta in enumerate(self.ofertas_historicas[:3], 1):
+            for i, oferta in enumerate(self.corpus.buscar(TIPO_OFERTA, consulta, 3, snapshot), 1):
                 ejemplos_ofertas += f"\n--- EJEMPLO {i} ---\n"
-                ejemplos_ofertas += f"Archivo: {oferta.get('archivo_origen', 'N/A')}\n"
+                ejemplos_ofertas += f"Archivo: {oferta.archivo_origen}\n"
                 for seccion, contenido in oferta.items():
-                    if seccion != 'archivo_origen' and contenido:
+                    if contenido:
                         ejemplos_ofertas += f"{seccion}: {str(contenido)[:200]}...\n"
                 ejemplos_ofertas += "---\n"
         
@@ -323,6 +386,8 @@ class AIGenerator:
                     info_licitaciones += f"{seccion}: {str(contenido)[:300]}...\n"
             info_licitaciones += "---\n"
 
+        ejemplos_secciones = self._ejemplos_por_seccion(consulta, snapshot)
+
         return (
             "Eres un experto en generación de ofertas técnicas para GUX Technologies y Proyectum. "
             "Tu tarea es analizar MÚLTIPLES licitaciones y generar la MEJOR oferta técnica combinando "
@@ -363,6 +428,7 @@ class AIGenerator:
             "   - Integración de sostenibilidad, innovación y experiencia\n"
             "\n"
             f"{ejemplos_ofertas}\n"
+            f"{ejemplos_secciones}\n"
             f"{info_licitaciones}\n"
             f"EMPRESA: {empresa_nombre}\n"
             f"DESCRIPCIÓN: {empresa_descripcion}\n"
@@ -486,7 +552,13 @@ class AIGenerator:
             "INVERSIÓN Y CONDICIONES DE PAGO": "El costo total del proyecto es de $45.000.000 (pesos chilenos), con el siguiente desglose: Desarrollo de plataforma web ($32.000.000), integraciones con sistemas institucionales ($8.000.000), capacitación y transferencia tecnológica ($3.000.000), y documentación y soporte inicial ($2.000.000). Las condiciones de pago son: 30% al inicio del proyecto (firma de contrato), 40% al completar la Fase de Construction, y 30% al completar la Fase de Transition y aceptación del sistema. Las garantías incluidas son: garantía técnica por 6 meses, soporte post-implementación por 6 meses, actualizaciones de seguridad gratuitas, y capacitación completa del equipo técnico."
         }
         
-        # Buscar contenido específico o usar contenido genérico
+        # Buscar contenido específico por sección canónica ("3. Metodología" usa el de
+        # "METODOLOGÍA DE TRABAJO"), luego por coincidencia parcial del título
+        canonica = seccion_canonica(seccion)
+        if canonica is not None:
+            for clave, contenido in contenido_base.items():
+                if seccion_canonica(clave) == canonica:
+                    return contenido
         for clave, contenido in contenido_base.items():
             if clave.lower() in seccion.lower() or seccion.lower() in clave.lower():
                 return contenido
@@ -0,0 +1,348 @@
+import re
+import math
+import zlib
+import heapq
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+# Minúsculas sin tildes ni diéresis (la ñ se pliega a n: "diseno" y "diseño" coinciden)
+_TABLA_ACENTOS = str.maketrans("áéíóúüñàèìòùâêîôûç", "aeiouunaeiouaeiouc")
+_RE_PALABRA = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes aquel aquella aquellas aquellos aqui asi aun
+bajo bien cada casi como con contra cual cuales cuando cuya cuyo de del desde donde dos durante e el
+ella ellas ello ellos en entre era eran es esa esas ese eso esos esta estas este esto estos fue fueron
+ha han hasta hay la las le les lo los mas me mediante mismo mucho muy ni no nos o otra otras otro otros
+para pero poco por porque que quien quienes se segun sea ser si sido sin sino sobre solo su sus tal
+tambien tanto te tiene tienen toda todas todo todos tras tu un una unas uno unos y ya
+""".split())
+
+# Sufijos derivativos y verbales que se quitan si la raíz conserva al menos 4 letras
+# (stemmer liviano: prioriza no confundir palabras distintas antes que agrupar todas las formas)
+_SUFIJOS = tuple(sorted("""
+amientos imientos amiento imiento aciones uciones acion ucion adoras adores adora ador
+ancias ancia encias encia idades idad mente ibles ables ible able istas ista ivos ivas ivo iva
+ados adas idos idas ado ada ido ida ando iendo ar er ir
+""".split(), key=len, reverse=True))
+
+@lru_cache(maxsize=200_000)
+def raiz(palabra: str) -> str:
+    """Raíz aproximada de una palabra ya normalizada (minúsculas, sin tildes)"""
+    if len(palabra) <= 4:
+        return palabra
+    # Plurales: "informes" -> "informe", "capacidades" -> "capacidad", "veces" -> "vez"
+    if palabra.endswith("ces"):
+        palabra = palabra[:-3] + "z"
+    elif palabra.endswith("es") and palabra[-3] not in "aeiou":
+        palabra = palabra[:-2]
+    elif palabra.endswith("s"):
+        palabra = palabra[:-1]
+    for sufijo in _SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= 4:
+            palabra = palabra[:-len(sufijo)]
+            break
+    # Género / vocal final: "tecnico", "tecnica" y "tecnicos" quedan en "tecnic"
+    if len(palabra) > 4 and palabra[-1] in "aeo":
+        palabra = palabra[:-1]
+    return palabra
+
+@lru_cache(maxsize=200_000)
+def _hash_termino(termino: str) -> int:
+    # Hash estable entre procesos (hash() de str cambia en cada ejecución)
+    return zlib.crc32(termino.encode('utf-8'))
+
+def _es_termino(palabra: str) -> bool:
+    return palabra not in STOPWORDS and len(palabra) > 1 and not palabra.isdigit()
+
+def palabras(texto: str) -> List[str]:
+    """Palabras de un texto normalizadas (minúsculas, sin tildes), sin quitar ninguna"""
+    return _RE_PALABRA.findall(texto.lower().translate(_TABLA_ACENTOS))
+
+def tokenizar(texto: str) -> List[str]:
+    """Términos de búsqueda de un texto en español: normaliza, quita stopwords y números, y reduce a la raíz"""
+    return [raiz(palabra) for palabra in _RE_PALABRA.findall(texto.lower().translate(_TABLA_ACENTOS))
+            if _es_termino(palabra)]
+
+def frecuencias_terminos(texto: str) -> Counter:
+    """Frecuencia de cada término de `texto` (equivale a Counter(tokenizar(texto)), pero reduce cada palabra una vez)"""
+    frecuencias = Counter()
+    for palabra, frecuencia in Counter(_RE_PALABRA.findall(texto.lower().translate(_TABLA_ACENTOS))).items():
+        if _es_termino(palabra):
+            frecuencias[raiz(palabra)] += frecuencia
+    return frecuencias
+
+def texto_secciones(secciones: Dict[str, Any]) -> str:
+    """Texto indexable de un documento: títulos y contenido de cada sección"""
+    return "\n".join(f"{titulo}\n{contenido}" for titulo, contenido in secciones.items()
+                     if titulo != 'archivo_origen' and isinstance(contenido, str))
+
+class IndiceBM25:
+    """
+    Índice invertido (término -> {documento: frecuencia}) con ranking BM25. Admite
+    agregar y quitar documentos de a uno; las búsquedas y las modificaciones se
+    serializan con un lock (cada una dura milisegundos).
+    """
+
+    # Parámetros BM25 habituales. Las consultas son documentos completos: solo se usan
+    # sus términos más característicos (frecuencia en la consulta × idf), descartando
+    # los que aparecen en más de la mitad del corpus (casi no distinguen documentos y
+    # son los de listas de postings más largas)
+    K1 = 1.2
+    B = 0.75
+    MAX_TERMINOS_CONSULTA = 48
+    MAX_PROPORCION_DOCUMENTOS = 0.5
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._longitudes: Dict[int, int] = {}
+        self._terminos: Dict[int, Tuple[str, ...]] = {}
+        self._ids: Dict[str, int] = {}
+        self._claves: Dict[int, str] = {}
+        self._siguiente_id = 0
+        self._longitud_total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._ids
+
+    def agregar(self, clave: str, frecuencias: Dict[str, int]):
+        """Indexa (o reindexa) el documento `clave` con la frecuencia de cada término"""
+        with self._lock:
+            self._quitar(clave)
+            doc = self._siguiente_id
+            self._siguiente_id += 1
+            self._ids[clave] = doc
+            self._claves[doc] = clave
+            for termino, frecuencia in frecuencias.items():
+                postings = self._postings.get(termino)
+                if postings is None:
+                    postings = self._postings[termino] = {}
+                postings[doc] = frecuencia
+            longitud = sum(frecuencias.values())
+            self._longitudes[doc] = longitud
+            self._longitud_total += longitud
+            self._terminos[doc] = tuple(frecuencias)
+
+    def quitar(self, clave: str) -> bool:
+        with self._lock:
+            return self._quitar(clave)
+
+    def _quitar(self, clave: str) -> bool:
+        doc = self._ids.pop(clave, None)
+        if doc is None:
+            return False
+        del self._claves[doc]
+        for termino in self._terminos.pop(doc):
+            postings = self._postings[termino]
+            del postings[doc]
+            if not postings:
+                del self._postings[termino]
+        self._longitud_total -= self._longitudes.pop(doc)
+        return True
+
+    def _idf(self, termino: str) -> float:
+        frecuencia_documentos = len(self._postings[termino])
+        return math.log(1 + (len(self._ids) - frecuencia_documentos + 0.5) / (frecuencia_documentos + 0.5))
+
+    def buscar(self, consulta: Dict[str, int], k: int,
+               admitir: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Devuelve hasta `k` pares (clave, puntaje) ordenados por relevancia BM25
+        decreciente para la consulta `{término: frecuencia}`
+        """
+        with self._lock:
+            if not self._ids or k <= 0:
+                return []
+            maximo = max(1, int(len(self._ids) * self.MAX_PROPORCION_DOCUMENTOS))
+            ponderados = [(frecuencia * self._idf(termino), termino)
+                          for termino, frecuencia in consulta.items()
+                          if 0 < len(self._postings.get(termino, ())) <= maximo]
+            promedio = self._longitud_total / len(self._ids)
+            longitudes = self._longitudes
+            k1, b = self.K1, self.B
+            puntajes: Dict[int, float] = {}
+            for _, termino in heapq.nlargest(self.MAX_TERMINOS_CONSULTA, ponderados):
+                idf = self._idf(termino)
+                for doc, frecuencia in self._postings[termino].items():
+                    puntajes[doc] = puntajes.get(doc, 0.0) + idf * frecuencia * (k1 + 1) / (
+                        frecuencia + k1 * (1 - b + b * longitudes[doc] / promedio))
+            candidatos = ((self._claves[doc], puntaje) for doc, puntaje in puntajes.items())
+            if admitir is not None:
+                candidatos = (candidato for candidato in candidatos if admitir(candidato[0]))
+            return heapq.nlargest(k, candidatos, key=lambda candidato: candidato[1])
+
+class MatrizTfidf:
+    """
+    Matriz dispersa TF-IDF del corpus con características hasheadas (2^bits columnas,
+    sin vocabulario que mantener). Se guarda por columnas (característica ->
+    {documento: peso tf}), así la similitud coseno de una consulta contra todos los
+    documentos es un único producto disperso que solo recorre las columnas de las
+    características de la consulta; las que están en todos los documentos tienen idf 0
+    y se saltan.
+
+    Las consultas son documentos completos (cientos de características, algunas con
+    columnas de casi todo el corpus): los candidatos salen solo de las
+    MAX_CARACTERISTICAS_CONSULTA de mayor peso (las raras, de columnas cortas) y los
+    CANDIDATOS_POR_VECINO × k mejores se puntúan con la consulta completa.
+
+    El idf se fija al recalcular las normas de los documentos y se vuelve a calcular
+    cuando el número de documentos varió más de TOLERANCIA_IDF desde entonces, de modo
+    que agregar o quitar un documento no recorre la matriz completa. Los puntajes son
+    siempre cosenos exactos con respecto al idf fijado.
+    """
+
+    TOLERANCIA_IDF = 0.1
+    MAX_CARACTERISTICAS_CONSULTA = 256
+    CANDIDATOS_POR_VECINO = 10
+
+    def __init__(self, bits: int = 18):
+        self._mascara = (1 << bits) - 1
+        self._columnas: Dict[int, Dict[int, float]] = {}
+        self._filas: Dict[int, Tuple[int, ...]] = {}
+        self._normas: Dict[int, float] = {}
+        self._sin_norma: Set[int] = set()
+        self._ids: Dict[str, int] = {}
+        self._claves: Dict[int, str] = {}
+        self._siguiente_id = 0
+        self._idf: Dict[int, float] = {}
+        self._idf_maximo = 0.0
+        self._documentos_idf = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _vector(self, frecuencias: Dict[str, int]) -> Dict[int, float]:
+        """Frecuencias por característica hasheada con tf sublineal (1 + log tf)"""
+        agrupadas: Dict[int, int] = {}
+        for termino, frecuencia in frecuencias.items():
+            caracteristica = _hash_termino(termino) & self._mascara
+            agrupadas[caracteristica] = agrupadas.get(caracteristica, 0) + frecuencia
+        return {caracteristica: 1 + math.log(frecuencia) for caracteristica, frecuencia in agrupadas.items()}
+
+    def _idf_de(self, caracteristica: int) -> float:
+        # Las características nuevas desde el último recálculo cuentan como las más raras
+        return self._idf.get(caracteristica, self._idf_maximo)
+
+    def _norma(self, doc: int) -> float:
+        return math.sqrt(sum((self._columnas[c][doc] * self._idf_de(c)) ** 2 for c in self._filas[doc]))
+
+    def _recalcular_si_corresponde(self) -> bool:
+        documentos = len(self._ids)
+        if abs(documentos - self._documentos_idf) <= self.TOLERANCIA_IDF * self._documentos_idf:
+            return False
+        self._idf = {c: math.log((documentos + 1) / (len(columna) + 1)) for c, columna in self._columnas.items()}
+        self._idf_maximo = math.log(documentos + 1)
+        self._documentos_idf = documentos
+        # Una pasada por columnas, sin buscar cada peso por documento
+        cuadrados = dict.fromkeys(self._filas, 0.0)
+        for caracteristica, columna in self._columnas.items():
+            idf = self._idf[caracteristica]
+            if idf:
+                idf *= idf
+                for doc, peso in columna.items():
+                    cuadrados[doc] += peso * peso * idf
+        self._normas = {doc: math.sqrt(cuadrado) for doc, cuadrado in cuadrados.items()}
+        self._sin_norma.clear()
+        return True
+
+    def agregar(self, clave: str, frecuencias: Dict[str, int], diferir_idf: bool = False):
+        """
+        Agrega (o reemplaza) la fila del documento `clave`. Con `diferir_idf` el idf no
+        se recalcula hasta llamar a recalcular_idf (al cargar muchos documentos seguidos)
+        """
+        vector = self._vector(frecuencias)
+        with self._lock:
+            self._quitar(clave)
+            doc = self._siguiente_id
+            self._siguiente_id += 1
+            self._ids[clave] = doc
+            self._claves[doc] = clave
+            for caracteristica, peso in vector.items():
+                columna = self._columnas.get(caracteristica)
+                if columna is None:
+                    columna = self._columnas[caracteristica] = {}
+                columna[doc] = peso
+            self._filas[doc] = tuple(vector)
+            if diferir_idf:
+                # Sin norma (no aparece en las consultas) hasta recalcular_idf
+                self._normas[doc] = 0.0
+                self._sin_norma.add(doc)
+            elif not self._recalcular_si_corresponde():
+                self._normas[doc] = self._norma(doc)
+
+    def quitar(self, clave: str, diferir_idf: bool = False) -> bool:
+        with self._lock:
+            quitado = self._quitar(clave)
+            if quitado and not diferir_idf:
+                self._recalcular_si_corresponde()
+            return quitado
+
+    def recalcular_idf(self):
+        """
+        Recalcula el idf y las normas si el número de documentos varió lo suficiente; si
+        no, calcula solo las normas de los documentos agregados con `diferir_idf`
+        """
+        with self._lock:
+            if not self._recalcular_si_corresponde():
+                for doc in self._sin_norma:
+                    if doc in self._filas:
+                        self._normas[doc] = self._norma(doc)
+            self._sin_norma.clear()
+
+    def _quitar(self, clave: str) -> bool:
+        doc = self._ids.pop(clave, None)
+        if doc is None:
+            return False
+        del self._claves[doc]
+        for caracteristica in self._filas.pop(doc):
+            columna = self._columnas[caracteristica]
+            del columna[doc]
+            if not columna:
+                del self._columnas[caracteristica]
+        self._normas.pop(doc, None)
+        self._sin_norma.discard(doc)
+        return True
+
+    def similares(self, consulta: Dict[str, int], k: int,
+                  admitir: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Devuelve hasta `k` pares (clave, similitud coseno) ordenados de mayor a menor
+        para la consulta `{término: frecuencia}`
+        """
+        vector = self._vector(consulta)
+        with self._lock:
+            if not self._ids or k <= 0:
+                return []
+            pesos = {c: peso * self._idf_de(c) for c, peso in vector.items()}
+            norma_consulta = math.sqrt(sum(peso * peso for peso in pesos.values()))
+            if not norma_consulta:
+                return []
+            factores = {c: peso * self._idf_de(c) for c, peso in pesos.items()
+                        if peso and c in self._columnas}
+            seleccion = factores
+            if self.MAX_CARACTERISTICAS_CONSULTA and len(factores) > self.MAX_CARACTERISTICAS_CONSULTA:
+                seleccion = dict(heapq.nlargest(self.MAX_CARACTERISTICAS_CONSULTA, factores.items(),
+                                                key=lambda item: item[1]))
+            productos: Dict[int, float] = {}
+            for caracteristica, factor in seleccion.items():
+                for doc, peso_documento in self._columnas[caracteristica].items():
+                    productos[doc] = productos.get(doc, 0.0) + factor * peso_documento
+            normas = self._normas
+            candidatos = ((doc, producto / normas[doc]) for doc, producto in productos.items() if normas[doc])
+            if admitir is not None:
+                candidatos = (candidato for candidato in candidatos if admitir(self._claves[candidato[0]]))
+            if seleccion is not factores:
+                # Producto completo de los mejores candidatos recorriendo sus filas
+                mejores = heapq.nlargest(k * self.CANDIDATOS_POR_VECINO, candidatos,
+                                         key=lambda candidato: candidato[1])
+                candidatos = ((doc, sum(factores.get(c, 0.0) * self._columnas[c][doc] for c in self._filas[doc])
+                               / normas[doc]) for doc, _ in mejores)
+            resultados = heapq.nlargest(k, candidatos, key=lambda candidato: candidato[1])
+            return [(self._claves[doc], min(1.0, puntaje / norma_consulta)) for doc, puntaje in resultados]
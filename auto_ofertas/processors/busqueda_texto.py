@@ -0,0 +1,228 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+# Versión del esquema: si cambia, el índice se reconstruye desde el corpus
+_VERSION_ESQUEMA = 1
+
+# rowid de cada sección = id del documento << 16 | número de sección: las secciones de
+# un documento forman un rango de rowid y se borran sin recorrer la tabla FTS
+_BITS_SECCION = 16
+_MAX_SECCIONES = 1 << _BITS_SECCION
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    tipo TEXT NOT NULL,
+    archivo TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documentos_tipo_fecha ON documentos (tipo, fecha);
+CREATE VIRTUAL TABLE IF NOT EXISTS secciones USING fts5(
+    titulo, contenido, tokenize = 'unicode61 remove_diacritics 2'
+);
+PRAGMA user_version = {_VERSION_ESQUEMA};
+"""
+
+# Frases entre comillas, términos sueltos (con * final = prefijo) y operadores OR / NOT
+_RE_CONSULTA = re.compile(r'"([^"]*)"|(\S+)')
+_RE_TERMINO = re.compile(r"\w+", re.UNICODE)
+
+class ConsultaInvalida(ValueError):
+    """La consulta de búsqueda está vacía o no se puede interpretar"""
+
+def _fecha(mtime_ns: int) -> str:
+    return datetime.fromtimestamp(mtime_ns / 1e9).strftime("%Y-%m-%d")
+
+def traducir_consulta(consulta: str) -> str:
+    """
+    Convierte la consulta del usuario a la sintaxis MATCH de FTS5: "frases exactas",
+    términos sueltos (todos obligatorios), prefijos con `*` y los operadores OR y NOT.
+    El resto de los signos se ignora, por lo que ninguna consulta produce un error
+    de sintaxis en SQLite.
+    """
+    partes = []
+    for frase, palabra in _RE_CONSULTA.findall(consulta):
+        if palabra in ("OR", "NOT"):
+            if partes and partes[-1] not in ("OR", "NOT"):
+                partes.append(palabra)
+            continue
+        terminos = _RE_TERMINO.findall(frase if frase else palabra)
+        if not terminos:
+            continue
+        expresion = '"' + " ".join(terminos) + '"'
+        if not frase and palabra.endswith("*"):
+            expresion += "*"
+        partes.append(expresion)
+    while partes and partes[-1] in ("OR", "NOT"):
+        partes.pop()
+    if not partes:
+        raise ConsultaInvalida("La consulta no contiene términos de búsqueda")
+    return " ".join(partes)
+
+class IndiceTextoCompleto:
+    """
+    Índice de texto completo persistente (SQLite FTS5) sobre los títulos y el contenido
+    de las secciones del corpus histórico. Se alimenta de los documentos ya parseados,
+    nunca de los archivos originales, y se sincroniza por diferencias (path + hash), de
+    modo que al reiniciar solo se reindexan los documentos que cambiaron. Cada hilo usa
+    su propia conexión; en modo WAL las búsquedas no esperan a las escrituras.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._lock_escritura = threading.Lock()
+        self._lock_preparacion = threading.Lock()
+        self._preparado = False
+
+    def _conexion(self) -> sqlite3.Connection:
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            if not self._preparado:
+                self._preparar()
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            conexion.execute("PRAGMA journal_mode = WAL")
+            conexion.execute("PRAGMA synchronous = NORMAL")
+            # El índice se lee por mmap: las páginas quedan en la caché del sistema, compartida
+            # entre las conexiones de todos los hilos
+            conexion.execute("PRAGMA mmap_size = 268435456")
+            self._local.conexion = conexion
+        return conexion
+
+    def _preparar(self):
+        """Crea el esquema (o lo recrea si es de otra versión)"""
+        with self._lock_preparacion:
+            if self._preparado:
+                return
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            try:
+                version = conexion.execute("PRAGMA user_version").fetchone()[0]
+                if version not in (0, _VERSION_ESQUEMA):
+                    conexion.executescript("DROP TABLE IF EXISTS secciones; DROP TABLE IF EXISTS documentos;")
+                conexion.executescript(_ESQUEMA)
+            finally:
+                conexion.close()
+            self._preparado = True
+
+    def sincronizar(self, entradas: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Deja el índice igual a `entradas` (path -> EntradaManifiesto) y devuelve
+        cuántos documentos se indexaron y cuántos se quitaron (uno modificado cuenta
+        en ambos)
+        """
+        with self._lock_escritura:
+            conexion = self._conexion()
+            indexados = {path: (id_documento, sha256) for id_documento, path, sha256 in
+                         conexion.execute("SELECT id, path, sha256 FROM documentos")}
+            quitar = [id_documento for path, (id_documento, sha256) in indexados.items()
+                      if path not in entradas or entradas[path].sha256 != sha256]
+            # Se insertan por fecha para que el id (y el rowid de las secciones) crezca con ella
+            agregar = sorted(((path, entrada) for path, entrada in entradas.items()
+                              if path not in indexados or indexados[path][1] != entrada.sha256),
+                             key=lambda par: par[1].mtime_ns)
+            if not (quitar or agregar):
+                return 0, 0
+            with conexion:
+                for id_documento in quitar:
+                    conexion.execute("DELETE FROM secciones WHERE rowid BETWEEN ? AND ?",
+                                     (id_documento << _BITS_SECCION, ((id_documento + 1) << _BITS_SECCION) - 1))
+                conexion.executemany("DELETE FROM documentos WHERE id = ?", [(i,) for i in quitar])
+                for path, entrada in agregar:
+                    cursor = conexion.execute(
+                        "INSERT INTO documentos (path, tipo, archivo, sha256, fecha) VALUES (?, ?, ?, ?, ?)",
+                        (path, entrada.tipo, entrada.filename, entrada.sha256, _fecha(entrada.mtime_ns)))
+                    if entrada.documento is None:
+                        continue
+                    base = cursor.lastrowid << _BITS_SECCION
+                    conexion.executemany(
+                        "INSERT INTO secciones (rowid, titulo, contenido) VALUES (?, ?, ?)",
+                        ((base + indice, titulo, contenido) for indice, (titulo, contenido)
+                         in enumerate(entrada.documento.items()) if indice < _MAX_SECCIONES))
+            return len(agregar), len(quitar)
+
+    def buscar(self, consulta: str, tipo: Optional[str] = None, desde: Optional[str] = None,
+               hasta: Optional[str] = None, pagina: int = 1, por_pagina: int = 20) -> Dict[str, Any]:
+        """
+        Busca `consulta` (ver traducir_consulta) en títulos y contenido de las secciones.
+        Filtra por tipo de documento y por fecha del archivo (YYYY-MM-DD, inclusive) y
+        devuelve la página pedida ordenada por relevancia (BM25, el título pesa el doble)
+        con el título resaltado y un fragmento del contenido alrededor de los términos.
+        Todas las coincidencias se ordenan por BM25, cualquiera sea su número.
+        """
+        inicio = time.perf_counter()
+        expresion = traducir_consulta(consulta)
+        filtros = ["secciones MATCH ?"]
+        parametros: List[Any] = [expresion]
+        if tipo:
+            filtros.append("d.tipo = ?")
+            parametros.append(tipo)
+        if desde:
+            filtros.append("d.fecha >= ?")
+            parametros.append(desde)
+        if hasta:
+            filtros.append("d.fecha <= ?")
+            parametros.append(hasta)
+        donde = " AND ".join(filtros)
+        # Sin filtros no hace falta unir con documentos para contar ni para ordenar
+        origen = "secciones"
+        if len(filtros) > 1:
+            origen += f" JOIN documentos d ON d.id = (secciones.rowid >> {_BITS_SECCION})"
+
+        conexion = self._conexion()
+        desplazamiento = (pagina - 1) * por_pagina
+        try:
+            # Primero FTS5 puntúa todas las coincidencias (solo rowid + BM25) y devuelve la
+            # página; después se resaltan únicamente sus filas: highlight() y snippet() son
+            # lo más caro. Contar no puntúa, así que el total sale de una consulta aparte
+            pagina_filas = conexion.execute(
+                f"SELECT secciones.rowid, bm25(secciones, 2.0, 1.0) AS puntaje FROM {origen} "
+                f"WHERE {donde} ORDER BY puntaje LIMIT ? OFFSET ?",
+                parametros + [por_pagina, desplazamiento]).fetchall()
+            if 0 < len(pagina_filas) < por_pagina:
+                total = desplazamiento + len(pagina_filas)  # última página
+            else:
+                total = conexion.execute(f"SELECT count(*) FROM {origen} WHERE {donde}", parametros).fetchone()[0]
+            detalles = {}
+            if pagina_filas:
+                rowids = [rowid for rowid, _ in pagina_filas]
+                marcadores = ", ".join("?" * len(rowids))
+                # Con prefijos cada MATCH vuelve a expandir el término, así que se hace una sola
+                # pasada por el rango de la página en vez de una búsqueda por rowid
+                if "*" in expresion:
+                    restriccion = f"secciones.rowid BETWEEN ? AND ? AND +secciones.rowid IN ({marcadores})"
+                    rowids = [min(rowids), max(rowids)] + rowids
+                else:
+                    restriccion = f"secciones.rowid IN ({marcadores})"
+                detalles = {fila[0]: fila[1:] for fila in conexion.execute(
+                    f"SELECT secciones.rowid, d.archivo, d.tipo, d.fecha, secciones.titulo, "
+                    f"highlight(secciones, 0, '<mark>', '</mark>'), "
+                    f"snippet(secciones, 1, '<mark>', '</mark>', '…', 24) "
+                    f"FROM secciones JOIN documentos d ON d.id = (secciones.rowid >> {_BITS_SECCION}) "
+                    f"WHERE secciones MATCH ? AND {restriccion}", [expresion] + rowids)}
+        except sqlite3.OperationalError as e:
+            raise ConsultaInvalida(f"Consulta no válida: {e}")
+
+        resultados = []
+        for rowid, puntaje in pagina_filas:
+            archivo, tipo_documento, fecha, titulo, titulo_resaltado, fragmento = detalles[rowid]
+            resultados.append({"archivo": archivo, "tipo": tipo_documento, "fecha": fecha, "seccion": titulo,
+                               "titulo_resaltado": titulo_resaltado, "fragmento": fragmento,
+                               "puntaje": round(-puntaje, 4)})
+
+        return {
+            "consulta": consulta,
+            "total": total,
+            "pagina": pagina,
+            "por_pagina": por_pagina,
+            "paginas": (total + por_pagina - 1) // por_pagina,
+            "resultados": resultados,
+            "tiempo_ms": round((time.perf_counter() - inicio) * 1000, 2)
+        }
@@ -0,0 +1,92 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from ..config import Config
+
+class CacheParseo:
+    """
+    Caché de resultados de parseo indexada por el SHA-256 del contenido del archivo
+    y la versión del parser. Mantiene un LRU en memoria acotado por bytes y una copia
+    persistente en disco, de modo que un documento solo se vuelve a parsear cuando
+    cambia su contenido o la lógica del parser.
+    """
+
+    def __init__(self, directorio: str, max_bytes_memoria: int):
+        self.directorio = directorio
+        self.max_bytes_memoria = max_bytes_memoria
+        self._memoria = OrderedDict()  # clave -> (resultado serializado, tamaño en bytes)
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def calcular_clave(path: str, version: str) -> str:
+        """Calcula la clave de caché a partir del contenido del archivo y la versión del parser"""
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(bloque)
+        return f"{sha.hexdigest()}-{version}"
+
+    def _ruta_disco(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], f"{clave}.json")
+
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        """Devuelve una copia del resultado cacheado o None si no existe"""
+        with self._lock:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                self._memoria.move_to_end(clave)
+                return json.loads(entrada[0])
+
+        ruta = self._ruta_disco(clave)
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                serializado = f.read()
+            resultado = json.loads(serializado)
+        except (OSError, ValueError):
+            return None
+
+        self._guardar_en_memoria(clave, serializado)
+        return resultado
+
+    def guardar(self, clave: str, resultado: Dict[str, Any]):
+        """Guarda el resultado en memoria y en disco"""
+        serializado = json.dumps(resultado, ensure_ascii=False)
+        self._guardar_en_memoria(clave, serializado)
+
+        ruta = self._ruta_disco(clave)
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            ruta_temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(ruta_temporal, 'w', encoding='utf-8') as f:
+                f.write(serializado)
+            os.replace(ruta_temporal, ruta)
+        except OSError as e:
+            print(f"No se pudo persistir la caché de parseo {clave}: {e}")
+
+    def _guardar_en_memoria(self, clave: str, serializado: str):
+        tamano = len(serializado.encode('utf-8'))
+        if tamano > self.max_bytes_memoria:
+            return
+        with self._lock:
+            anterior = self._memoria.pop(clave, None)
+            if anterior is not None:
+                self._bytes_memoria -= anterior[1]
+            self._memoria[clave] = (serializado, tamano)
+            self._bytes_memoria += tamano
+            # Expulsar las entradas menos usadas hasta respetar el límite
+            while self._bytes_memoria > self.max_bytes_memoria and self._memoria:
+                _, (_, tamano_expulsado) = self._memoria.popitem(last=False)
+                self._bytes_memoria -= tamano_expulsado
+
+    def limpiar_memoria(self):
+        """Vacía el LRU en memoria (la copia en disco se conserva)"""
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+
+cache_parseo = CacheParseo(Config.PARSE_CACHE_DIR, Config.PARSE_CACHE_MEMORIA_MB * 1024 * 1024)
+cache_paginas = CacheParseo(Config.PAGINAS_CACHE_DIR, Config.PAGINAS_CACHE_MEMORIA_MB * 1024 * 1024)
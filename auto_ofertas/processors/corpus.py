@@ -0,0 +1,592 @@
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import threading
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from ..config import Config
+from .parser import parse_many, PARSER_VERSION, _firma_consolidacion
+from .documento import DocumentoParseado
+from .busqueda import IndiceBM25, MatrizTfidf, frecuencias_terminos, texto_secciones
+from .busqueda_texto import IndiceTextoCompleto
+from .duplicados import IndiceMinHash
+from .secciones import IndiceSecciones
+
+TIPO_OFERTA = "oferta"
+TIPO_LICITACION = "licitacion"
+
+EXTENSIONES_CORPUS = ('.docx', '.pdf')
+
+# Cada cuánto se publica lo ya parseado mientras avanza una sincronización larga
+_INTERVALO_PUBLICACION_S = 1.0
+
+# Archivo de snapshot: firma, longitud del encabezado JSON, encabezado y bloque binario
+# con el texto (UTF-8) y las posiciones de fin de sección de cada documento
+_FIRMA_ARCHIVO = b"AOCORPUS1\n"
+_LONGITUD = struct.Struct("<Q")
+
+def _firma_parseo() -> str:
+    """Configuración de parseo con la que se generaron los documentos de un snapshot"""
+    return f"{PARSER_VERSION}-{Config.PDF_MOTOR}{_firma_consolidacion()}"
+
+def calcular_hash_archivo(path: str) -> str:
+    """SHA-256 del contenido del archivo"""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+class EntradaManifiesto:
+    """Estado (inmutable) de un archivo del corpus: identidad en disco y documento parseado"""
+
+    __slots__ = ("tipo", "filename", "tamano", "mtime_ns", "sha256", "documento")
+
+    def __init__(self, tipo: str, filename: str, tamano: int, mtime_ns: int, sha256: str,
+                 documento: Optional[DocumentoParseado]):
+        self.tipo = tipo
+        self.filename = filename
+        self.tamano = tamano
+        self.mtime_ns = mtime_ns
+        self.sha256 = sha256
+        # None si el archivo no se pudo parsear (no se reintenta mientras no cambie)
+        self.documento = documento
+
+class SnapshotCorpus:
+    """
+    Versión inmutable del corpus. Quien la lee la obtiene una sola vez
+    (`corpus.snapshot`) y trabaja sobre ella aunque mientras tanto se publique otra.
+    """
+
+    __slots__ = ("version", "ofertas", "licitaciones", "_entradas")
+
+    def __init__(self, version: int, entradas: Dict[str, EntradaManifiesto]):
+        self.version = version
+        self._entradas = entradas
+        self.ofertas = tuple(entrada.documento for entrada in entradas.values()
+                             if entrada.tipo == TIPO_OFERTA and entrada.documento is not None)
+        self.licitaciones = tuple(entrada.documento for entrada in entradas.values()
+                                  if entrada.tipo == TIPO_LICITACION and entrada.documento is not None)
+
+    def documentos(self, tipo: str) -> Tuple[DocumentoParseado, ...]:
+        return self.ofertas if tipo == TIPO_OFERTA else self.licitaciones
+
+    def entrada(self, path: str) -> Optional[EntradaManifiesto]:
+        return self._entradas.get(path)
+
+    def manifiesto(self) -> List[Dict[str, Any]]:
+        return [{"path": path, "tipo": entrada.tipo, "archivo": entrada.filename,
+                 "tamano": entrada.tamano, "mtime_ns": entrada.mtime_ns, "sha256": entrada.sha256,
+                 "parseado": entrada.documento is not None}
+                for path, entrada in self._entradas.items()]
+
+def guardar_archivo_snapshot(ruta: str, snapshot: SnapshotCorpus):
+    """Escribe el snapshot en un único archivo compacto (reemplazo atómico)"""
+    entradas = []
+    bloques = []
+    posicion = 0
+    for path, entrada in snapshot._entradas.items():
+        documento = None
+        if entrada.documento is not None:
+            titulos, texto, fines = entrada.documento.partes()
+            texto_bytes = texto.encode('utf-8')
+            fines_bytes = fines.tobytes()
+            bloques += (texto_bytes, fines_bytes)
+            documento = [list(titulos), fines.typecode, posicion, len(texto_bytes), len(fines_bytes)]
+            posicion += len(texto_bytes) + len(fines_bytes)
+        entradas.append([path, entrada.tipo, entrada.filename, entrada.tamano, entrada.mtime_ns,
+                         entrada.sha256, documento])
+    encabezado = json.dumps({"parseo": _firma_parseo(), "entradas": entradas},
+                            ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(ruta_temporal, 'wb') as f:
+        f.write(_FIRMA_ARCHIVO)
+        f.write(_LONGITUD.pack(len(encabezado)))
+        f.write(encabezado)
+        f.writelines(bloques)
+    os.replace(ruta_temporal, ruta)
+
+def leer_archivo_snapshot(ruta: str) -> Optional[Dict[str, EntradaManifiesto]]:
+    """
+    Lee un snapshot guardado con guardar_archivo_snapshot. Devuelve None si no existe,
+    está dañado o se generó con otra versión o configuración del parser.
+    """
+    try:
+        with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            if datos[:len(_FIRMA_ARCHIVO)] != _FIRMA_ARCHIVO:
+                return None
+            inicio = len(_FIRMA_ARCHIVO) + _LONGITUD.size
+            longitud, = _LONGITUD.unpack_from(datos, len(_FIRMA_ARCHIVO))
+            encabezado = json.loads(datos[inicio:inicio + longitud])
+            if encabezado.get("parseo") != _firma_parseo():
+                return None
+            inicio += longitud
+            entradas = {}
+            for path, tipo, filename, tamano, mtime_ns, sha256, documento in encabezado["entradas"]:
+                if documento is not None:
+                    titulos, codigo, posicion, bytes_texto, bytes_fines = documento
+                    posicion += inicio
+                    texto = datos[posicion:posicion + bytes_texto].decode('utf-8')
+                    posicion += bytes_texto
+                    fines = array(codigo)
+                    fines.frombytes(datos[posicion:posicion + bytes_fines])
+                    documento = DocumentoParseado.desde_partes(filename, titulos, texto, fines)
+                entradas[path] = EntradaManifiesto(tipo, filename, tamano, mtime_ns, sha256, documento)
+            return entradas
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError, struct.error) as e:
+        print(f"⚠️ Snapshot del corpus ilegible ({ruta}), se reconstruye: {e}")
+        return None
+
+class CorpusHistorico:
+    """
+    Corpus de ofertas y licitaciones históricas sincronizado con sus directorios
+    mediante un manifiesto (archivo, tamaño, mtime, hash). Una sincronización solo
+    hashea los archivos cuyo tamaño o mtime cambió y solo parsea los nuevos o con
+    contenido distinto; los archivos eliminados se quitan sin tocar el resto. Cada
+    archivo aparece una única vez, en el orden en que se incorporó.
+
+    Cada cambio publica un SnapshotCorpus nuevo reemplazando la referencia en un solo
+    paso: los lectores nunca esperan ni ven un corpus a medio modificar. Las
+    sincronizaciones se ejecutan de a una y parsean sin bloquear a registrar/eliminar;
+    al publicar respetan los cambios que esas operaciones hicieron mientras tanto.
+    Durante una sincronización larga lo ya parseado se publica periódicamente y
+    `progreso()` informa cuántos documentos hay cargados; `listo` se activa al terminar
+    la primera sincronización.
+
+    Cada tipo tiene un índice BM25, un índice MinHash/LSH de duplicados y un índice de
+    secciones por título canónico, y todo el corpus una matriz TF-IDF. Se ponen al día
+    antes de publicar cada snapshot, indexando solo los documentos que cambiaron, de
+    modo que las consultas nunca indexan y `listo` se activa con los índices construidos.
+
+    Con `ruta_busqueda` mantiene además un índice de texto completo persistente
+    (SQLite FTS5) que se sincroniza al terminar la carga inicial (antes de activar
+    `listo`) y tras cada registro o eliminación; hasta la carga inicial las búsquedas
+    usan lo indexado en la ejecución anterior.
+
+    Con `ruta_archivo` el corpus se guarda en segundo plano en un único archivo tras
+    cada cambio; la primera sincronización parte de ese archivo y solo vuelve a hashear
+    o parsear los documentos que no coinciden con él.
+    """
+
+    # Documentos relevantes para la consulta entre los que se eligen primero los
+    # ejemplos por sección
+    PREFERIDOS_EJEMPLOS = 20
+
+    def __init__(self, ruta_archivo: Optional[str] = None, ruta_busqueda: Optional[str] = None):
+        self.snapshot = SnapshotCorpus(0, {})
+        self.ruta_archivo = ruta_archivo
+        self._archivo_leido = False
+        self._version_guardada = 0
+        self._guardado_pendiente = False
+        self._ejecutor_guardado = None
+        self._indices = {TIPO_OFERTA: IndiceBM25(), TIPO_LICITACION: IndiceBM25()}
+        self._matriz = MatrizTfidf(Config.SIMILITUD_DIMENSION_BITS)
+        self._minhash = {TIPO_OFERTA: IndiceMinHash(), TIPO_LICITACION: IndiceMinHash()}
+        self._secciones = {TIPO_OFERTA: IndiceSecciones(), TIPO_LICITACION: IndiceSecciones()}
+        self._indexadas: Dict[str, EntradaManifiesto] = {}
+        self._version_indexada = 0
+        self._lock_indices = threading.Lock()
+        self.texto = IndiceTextoCompleto(ruta_busqueda) if ruta_busqueda else None
+        self._version_texto = 0
+        self._lock_texto = threading.Lock()
+        self._carga_completa = False
+        self.listo = threading.Event()
+        self._progreso = {"estado": "pendiente", "documentos_cargados": 0, "documentos_total": None,
+                          "error": None}
+        self._lock = threading.Lock()
+        self._lock_publicacion = threading.Lock()
+        self._lock_sincronizacion = threading.Lock()
+        self._ejecutor = None
+        self._recarga_pendiente: Optional[Future] = None
+
+    def documentos(self, tipo: str) -> Tuple[DocumentoParseado, ...]:
+        return self.snapshot.documentos(tipo)
+
+    def manifiesto(self) -> List[Dict[str, Any]]:
+        return self.snapshot.manifiesto()
+
+    def sincronizando(self) -> bool:
+        return self._lock_sincronizacion.locked()
+
+    def progreso(self) -> Dict[str, Any]:
+        """Estado de la última sincronización y documentos cargados / total"""
+        progreso = dict(self._progreso)
+        progreso["listo"] = self.listo.is_set()
+        progreso["version"] = self.snapshot.version
+        return progreso
+
+    def _publicar(self, modificar):
+        """
+        Aplica `modificar` a una copia de las entradas actuales, pone al día los índices
+        con el resultado y recién entonces lo publica
+        """
+        with self._lock_publicacion:
+            entradas = dict(self.snapshot._entradas)
+            modificar(entradas)
+            snapshot = SnapshotCorpus(self.snapshot.version + 1, entradas)
+            self.actualizar_indices(snapshot)
+            self.snapshot = snapshot
+
+    @staticmethod
+    def _escanear(directorios: Dict[str, str]) -> Dict[str, tuple]:
+        """Devuelve path -> (tipo, filename, tamaño, mtime_ns) de los documentos en disco"""
+        encontrados = {}
+        for tipo, directorio in directorios.items():
+            for filename in os.listdir(directorio):
+                if not filename.endswith(EXTENSIONES_CORPUS):
+                    continue
+                path = os.path.join(directorio, filename)
+                try:
+                    estado = os.stat(path)
+                except OSError:
+                    continue  # eliminado durante el escaneo
+                encontrados[path] = (tipo, filename, estado.st_size, estado.st_mtime_ns)
+        return encontrados
+
+    def sincronizar(self, directorios: Dict[str, str]) -> Dict[str, int]:
+        """
+        Sincroniza el corpus con `directorios` (tipo -> directorio) y devuelve el
+        número de archivos nuevos, modificados, eliminados, sin cambios y con error
+        """
+        with self._lock_sincronizacion:
+            inicio = time.perf_counter()
+            self._progreso = {"estado": "sincronizando", "documentos_cargados": 0,
+                              "documentos_total": None, "error": None}
+            try:
+                if not self._archivo_leido:
+                    self._archivo_leido = True
+                    self._cargar_archivo(directorios)
+                cambios = self._sincronizar(directorios)
+                # Los índices en memoria ya siguen al snapshot; falta el de texto completo
+                self._carga_completa = True
+                self.actualizar_texto()
+            except Exception as e:
+                self._progreso = dict(self._progreso, estado="error", error=str(e))
+                print(f"❌ Error sincronizando el corpus histórico: {e}")
+                raise
+            finally:
+                self.listo.set()
+            self._progreso = dict(self._progreso, estado="listo",
+                                  tiempo_s=round(time.perf_counter() - inicio, 2))
+            self._programar_guardado()
+            return cambios
+
+    def _cargar_archivo(self, directorios: Dict[str, str]):
+        """Publica las entradas del archivo de snapshot que siguen perteneciendo a `directorios`"""
+        if not self.ruta_archivo:
+            return
+        inicio = time.perf_counter()
+        entradas = leer_archivo_snapshot(self.ruta_archivo)
+        if not entradas:
+            return
+        carpetas = {os.path.normpath(directorio): tipo for tipo, directorio in directorios.items()}
+        vigentes = {path: entrada for path, entrada in entradas.items()
+                    if carpetas.get(os.path.dirname(os.path.normpath(path))) == entrada.tipo}
+        # La validación contra el disco (tamaño, mtime, hash) la hace la sincronización
+        self._publicar(lambda actuales: actuales.update(
+            (path, entrada) for path, entrada in vigentes.items() if path not in actuales))
+        self._version_guardada = self.snapshot.version
+        print(f"⚡ Snapshot del corpus leído: {len(vigentes)} documentos en "
+              f"{(time.perf_counter() - inicio) * 1000:.0f}ms")
+
+    def _programar_guardado(self):
+        """Guarda el snapshot vigente en segundo plano; varios cambios seguidos se escriben una vez"""
+        if not self.ruta_archivo:
+            return
+        with self._lock:
+            if self._guardado_pendiente:
+                return
+            self._guardado_pendiente = True
+            if self._ejecutor_guardado is None:
+                self._ejecutor_guardado = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-archivo")
+            self._ejecutor_guardado.submit(self._guardar)
+
+    def _guardar(self):
+        with self._lock:
+            self._guardado_pendiente = False
+            snapshot = self.snapshot
+        if snapshot.version == self._version_guardada:
+            return
+        try:
+            guardar_archivo_snapshot(self.ruta_archivo, snapshot)
+            self._version_guardada = snapshot.version
+        except OSError as e:
+            print(f"No se pudo guardar el snapshot del corpus: {e}")
+
+    def guardar_pendiente(self, timeout: Optional[float] = None):
+        """Espera a que se escriban los cambios ya publicados"""
+        if self._ejecutor_guardado is not None:
+            self._ejecutor_guardado.submit(lambda: None).result(timeout)
+
+    def _sincronizar(self, directorios: Dict[str, str]) -> Dict[str, int]:
+        base = self.snapshot._entradas
+        en_disco = self._escanear(directorios)
+        orden = {path: indice for indice, path in enumerate(en_disco)}
+        self._progreso = dict(self._progreso, documentos_total=len(en_disco))
+        cambios = {"nuevos": 0, "modificados": 0, "eliminados": 0, "sin_cambios": 0, "errores": 0}
+
+        eliminados = [path for path in base if path not in en_disco]
+        cambios["eliminados"] = len(eliminados)
+        nuevas = {}  # path -> entrada que reemplaza a la de `base`
+        pendientes = {}
+        for path, (tipo, filename, tamano, mtime_ns) in en_disco.items():
+            entrada = base.get(path)
+            if entrada is not None and entrada.tipo == tipo and (entrada.tamano, entrada.mtime_ns) == (tamano, mtime_ns):
+                cambios["sin_cambios"] += 1
+                continue
+            try:
+                sha256 = calcular_hash_archivo(path)
+            except OSError:
+                continue
+            if entrada is not None and entrada.tipo == tipo and entrada.sha256 == sha256:
+                # Solo cambió el mtime (copia, touch): no hace falta volver a parsear
+                nuevas[path] = EntradaManifiesto(tipo, filename, tamano, mtime_ns, sha256, entrada.documento)
+                cambios["sin_cambios"] += 1
+                continue
+            cambios["modificados" if entrada is not None else "nuevos"] += 1
+            pendientes[path] = (tipo, filename, tamano, mtime_ns, sha256)
+
+        listos = len(en_disco) - len(pendientes)
+        self._progreso = dict(self._progreso, documentos_cargados=listos)
+
+        por_publicar = nuevas
+        por_eliminar = eliminados
+
+        def _publicar_lote():
+            # Publica lo acumulado desde la última publicación, en el orden de los directorios
+            nonlocal por_publicar, por_eliminar
+            lote, borrar = por_publicar, por_eliminar
+            por_publicar, por_eliminar = {}, []
+            if not (lote or borrar):
+                return
+
+            def _aplicar(entradas: Dict[str, EntradaManifiesto]):
+                # Solo se tocan las entradas que nadie registró o eliminó durante el parseo
+                for path in borrar:
+                    if entradas.get(path) is base[path]:
+                        del entradas[path]
+                for path in sorted(lote, key=orden.__getitem__):
+                    if entradas.get(path) is base.get(path):
+                        entradas[path] = lote[path]
+
+            self._publicar(_aplicar)
+
+        if pendientes:
+            tiempo_total = 0.0
+            ultima_publicacion = time.monotonic()
+            for resultado in parse_many(pendientes):
+                path = resultado["path"]
+                tipo, filename, tamano, mtime_ns, sha256 = pendientes[path]
+                tiempo_total += resultado["tiempo_s"] or 0.0
+                documento = None
+                if resultado["error"]:
+                    print(f"Error procesando {tipo} {filename}: {resultado['error']}")
+                    cambios["errores"] += 1
+                elif resultado["secciones"] is not None:
+                    documento = DocumentoParseado(filename, resultado["secciones"])
+                por_publicar[path] = EntradaManifiesto(tipo, filename, tamano, mtime_ns, sha256, documento)
+                listos += 1
+                self._progreso = dict(self._progreso, documentos_cargados=listos)
+                if time.monotonic() - ultima_publicacion >= _INTERVALO_PUBLICACION_S:
+                    _publicar_lote()
+                    ultima_publicacion = time.monotonic()
+            print(f"⏱️ Parseo de {len(pendientes)} archivos: {tiempo_total:.1f}s acumulados entre workers")
+
+        _publicar_lote()
+        return cambios
+
+    def actualizar_indices(self, snapshot: Optional[SnapshotCorpus] = None):
+        """Lleva los índices de búsqueda al snapshot dado (o al vigente) indexando solo las diferencias"""
+        snapshot = snapshot or self.snapshot
+        with self._lock_indices:
+            if snapshot.version <= self._version_indexada:
+                return
+            entradas = snapshot._entradas
+            for path, entrada in list(self._indexadas.items()):
+                if entradas.get(path) is not entrada:
+                    self._indices[entrada.tipo].quitar(path)
+                    self._matriz.quitar(path, diferir_idf=True)
+                    self._minhash[entrada.tipo].quitar(path)
+                    self._secciones[entrada.tipo].quitar(path)
+                    del self._indexadas[path]
+            for path, entrada in entradas.items():
+                if path in self._indexadas or entrada.documento is None:
+                    continue
+                texto = texto_secciones(entrada.documento)
+                frecuencias = frecuencias_terminos(texto)
+                self._indices[entrada.tipo].agregar(path, frecuencias)
+                self._matriz.agregar(path, frecuencias, diferir_idf=True)
+                self._minhash[entrada.tipo].agregar(path, texto)
+                self._secciones[entrada.tipo].agregar(path, entrada.documento.keys())
+                self._indexadas[path] = entrada
+            # Una sola vez por lote (en la carga inicial, en lugar de cada 10% de documentos)
+            self._matriz.recalcular_idf()
+            self._version_indexada = snapshot.version
+
+    def actualizar_texto(self, snapshot: Optional[SnapshotCorpus] = None):
+        """
+        Sincroniza el índice de texto completo con el snapshot (solo tras la carga
+        inicial: antes el corpus está incompleto y se borrarían documentos indexados)
+        """
+        snapshot = snapshot or self.snapshot
+        if self.texto is None or not self._carga_completa:
+            return
+        with self._lock_texto:
+            if snapshot.version <= self._version_texto:
+                return
+            try:
+                agregados, quitados = self.texto.sincronizar(snapshot._entradas)
+            except Exception as e:
+                print(f"⚠️ No se pudo actualizar el índice de búsqueda: {e}")
+                return
+            self._version_texto = snapshot.version
+            if agregados or quitados:
+                print(f"🔎 Índice de búsqueda: {agregados} documentos indexados, {quitados} quitados")
+
+    def buscar_texto(self, consulta: str, **opciones) -> Dict[str, Any]:
+        """Búsqueda de texto completo (ver IndiceTextoCompleto.buscar)"""
+        if self.texto is None:
+            raise RuntimeError("El índice de búsqueda no está activo")
+        return self.texto.buscar(consulta, **opciones)
+
+    def buscar(self, tipo: str, consulta: str, k: int,
+               snapshot: Optional[SnapshotCorpus] = None) -> List[DocumentoParseado]:
+        """
+        Los `k` documentos del tipo más relevantes (BM25) para el texto `consulta`. Si
+        menos de `k` comparten términos con la consulta se completa con los primeros
+        del corpus, como antes de existir el índice.
+        """
+        snapshot = snapshot or self.snapshot
+        entradas = snapshot._entradas
+        # El índice puede ir por delante del snapshot: solo se admiten sus entradas
+        resultados = self._indices[tipo].buscar(
+            frecuencias_terminos(consulta), k,
+            lambda path: entradas.get(path) is self._indexadas.get(path) and path in entradas)
+        documentos = [entradas[path].documento for path, _ in resultados]
+        for documento in snapshot.documentos(tipo):
+            if len(documentos) >= k:
+                break
+            if not any(documento is elegido for elegido in documentos):
+                documentos.append(documento)
+        return documentos
+
+    def similares(self, consulta: str, k: int,
+                  snapshot: Optional[SnapshotCorpus] = None) -> List[Dict[str, Any]]:
+        """Los `k` documentos del corpus (ofertas y licitaciones) más similares (coseno TF-IDF) a `consulta`"""
+        snapshot = snapshot or self.snapshot
+        entradas = snapshot._entradas
+        resultados = self._matriz.similares(
+            frecuencias_terminos(consulta), k,
+            lambda path: entradas.get(path) is self._indexadas.get(path) and path in entradas)
+        return [{"archivo": entradas[path].filename, "tipo": entradas[path].tipo, "similitud": round(similitud, 4)}
+                for path, similitud in resultados]
+
+    def duplicados(self, tipo: str, secciones: Dict[str, Any], umbral: float, excluir: Optional[str] = None,
+                   snapshot: Optional[SnapshotCorpus] = None) -> List[Dict[str, Any]]:
+        """
+        Documentos del tipo que son duplicados exactos (mismo texto normalizado) o casi
+        exactos (similitud Jaccard estimada >= `umbral`) del documento `secciones`,
+        sin contar el archivo `excluir`
+        """
+        snapshot = snapshot or self.snapshot
+        entradas = snapshot._entradas
+        resultados = self._minhash[tipo].duplicados(
+            texto_secciones(secciones), umbral,
+            lambda path: path != excluir and entradas.get(path) is self._indexadas.get(path) and path in entradas)
+        return [{"archivo": entradas[path].filename, "tipo": tipo, "similitud": round(similitud, 4),
+                 "exacto": exacto}
+                for path, similitud, exacto in resultados]
+
+    def informe_duplicados(self, umbral: float, snapshot: Optional[SnapshotCorpus] = None) -> Dict[str, Any]:
+        """Grupos de documentos duplicados entre sí dentro de cada tipo del corpus"""
+        snapshot = snapshot or self.snapshot
+        entradas = snapshot._entradas
+        grupos = []
+        for tipo, indice in self._minhash.items():
+            for paths, similitud, exactos in indice.grupos(
+                    umbral, lambda path: entradas.get(path) is self._indexadas.get(path) and path in entradas):
+                grupos.append({"tipo": tipo, "documentos": [entradas[path].filename for path in paths],
+                               "similitud_minima": round(similitud, 4), "exactos": exactos})
+        grupos.sort(key=lambda grupo: (-len(grupo["documentos"]), grupo["documentos"]))
+        return {
+            "version_corpus": snapshot.version,
+            "documentos_analizados": len(entradas),
+            "grupos": grupos,
+            "documentos_redundantes": sum(len(grupo["documentos"]) - 1 for grupo in grupos)
+        }
+
+    def ejemplos_secciones(self, canonicas: List[str], k: int, consulta: Optional[str] = None,
+                           tipo: str = TIPO_OFERTA, caracteres: int = 600,
+                           snapshot: Optional[SnapshotCorpus] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Hasta `k` ejemplos históricos del tipo para cada sección canónica (ver
+        secciones.SECCIONES_CANONICAS), con su título original y los primeros
+        `caracteres` del contenido. Con `consulta` se prefieren los documentos más
+        relevantes para ella (BM25); las secciones sin ejemplos no se incluyen.
+        """
+        snapshot = snapshot or self.snapshot
+        entradas = snapshot._entradas
+
+        def admitir(path: str) -> bool:
+            return entradas.get(path) is self._indexadas.get(path) and path in entradas
+
+        preferir = []
+        if consulta:
+            preferir = [path for path, _ in self._indices[tipo].buscar(
+                frecuencias_terminos(consulta), self.PREFERIDOS_EJEMPLOS, admitir)]
+        ejemplos = {}
+        for canonica in canonicas:
+            encontrados = []
+            for path, titulo in self._secciones[tipo].titulos(canonica, k, admitir, preferir):
+                contenido = str(entradas[path].documento.get(titulo) or "").strip()
+                if contenido:
+                    encontrados.append({"archivo": entradas[path].filename, "titulo": titulo,
+                                        "contenido": contenido[:caracteres]})
+            if encontrados:
+                ejemplos[canonica] = encontrados
+        return ejemplos
+
+    def conteo_secciones(self) -> Dict[str, Dict[str, int]]:
+        """Documentos de cada tipo indexados con cada sección canónica"""
+        return {tipo: indice.conteos() for tipo, indice in self._secciones.items()}
+
+    def sincronizar_en_segundo_plano(self, directorios: Dict[str, str]) -> Future:
+        """
+        Programa una sincronización en un hilo propio. Si ya hay una esperando turno se
+        devuelve esa misma (cubrirá también los cambios que motivaron esta llamada).
+        """
+        with self._lock:
+            if self._recarga_pendiente is not None and not self._recarga_pendiente.running() \
+                    and not self._recarga_pendiente.done():
+                return self._recarga_pendiente
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus")
+            self._recarga_pendiente = self._ejecutor.submit(self.sincronizar, directorios)
+            return self._recarga_pendiente
+
+    def registrar(self, tipo: str, path: str, secciones: Dict[str, Any]):
+        """Incorpora (o reemplaza) un archivo ya parseado sin volver a parsearlo"""
+        estado = os.stat(path)
+        filename = os.path.basename(path)
+        entrada = EntradaManifiesto(tipo, filename, estado.st_size, estado.st_mtime_ns,
+                                    calcular_hash_archivo(path), DocumentoParseado(filename, secciones))
+        self._publicar(lambda entradas: entradas.__setitem__(path, entrada))
+        self.actualizar_texto()
+        self._programar_guardado()
+
+    def eliminar(self, path: str) -> bool:
+        """Quita un archivo del corpus; devuelve False si no estaba"""
+        if path not in self.snapshot._entradas:
+            return False
+        self._publicar(lambda entradas: entradas.pop(path, None))
+        self.actualizar_texto()
+        self._programar_guardado()
+        return True
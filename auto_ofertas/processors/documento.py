@@ -0,0 +1,80 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, Tuple
+
+class DocumentoParseado(Mapping):
+    """
+    Representación compacta de un documento parseado del corpus histórico.
+
+    Los títulos de sección se internan (los mismos títulos se repiten en miles de
+    documentos) y el contenido de todas las secciones se guarda en una única cadena
+    por documento, con la posición final de cada sección. Se comporta como un
+    diccionario de solo lectura `{titulo: contenido}`; `como_dict()` devuelve el
+    formato anterior, con `archivo_origen` mezclado como una clave más.
+    """
+
+    __slots__ = ("archivo_origen", "_titulos", "_texto", "_fines")
+
+    def __init__(self, archivo_origen: str, secciones: Dict[str, str]):
+        self.archivo_origen = archivo_origen
+        self._titulos = tuple(sys.intern(titulo) for titulo in secciones)
+        partes = list(secciones.values())
+        self._texto = "".join(partes)
+        self._fines = array("I")
+        fin = 0
+        for parte in partes:
+            fin += len(parte)
+            self._fines.append(fin)
+
+    @classmethod
+    def desde_partes(cls, archivo_origen: str, titulos: Iterable[str], texto: str, fines: array) -> "DocumentoParseado":
+        """Reconstruye un documento a partir de `partes()` sin volver a concatenar el texto"""
+        documento = cls.__new__(cls)
+        documento.archivo_origen = archivo_origen
+        documento._titulos = tuple(sys.intern(titulo) for titulo in titulos)
+        documento._texto = texto
+        documento._fines = fines
+        return documento
+
+    def partes(self) -> Tuple[Tuple[str, ...], str, array]:
+        """Títulos, texto concatenado y posición final de cada sección (para persistir)"""
+        return self._titulos, self._texto, self._fines
+
+    def _contenido(self, indice: int) -> str:
+        inicio = self._fines[indice - 1] if indice else 0
+        return self._texto[inicio:self._fines[indice]]
+
+    def __getitem__(self, titulo: str) -> str:
+        try:
+            indice = self._titulos.index(titulo)
+        except ValueError:
+            raise KeyError(titulo) from None
+        return self._contenido(indice)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._titulos)
+
+    def __len__(self) -> int:
+        return len(self._titulos)
+
+    def __contains__(self, titulo: object) -> bool:
+        return titulo in self._titulos
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Genera los pares (título, contenido) decodificando cada sección una sola vez"""
+        for indice, titulo in enumerate(self._titulos):
+            yield titulo, self._contenido(indice)
+
+    def values(self) -> Iterator[str]:
+        for indice in range(len(self._titulos)):
+            yield self._contenido(indice)
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Devuelve el documento en el formato anterior (secciones + `archivo_origen`)"""
+        documento = dict(self.items())
+        documento['archivo_origen'] = self.archivo_origen
+        return documento
+
+    def __repr__(self) -> str:
+        return f"DocumentoParseado({self.archivo_origen!r}, {len(self)} secciones, {len(self._texto)} caracteres)"
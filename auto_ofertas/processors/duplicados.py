@@ -0,0 +1,191 @@
+import hashlib
+import threading
+from array import array
+from typing import Dict, Callable, List, Optional, Set, Tuple
+
+from ..config import Config
+from .busqueda import palabras
+
+# Qué hacer al cargar un duplicado: guardarlo e informarlo, rechazarlo o no guardarlo y
+# devolver el documento existente
+POLITICAS_DUPLICADOS = ("marcar", "rechazar", "vincular")
+
+# Palabras por shingle y valores de la firma MinHash (repartidos en BANDAS bandas LSH de
+# _FILAS valores: dos documentos con similitud Jaccard 0,9 comparten alguna banda con
+# probabilidad > 0,999, con 0,8 en el 95% de los casos y con 0,3 casi nunca)
+TAMANO_SHINGLE = 5
+PERMUTACIONES = 128
+BANDAS = 16
+_FILAS = PERMUTACIONES // BANDAS
+
+# Los valores de las cubetas son de 32 bits; los prestados por la densificación quedan
+# fuera de ese rango
+_MASCARA = (1 << 32) - 1
+_DESPLAZAMIENTO = 1 << 32
+
+def validar_politica_duplicados(politica: Optional[str] = None) -> str:
+    """Normaliza la política ante duplicados solicitada (por defecto Config.DUPLICADOS_POLITICA)"""
+    politica = (politica or Config.DUPLICADOS_POLITICA).strip().lower()
+    if politica not in POLITICAS_DUPLICADOS:
+        raise ValueError(f"Política de duplicados no soportada: {politica}. "
+                         f"Opciones: {', '.join(POLITICAS_DUPLICADOS)}")
+    return politica
+
+def firma_minhash(texto: str) -> Optional[Tuple[array, str]]:
+    """
+    Firma MinHash de los shingles de TAMANO_SHINGLE palabras de `texto` y huella
+    (SHA-1 del texto normalizado) para reconocer los duplicados exactos. Usa one
+    permutation hashing: cada shingle se hashea una sola vez y cae en una de las
+    PERMUTACIONES cubetas, de la que se guarda el mínimo; las cubetas vacías toman el
+    valor de la siguiente llena (densificación por rotación). Devuelve None si el texto
+    no tiene palabras. Las firmas usan hash() y solo son comparables dentro del mismo
+    proceso (no se persisten).
+    """
+    lista = palabras(texto)
+    if not lista:
+        return None
+    huella = hashlib.sha1(" ".join(lista).encode('utf-8')).hexdigest()
+    shingles = set(zip(*(lista[inicio:] for inicio in range(TAMANO_SHINGLE)))) or {tuple(lista)}
+    minimos: List[Optional[int]] = [None] * PERMUTACIONES
+    for shingle in shingles:
+        valor = hash(shingle) & _MASCARA
+        cubeta = valor % PERMUTACIONES
+        if minimos[cubeta] is None or valor < minimos[cubeta]:
+            minimos[cubeta] = valor
+    firma = array('Q', [0] * PERMUTACIONES)
+    for cubeta in range(PERMUTACIONES):
+        distancia = 0
+        while minimos[(cubeta + distancia) % PERMUTACIONES] is None:
+            distancia += 1
+        firma[cubeta] = minimos[(cubeta + distancia) % PERMUTACIONES] + distancia * _DESPLAZAMIENTO
+    return firma, huella
+
+def similitud_firmas(una: array, otra: array) -> float:
+    """Estimación de la similitud Jaccard: fracción de valores iguales de las firmas"""
+    return sum(a == b for a, b in zip(una, otra)) / PERMUTACIONES
+
+class IndiceMinHash:
+    """
+    Índice LSH de firmas MinHash para detectar documentos duplicados o casi duplicados.
+    Cada firma se divide en BANDAS bandas y cada banda se guarda en una tabla
+    (hash de la banda -> documentos): una consulta solo compara la firma con los
+    documentos que coinciden en alguna banda, sin recorrer el corpus. Los duplicados
+    exactos (misma huella) se resuelven con un diccionario aparte.
+    """
+
+    def __init__(self):
+        self._firmas: Dict[str, Tuple[array, str]] = {}
+        self._bandas: List[Dict[int, Set[str]]] = [{} for _ in range(BANDAS)]
+        self._huellas: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._firmas)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._firmas
+
+    @staticmethod
+    def _claves_bandas(firma: array) -> List[int]:
+        return [hash(firma[banda * _FILAS:(banda + 1) * _FILAS].tobytes()) for banda in range(BANDAS)]
+
+    def agregar(self, clave: str, texto: str):
+        """Agrega (o reemplaza) el documento `clave`; los textos sin palabras no se indexan"""
+        resultado = firma_minhash(texto)
+        with self._lock:
+            self._quitar(clave)
+            if resultado is None:
+                return
+            firma, huella = resultado
+            self._firmas[clave] = resultado
+            for tabla, clave_banda in zip(self._bandas, self._claves_bandas(firma)):
+                tabla.setdefault(clave_banda, set()).add(clave)
+            self._huellas.setdefault(huella, set()).add(clave)
+
+    def quitar(self, clave: str) -> bool:
+        with self._lock:
+            return self._quitar(clave)
+
+    def _quitar(self, clave: str) -> bool:
+        resultado = self._firmas.pop(clave, None)
+        if resultado is None:
+            return False
+        firma, huella = resultado
+        for tabla, clave_banda in zip(self._bandas, self._claves_bandas(firma)):
+            cubeta = tabla[clave_banda]
+            cubeta.discard(clave)
+            if not cubeta:
+                del tabla[clave_banda]
+        iguales = self._huellas[huella]
+        iguales.discard(clave)
+        if not iguales:
+            del self._huellas[huella]
+        return True
+
+    def duplicados(self, texto: str, umbral: float,
+                   admitir: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float, bool]]:
+        """
+        Documentos duplicados de `texto`: tuplas (clave, similitud estimada, exacto) con
+        similitud >= `umbral`, primero los exactos y luego de mayor a menor similitud
+        """
+        resultado = firma_minhash(texto)
+        if resultado is None:
+            return []
+        firma, huella = resultado
+        with self._lock:
+            exactos = set(self._huellas.get(huella, ()))
+            candidatos = set()
+            for tabla, clave_banda in zip(self._bandas, self._claves_bandas(firma)):
+                candidatos.update(tabla.get(clave_banda, ()))
+            encontrados = [(clave, 1.0, True) for clave in exactos]
+            for clave in candidatos - exactos:
+                similitud = similitud_firmas(firma, self._firmas[clave][0])
+                if similitud >= umbral:
+                    encontrados.append((clave, similitud, False))
+        if admitir is not None:
+            encontrados = [encontrado for encontrado in encontrados if admitir(encontrado[0])]
+        encontrados.sort(key=lambda encontrado: (not encontrado[2], -encontrado[1]))
+        return encontrados
+
+    def grupos(self, umbral: float,
+               admitir: Optional[Callable[[str], bool]] = None) -> List[Tuple[List[str], float, bool]]:
+        """
+        Agrupa los documentos indexados que son duplicados entre sí (componentes conexas
+        de los pares con similitud >= `umbral`). Devuelve (claves, similitud mínima entre
+        los pares que unieron el grupo, todos exactos) para cada grupo de 2 o más.
+        Solo se comparan los pares que comparten alguna banda.
+        """
+        padres: Dict[str, str] = {}
+
+        def raiz_de(clave: str) -> str:
+            while padres.get(clave, clave) != clave:
+                clave = padres[clave]
+            return clave
+
+        minimas: Dict[str, float] = {}
+        with self._lock:
+            firmas = self._firmas
+            if admitir is not None:
+                firmas = {clave: firma for clave, firma in firmas.items() if admitir(clave)}
+            for tabla in self._bandas:
+                for cubeta in tabla.values():
+                    miembros = [clave for clave in cubeta if clave in firmas]
+                    for posicion, clave in enumerate(miembros):
+                        for otra in miembros[posicion + 1:]:
+                            raiz_clave, raiz_otra = raiz_de(clave), raiz_de(otra)
+                            if raiz_clave == raiz_otra:
+                                continue
+                            firma, huella = firmas[clave]
+                            firma_otra, huella_otra = firmas[otra]
+                            similitud = 1.0 if huella == huella_otra else similitud_firmas(firma, firma_otra)
+                            if similitud < umbral:
+                                continue
+                            padres.setdefault(raiz_clave, raiz_clave)
+                            padres[raiz_otra] = raiz_clave
+                            minimas[raiz_clave] = min(similitud, minimas.get(raiz_clave, 1.0),
+                                                      minimas.get(raiz_otra, 1.0))
+            componentes: Dict[str, List[str]] = {}
+            for clave in padres:
+                componentes.setdefault(raiz_de(clave), []).append(clave)
+            return [(sorted(claves), minimas[raiz], len({firmas[clave][1] for clave in claves}) == 1)
+                    for raiz, claves in componentes.items()]
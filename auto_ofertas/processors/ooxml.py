@@ -0,0 +1,277 @@
+import posixpath
+import zipfile
+from typing import Dict, List, Optional, Iterator
+from lxml import etree
+
+# Espacios de nombres de WordprocessingML y de las relaciones del paquete OPC
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PR = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_TIPO_DOCUMENTO = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_TIPO_ESTILOS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+_BODY = _W + "body"
+_P = _W + "p"
+_RUN = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+_T = _W + "t"
+_TAB = _W + "tab"
+_PTAB = _W + "ptab"
+_BR = _W + "br"
+_CR = _W + "cr"
+_NO_BREAK_HYPHEN = _W + "noBreakHyphen"
+_PPR = _W + "pPr"
+_PSTYLE = _W + "pStyle"
+_SECTPR = _W + "sectPr"
+_TBL = _W + "tbl"
+_TBLGRID = _W + "tblGrid"
+_GRIDCOL = _W + "gridCol"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_TCPR = _W + "tcPr"
+_GRIDSPAN = _W + "gridSpan"
+_VMERGE = _W + "vMerge"
+_VAL = _W + "val"
+_TYPE = _W + "type"
+
+class FragmentoTitulo(str):
+    """Fragmento de texto de un párrafo con estilo de título (Heading) en el DOCX"""
+
+# Nombres internos de estilos que Word guarda en minúsculas (como hace python-docx)
+_NOMBRES_ESTILO_UI = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {n}": f"Heading {n}" for n in range(1, 10)},
+}
+
+def _texto_run(run) -> str:
+    partes = []
+    for hijo in run:
+        tag = hijo.tag
+        if tag == _T:
+            partes.append(hijo.text or "")
+        elif tag == _TAB or tag == _PTAB:
+            partes.append("\t")
+        elif tag == _BR:
+            if hijo.get(_TYPE, "textWrapping") == "textWrapping":
+                partes.append("\n")
+        elif tag == _CR:
+            partes.append("\n")
+        elif tag == _NO_BREAK_HYPHEN:
+            partes.append("-")
+    return "".join(partes)
+
+def _texto_parrafo(parrafo) -> str:
+    """Texto de un párrafo con la misma semántica que `Paragraph.text` de python-docx"""
+    partes = []
+    for hijo in parrafo:
+        if hijo.tag == _RUN:
+            partes.append(_texto_run(hijo))
+        elif hijo.tag == _HYPERLINK:
+            partes.extend(_texto_run(run) for run in hijo if run.tag == _RUN)
+    return "".join(partes)
+
+def _texto_celda(celda) -> str:
+    return "\n".join(_texto_parrafo(p) for p in celda if p.tag == _P)
+
+def _filas_tabla(tabla) -> Iterator[List[str]]:
+    """
+    Genera el texto de las celdas de cada fila replicando `Table.rows[i].cells` de
+    python-docx: las celdas combinadas horizontal o verticalmente repiten el texto
+    de la celda de origen
+    """
+    grid = tabla.find(_TBLGRID)
+    num_columnas = len([c for c in grid if c.tag == _GRIDCOL])
+    filas = [tr for tr in tabla if tr.tag == _TR]
+
+    celdas = []
+    for tr in filas:
+        for tc in tr:
+            if tc.tag != _TC:
+                continue
+            propiedades = tc.find(_TCPR)
+            span, vmerge = 1, None
+            if propiedades is not None:
+                grid_span = propiedades.find(_GRIDSPAN)
+                if grid_span is not None:
+                    span = int(grid_span.get(_VAL))
+                v_merge = propiedades.find(_VMERGE)
+                if v_merge is not None:
+                    vmerge = v_merge.get(_VAL, "continue")
+            for repeticion in range(span):
+                if vmerge == "continue":
+                    celdas.append(celdas[-num_columnas])
+                elif repeticion > 0:
+                    celdas.append(celdas[-1])
+                else:
+                    celdas.append(_texto_celda(tc))
+
+    for indice in range(len(filas)):
+        yield celdas[indice * num_columnas:(indice + 1) * num_columnas]
+
+class LectorOOXML:
+    """
+    Lector directo de DOCX: recorre el XML del cuerpo del documento en streaming
+    (lxml.iterparse) sin construir el árbol completo ni los objetos de python-docx,
+    liberando cada párrafo y tabla en cuanto se procesa.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._ruta_documento = self._resolver_documento()
+        self._relaciones = self._leer_relaciones(self._ruta_documento)
+        self._estilos = self._leer_estilos()
+
+    def cerrar(self):
+        self._zip.close()
+
+    def _leer_relaciones(self, ruta_parte: str) -> Dict[str, Dict[str, str]]:
+        """Devuelve rId -> {tipo, destino} de las relaciones de una parte del paquete"""
+        directorio, nombre = posixpath.split(ruta_parte)
+        ruta_rels = posixpath.join(directorio, "_rels", f"{nombre}.rels")
+        try:
+            raiz = etree.fromstring(self._zip.read(ruta_rels))
+        except KeyError:
+            return {}
+        relaciones = {}
+        for rel in raiz.iter(_PR + "Relationship"):
+            if rel.get("TargetMode") == "External":
+                continue
+            destino = rel.get("Target", "")
+            if destino.startswith("/"):
+                destino = destino[1:]
+            else:
+                destino = posixpath.normpath(posixpath.join(directorio, destino))
+            relaciones[rel.get("Id")] = {"tipo": rel.get("Type"), "destino": destino}
+        return relaciones
+
+    def _resolver_documento(self) -> str:
+        for rel in self._leer_relaciones("").values():
+            if rel["tipo"] == _TIPO_DOCUMENTO:
+                return rel["destino"]
+        raise ValueError("El paquete DOCX no tiene parte principal de documento")
+
+    def _leer_estilos(self) -> Dict[Optional[str], Optional[str]]:
+        """
+        Devuelve styleId -> nombre de los estilos de párrafo, con el estilo de párrafo
+        por defecto bajo la clave None. Los identificadores de estilos de otro tipo
+        se resuelven al estilo por defecto, igual que en python-docx.
+        """
+        estilos = {None: None}
+        ruta = next((r["destino"] for r in self._relaciones.values() if r["tipo"] == _TIPO_ESTILOS), None)
+        if ruta is None:
+            return estilos
+        raiz = etree.fromstring(self._zip.read(ruta))
+        otros_tipos = set()
+        for estilo in raiz.iterchildren(_W + "style"):
+            id_estilo = estilo.get(_W + "styleId")
+            if estilo.get(_TYPE) != "paragraph":
+                if id_estilo not in estilos:
+                    otros_tipos.add(id_estilo)
+                continue
+            nombre = estilo.find(_W + "name")
+            nombre = nombre.get(_VAL) if nombre is not None else None
+            nombre = _NOMBRES_ESTILO_UI.get(nombre, nombre)
+            if id_estilo not in otros_tipos:
+                estilos.setdefault(id_estilo, nombre)
+            if estilo.get(_W + "default") in ("1", "true", "on"):
+                estilos[None] = nombre
+        return estilos
+
+    def _es_titulo(self, parrafo) -> bool:
+        id_estilo = None
+        propiedades = parrafo.find(_PPR)
+        if propiedades is not None:
+            estilo = propiedades.find(_PSTYLE)
+            if estilo is not None:
+                id_estilo = estilo.get(_VAL)
+        nombre = self._estilos.get(id_estilo or None, self._estilos[None])
+        return bool(nombre) and nombre.startswith('Heading')
+
+    def _parrafos_parte(self, r_id: str) -> List[str]:
+        raiz = etree.fromstring(self._zip.read(self._relaciones[r_id]["destino"]))
+        return [_texto_parrafo(p) for p in raiz if p.tag == _P]
+
+    def iterar_texto(self) -> Iterator[str]:
+        """
+        Genera los mismos fragmentos que la extracción con python-docx: primero los
+        párrafos del cuerpo, después las tablas y por último headers y footers
+        """
+        tablas = []
+        secciones = []
+        profundidad = 0
+        with self._zip.open(self._ruta_documento) as f:
+            for evento, elemento in etree.iterparse(f, events=("start", "end"), remove_blank_text=True):
+                if evento == "start":
+                    profundidad += 1
+                    continue
+                profundidad -= 1
+                if profundidad != 2 or elemento.getparent().tag != _BODY:
+                    continue
+
+                if elemento.tag == _P:
+                    text = _texto_parrafo(elemento).strip()
+                    if text:
+                        if self._es_titulo(elemento):
+                            yield FragmentoTitulo(f"\n\n{text}\n")
+                        else:
+                            yield text + "\n"
+                    propiedades = elemento.find(_PPR)
+                    if propiedades is not None and propiedades.find(_SECTPR) is not None:
+                        secciones.append(self._referencias_seccion(propiedades.find(_SECTPR)))
+                elif elemento.tag == _TBL:
+                    # Las tablas van después de todos los párrafos; se guarda solo su texto
+                    fragmentos = ["\n--- TABLA ---\n"]
+                    for celdas in _filas_tabla(elemento):
+                        row_content = [c.strip() for c in celdas if c.strip()]
+                        if row_content:
+                            fragmentos.append(" | ".join(row_content) + "\n")
+                    fragmentos.append("--- FIN TABLA ---\n")
+                    tablas.append("".join(fragmentos))
+                elif elemento.tag == _SECTPR:
+                    secciones.append(self._referencias_seccion(elemento))
+
+                # Liberar el elemento ya procesado y sus hermanos anteriores
+                elemento.clear()
+                while elemento.getprevious() is not None:
+                    del elemento.getparent()[0]
+
+        yield from tablas
+        yield from self._iterar_headers_footers(secciones)
+
+    @staticmethod
+    def _referencias_seccion(sect_pr) -> Dict[str, Optional[str]]:
+        referencias = {"header": None, "footer": None}
+        for tipo in referencias:
+            for ref in sect_pr.iterchildren(_W + f"{tipo}Reference"):
+                if ref.get(_TYPE) == "default":
+                    referencias[tipo] = ref.get(_R + "id")
+                    break
+        return referencias
+
+    def _iterar_headers_footers(self, secciones: List[Dict[str, Optional[str]]]) -> Iterator[str]:
+        # Cada sección sin header/footer propio hereda el de la sección anterior
+        try:
+            for indice, seccion in enumerate(secciones):
+                for tipo, prefijo in (("header", "HEADER"), ("footer", "FOOTER")):
+                    r_id = next((s[tipo] for s in reversed(secciones[:indice + 1]) if s[tipo]), None)
+                    if r_id is None:
+                        continue
+                    for texto in self._parrafos_parte(r_id):
+                        if texto.strip():
+                            yield f"{prefijo}: {texto.strip()}\n"
+        except Exception:
+            pass  # Algunos documentos pueden no tener headers/footers accesibles
+
+def iterar_texto_docx_ooxml(path: str) -> Iterator[str]:
+    """
+    Genera el texto de un archivo DOCX leyendo directamente su XML en streaming
+    """
+    lector = LectorOOXML(path)
+    try:
+        yield from lector.iterar_texto()
+    finally:
+        lector.cerrar()
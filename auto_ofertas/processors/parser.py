@@ -1,9 +1,142 @@
 from docx import Document
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
 import os
+import json
+import hashlib
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import PyPDF2
 import pdfplumber
+from ..config import Config
+from .cache import cache_parseo, cache_paginas
+from .ooxml import iterar_texto_docx_ooxml, FragmentoTitulo
+from .sandbox import (pool_parseo, PoolParseoAislado, contexto_procesos,
+                      configuracion_proceso, aplicar_configuracion)
+
+# Incrementar cada vez que cambie la lógica de extracción o de detección de secciones,
+# para invalidar los resultados guardados en la caché de parseo
+PARSER_VERSION = "4"
+
+# Tamaño a partir del cual la copia de respaldo del texto se vuelca a disco
+_MAX_RESPALDO_EN_MEMORIA = 1024 * 1024
+
+# Motores de extracción de PDF: PyPDF2 (rápido), pdfplumber (respeta el layout) o
+# elección automática por muestreo
+MOTOR_PDF_RAPIDO = "fast"
+MOTOR_PDF_LAYOUT = "layout"
+MOTOR_PDF_AUTO = "auto"
+MOTORES_PDF = (MOTOR_PDF_RAPIDO, MOTOR_PDF_LAYOUT, MOTOR_PDF_AUTO)
+_NOMBRES_MOTOR_PDF = {MOTOR_PDF_RAPIDO: "PyPDF2", MOTOR_PDF_LAYOUT: "pdfplumber"}
+
+# Lectores de DOCX: XML directo en streaming y python-docx como respaldo
+LECTOR_DOCX_OOXML = "ooxml"
+LECTOR_DOCX_PYTHON_DOCX = "python-docx"
+
+# Proporción mínima de espacios por carácter visible para aceptar el texto de PyPDF2
+_PROPORCION_MIN_ESPACIOS = 0.05
+
+# Mínimo de páginas que se asignan a cada proceso en la extracción paralela
+_PAGINAS_MIN_POR_WORKER = 10
+
+# Palabras clave comunes en licitaciones (patrón 6)
+PALABRAS_CLAVE = [
+    "OBJETIVO", "ALCANCE", "REQUISITOS", "ESPECIFICACIONES", "PLAZOS", 
+    "PRESUPUESTO", "CRITERIOS", "EVALUACIÓN", "CONDICIONES", "GARANTÍAS",
+    "METODOLOGÍA", "EQUIPO", "EXPERIENCIA", "REFERENCIAS", "ENTREGABLES",
+    "CRONOGRAMA", "FACTORES", "RIESGOS", "CALIDAD", "SOPORTE",
+    "DESCRIPCIÓN", "CARACTERÍSTICAS", "FUNCIONALIDADES", "USUARIOS",
+    "PERFILES", "ROLES", "PERMISOS", "INTEGRACIÓN", "DESARROLLO",
+    "IMPLEMENTACIÓN", "CAPACITACIÓN", "DOCUMENTACIÓN", "PRUEBAS",
+    "DESPLIEGUE", "MANTENIMIENTO", "SERVICIOS", "PRODUCTOS",
+    "SOLUCIÓN", "SISTEMA", "PLATAFORMA", "APLICACIÓN", "SOFTWARE",
+    "HARDWARE", "INFRAESTRUCTURA", "TECNOLOGÍA", "ARQUITECTURA",
+    "BASE DE DATOS", "INTERFAZ", "API", "WEB", "MÓVIL", "CLOUD",
+    "SEGURIDAD", "BACKUP", "RESPALDO", "MONITOREO", "REPORTES",
+    "ANÁLISIS", "ESTUDIO", "DIAGNÓSTICO", "PLAN", "ESTRATEGIA",
+    "PROCESO", "PROCEDIMIENTO", "POLÍTICA", "ESTÁNDAR", "NORMATIVA"
+]
+
+# Palabras específicas de licitaciones (patrón 8)
+PALABRAS_LICITACION = [
+    "LICITACIÓN", "CONCURSO", "CONVOCATORIA", "BASES", "TÉRMINOS",
+    "CONDICIONES", "REQUISITOS", "ESPECIFICACIONES", "PLIEGO",
+    "PROPUESTA", "OFERTA", "PRESENTACIÓN", "EVALUACIÓN", "SELECCIÓN"
+]
+
+def _compilar_regex_palabras(palabras) -> "re.Pattern":
+    """
+    Compila las palabras en una única expresión regular con forma de trie
+    (prefijos comunes factorizados), equivalente a `any(p in texto for p in palabras)`
+    pero recorriendo el texto una sola vez
+    """
+    trie = {}
+    for palabra in palabras:
+        nodo = trie
+        for caracter in palabra:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = {}
+    
+    def _a_regex(nodo: dict) -> str:
+        # Si una palabra termina aquí, cualquier continuación es redundante para buscar subcadenas
+        if '' in nodo:
+            return ''
+        alternativas = [re.escape(c) + _a_regex(hijo) for c, hijo in sorted(nodo.items())]
+        if len(alternativas) == 1:
+            return alternativas[0]
+        return '(?:' + '|'.join(alternativas) + ')'
+    
+    return re.compile(_a_regex(trie))
+
+# Clasificador de títulos precompilado una sola vez al importar el módulo
+_RE_PALABRAS_TITULO = _compilar_regex_palabras(set(PALABRAS_CLAVE) | set(PALABRAS_LICITACION))
+# Patrones 2 a 5: "Título:", "1. Título", "IV. Título" y "A. Título"
+_RE_TITULO_ESTRUCTURADO = re.compile(
+    r"[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+:"
+    r"|(?:\d+|[IVX]+|[A-Z])\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+"
+)
+_RE_PORCENTAJE = re.compile(r'\d+%')
+# Numeración de títulos ("1. ", "2.3 ", "IV. ", "A) "): evidencia de un título real. Un
+# número sin delimitador ("1 Introducción") solo cuenta en líneas muy cortas, para no
+# tomar como título un párrafo que empieza con una cantidad ("12 Meses de garantía...")
+_RE_NUMERACION = re.compile(
+    r"(?:\d{1,2}(?:\.\d{1,2})*[.)]\s+|\d{1,2}(?:\.\d{1,2})+\s+|[IVXLC]{1,6}[.)]\s*|[A-Za-z][.)]\s*)[A-ZÁÉÍÓÚÑ]")
+_RE_NUMERACION_SIMPLE = re.compile(r"\d{1,2}\s+[A-ZÁÉÍÓÚÑ]")
+_MAX_PALABRAS_NUMERACION_SIMPLE = 3
+
+def _tiene_numeracion(line_strip: str) -> bool:
+    """Indica si la línea empieza con la numeración de un título"""
+    if _RE_NUMERACION.match(line_strip):
+        return True
+    return (_RE_NUMERACION_SIMPLE.match(line_strip) is not None
+            and len(line_strip.split()) <= _MAX_PALABRAS_NUMERACION_SIMPLE)
+
+def es_linea_titulo(line_strip: str) -> bool:
+    """
+    Indica si una línea (ya sin espacios en los extremos) es un título de sección.
+    Evalúa primero los patrones más baratos; el resultado es el mismo que aplicar
+    todos los patrones por separado.
+    """
+    # Patrón 1: Todo en mayúsculas y más de 3 caracteres
+    if len(line_strip) > 3 and line_strip.isupper():
+        return True
+    
+    # Patrón 7: Líneas que parecen títulos por su formato (corta y con mayúsculas)
+    if (len(line_strip) < 100 and
+            line_strip[0].isupper() and
+            not line_strip.endswith('.') and
+            not line_strip.endswith(',') and
+            len(line_strip.split()) <= 8 and
+            not _RE_PORCENTAJE.search(line_strip)):  # No porcentajes
+        return True
+    
+    # Patrones 6 y 8: Palabras clave de licitaciones
+    if _RE_PALABRAS_TITULO.search(line_strip.upper()):
+        return True
+    
+    # Patrones 2 a 5: Títulos con dos puntos o numerados
+    return _RE_TITULO_ESTRUCTURADO.fullmatch(line_strip) is not None
 
 def detectar_tipo_archivo(path: str) -> str:
     """
@@ -17,40 +150,461 @@ def detectar_tipo_archivo(path: str) -> str:
     else:
         raise ValueError(f"Formato de archivo no soportado: {extension}. Solo se soportan .docx y .pdf")
 
-def extraer_texto_pdf(path: str) -> str:
+def _liberar_pagina_pdfplumber(page):
+    """
+    Libera los objetos cacheados de una página de pdfplumber: la caché de
+    propiedades y el mapa de texto memoizado con todos sus caracteres
+    """
+    page.flush_cache()
+    get_textmap = getattr(page, 'get_textmap', None)
+    if hasattr(get_textmap, 'cache_clear'):
+        get_textmap.cache_clear()
+
+class _LectorPdfplumber:
+    """
+    Acceso página a página a un PDF con pdfplumber, opcionalmente limitado a las
+    páginas [inicio, fin) (base 0)
+    """
+    
+    def __init__(self, path: str, inicio: int = 0, fin: int = None):
+        paginas = None if fin is None else list(range(inicio + 1, fin + 1))
+        self._pdf = pdfplumber.open(path, pages=paginas)
+        self._desplazamiento = 0 if fin is None else inicio
+    
+    def num_paginas(self) -> int:
+        return len(self._pdf.pages)
+    
+    def extraer_pagina(self, indice: int) -> str:
+        page = self._pdf.pages[indice - self._desplazamiento]
+        try:
+            return page.extract_text() or ""
+        finally:
+            _liberar_pagina_pdfplumber(page)
+    
+    def cerrar(self):
+        self._pdf.close()
+
+class _LectorPyPDF2:
+    """
+    Acceso página a página a un PDF con PyPDF2
+    """
+    
+    def __init__(self, path: str, inicio: int = 0, fin: int = None):
+        self._file = open(path, 'rb')
+        try:
+            self._reader = PyPDF2.PdfReader(self._file)
+        except Exception:
+            self._file.close()
+            raise
+    
+    def num_paginas(self) -> int:
+        return len(self._reader.pages)
+    
+    def extraer_pagina(self, indice: int) -> str:
+        return self._reader.pages[indice].extract_text() or ""
+    
+    def cerrar(self):
+        self._file.close()
+
+_LECTORES_PDF = {MOTOR_PDF_RAPIDO: _LectorPyPDF2, MOTOR_PDF_LAYOUT: _LectorPdfplumber}
+
+class _HuellasPaginasPdf:
+    """
+    Calcula la huella de cada página de un PDF a partir de su content stream
+    (decodificado), sus fuentes, los Form XObjects que dibuja (con sus propias
+    fuentes y formularios anidados), su tamaño y su rotación, sin extraer el texto.
+    Dos versiones de un documento comparten la huella de las páginas no modificadas.
+    """
+    
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._reader = PyPDF2.PdfReader(self._file)
+        except Exception:
+            self._file.close()
+            raise
+    
+    def num_paginas(self) -> int:
+        return len(self._reader.pages)
+    
+    def huella(self, indice: int) -> Optional[str]:
+        """Devuelve el SHA-256 de la página o None si no se puede calcular"""
+        try:
+            page = self._reader.pages[indice]
+            sha = hashlib.sha256()
+            contenidos = page.get('/Contents')
+            contenidos = contenidos.get_object() if contenidos is not None else []
+            if not isinstance(contenidos, list):
+                contenidos = [contenidos]
+            for contenido in contenidos:
+                sha.update(contenido.get_object().get_data())
+            self._agregar_recursos(sha, page.get('/Resources'), set())
+            sha.update(f"|{list(page.mediabox)}|{page.get('/Rotate', 0)}".encode('utf-8'))
+            return sha.hexdigest()
+        except Exception as e:
+            print(f"No se pudo calcular la huella de la página {indice + 1}: {e}")
+            return None
+    
+    def _agregar_recursos(self, sha, recursos, vistos: set):
+        """Agrega a la huella las fuentes y los Form XObjects (recursivamente) de `recursos`"""
+        recursos = recursos.get_object() if recursos is not None else {}
+        fuentes = recursos.get('/Font')
+        fuentes = fuentes.get_object() if fuentes is not None else {}
+        for nombre in sorted(fuentes):
+            fuente = fuentes[nombre].get_object()
+            sha.update(f"|{nombre}={fuente.get('/BaseFont')}/{fuente.get('/Encoding')}".encode('utf-8'))
+        xobjects = recursos.get('/XObject')
+        xobjects = xobjects.get_object() if xobjects is not None else {}
+        for nombre in sorted(xobjects):
+            referencia = xobjects[nombre]
+            xobject = referencia.get_object()
+            if xobject.get('/Subtype') != '/Form':
+                continue  # Las imágenes no aportan texto
+            # Un formulario compartido o que se dibuja a sí mismo se recorre una sola vez
+            identificador = getattr(referencia, 'idnum', None) or id(xobject)
+            sha.update(f"|{nombre}:".encode('utf-8'))
+            if identificador in vistos:
+                continue
+            vistos.add(identificador)
+            sha.update(xobject.get_data())
+            sha.update(f"|{xobject.get('/Matrix')}".encode('utf-8'))
+            self._agregar_recursos(sha, xobject.get('/Resources'), vistos)
+    
+    def cerrar(self):
+        self._file.close()
+
+def _iterar_paginas_con_respaldo(path: str, motor: str, registro: List[Dict[str, Any]],
+                                 inicio: int = 0, fin: int = None) -> Iterator[str]:
     """
-    Extrae texto de un archivo PDF usando pdfplumber para mejor calidad
+    Genera el texto de las páginas [inicio, fin) con el motor indicado. Las páginas
+    en que ese motor falla se extraen con el otro motor, conservando las demás.
+    Con Config.PAGINAS_CACHE_ACTIVA el texto de cada página se reutiliza desde la
+    caché por página mientras no cambie su contenido.
+    Agrega a `registro` el motor usado y el tiempo de cada página.
     """
-    content = ""
+    motores = (motor, MOTOR_PDF_LAYOUT if motor == MOTOR_PDF_RAPIDO else MOTOR_PDF_RAPIDO)
+    lectores = {}
+    huellas = None
+    
+    def _lector(m: str):
+        # Cada lector se abre como mucho una vez; None si el motor no pudo abrir el archivo
+        if m not in lectores:
+            try:
+                lectores[m] = _LECTORES_PDF[m](path, inicio, fin)
+            except Exception as e:
+                print(f"Error con {_NOMBRES_MOTOR_PDF[m]} abriendo el PDF: {e}")
+                lectores[m] = None
+        return lectores[m]
     
     try:
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    content += page_text + "\n"
+        if Config.PAGINAS_CACHE_ACTIVA:
+            try:
+                huellas = _HuellasPaginasPdf(path)
+            except Exception:
+                huellas = None  # Sin huellas no hay caché por página
+        
+        if fin is None:
+            if huellas is not None:
+                fin = huellas.num_paginas()
+            else:
+                lector_total = _lector(motores[0]) or _lector(motores[1])
+                if lector_total is None:
+                    raise ValueError(f"No se pudo extraer texto del PDF: {path}")
+                fin = lector_total.num_paginas()
+        
+        for indice in range(inicio, fin):
+            inicio_pagina = time.perf_counter()
+            huella = huellas.huella(indice) if huellas is not None else None
+            clave = f"{huella}-{PARSER_VERSION}-{motor}" if huella else None
+            en_cache = cache_paginas.obtener(clave) if clave else None
+            
+            if en_cache is not None:
+                texto, usado, error = en_cache["texto"], en_cache["motor"], None
+            else:
+                texto, usado, error = "", None, None
+                for m in motores:
+                    lector = _lector(m)
+                    if lector is None:
+                        continue
+                    try:
+                        texto = lector.extraer_pagina(indice)
+                        usado = m
+                        break
+                    except Exception as e:
+                        error = str(e)
+                        print(f"Error con {_NOMBRES_MOTOR_PDF[m]} en la página {indice + 1}: {e}")
+                if huella and usado is not None:
+                    # Bajo la clave del motor que produjo el texto: si fue el de respaldo, el
+                    # texto no se sirve a quien pida el motor principal
+                    cache_paginas.guardar(f"{huella}-{PARSER_VERSION}-{usado}", {"texto": texto, "motor": usado})
+            
+            pagina = {
+                "pagina": indice + 1,
+                "motor": usado,
+                "tiempo_ms": round((time.perf_counter() - inicio_pagina) * 1000, 2)
+            }
+            if en_cache is not None:
+                pagina["cache"] = True
+            if usado is None:
+                pagina["error"] = error
+            registro.append(pagina)
+            if texto:
+                yield texto + "\n"
+    finally:
+        if huellas is not None:
+            huellas.cerrar()
+        for lector in lectores.values():
+            if lector is not None:
+                lector.cerrar()
+
+def contar_paginas_pdf(path: str) -> int:
+    """
+    Cuenta las páginas de un PDF leyendo solo su árbol de páginas (0 si no se puede leer)
+    """
+    try:
+        with open(path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception:
+        return 0
+
+def calcular_workers_pdf(num_paginas: int) -> int:
+    """
+    Decide cuántos procesos usar para extraer un PDF según su número de páginas y
+    los CPUs disponibles (1 significa extracción en serie)
+    """
+    if num_paginas < Config.PDF_PARALELO_MIN_PAGINAS:
+        return 1
+    cpus = os.cpu_count() or 1
+    max_workers = Config.PDF_PARALELO_MAX_WORKERS or cpus
+    return max(1, min(cpus, max_workers, num_paginas // _PAGINAS_MIN_POR_WORKER))
+
+def _extraer_rango_pdf(path: str, motor: str, inicio: int, fin: int):
+    """
+    Extrae el texto y el registro por página de las páginas [inicio, fin).
+    Se ejecuta en los procesos del pool de extracción paralela.
+    """
+    registro = []
+    textos = list(_iterar_paginas_con_respaldo(path, motor, registro, inicio, fin))
+    return textos, registro
+
+def _iterar_paginas_paralelo(path: str, motor: str, num_paginas: int, workers: int,
+                             registro: List[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Reparte los rangos de páginas entre un pool de procesos y genera el texto de
+    cada página en el orden original del documento. Si un worker falla (o el pool
+    queda inutilizable) sigue en serie desde el primer bloque sin extraer.
+    """
+    # Más bloques que workers para repartir mejor la carga entre páginas de distinto costo
+    num_bloques = min(num_paginas, workers * 4)
+    limites = [num_paginas * i // num_bloques for i in range(num_bloques + 1)]
+    # Mismo contexto que el parseo aislado: sin fork desde un servidor con varios hilos
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=contexto_procesos(),
+                                   initializer=aplicar_configuracion,
+                                   initargs=(configuracion_proceso(),))
+    try:
+        futuros = [executor.submit(_extraer_rango_pdf, path, motor, inicio, fin)
+                   for inicio, fin in zip(limites[:-1], limites[1:])]
+        # Se consumen en el orden de los bloques
+        for bloque, futuro in enumerate(futuros):
+            try:
+                textos, registro_bloque = futuro.result()
+            except Exception as e:
+                print(f"Error en la extracción paralela (páginas {limites[bloque] + 1}-{num_paginas}), "
+                      f"se continúa en serie: {type(e).__name__}: {e}")
+                executor.shutdown(cancel_futures=True)
+                yield from _iterar_paginas_con_respaldo(path, motor, registro, limites[bloque], num_paginas)
+                return
+            registro.extend(registro_bloque)
+            yield from textos
+    finally:
+        # Si el consumidor deja de iterar (max_secciones / max_caracteres), no seguir
+        # extrayendo los bloques pendientes ni esperar a los que están en curso
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _iterar_paginas_pdf(path: str, motor: str, registro: List[Dict[str, Any]], paralelo: bool = None) -> Iterator[str]:
+    """
+    Genera el texto de cada página; con el motor `layout` reparte los PDFs grandes
+    entre varios procesos si la extracción paralela está habilitada
+    """
+    if paralelo is None:
+        paralelo = Config.PDF_EXTRACCION_PARALELA
+    if paralelo and motor == MOTOR_PDF_LAYOUT:
+        num_paginas = contar_paginas_pdf(path)
+        workers = calcular_workers_pdf(num_paginas)
+        if workers > 1:
+            return _iterar_paginas_paralelo(path, motor, num_paginas, workers, registro)
+    return _iterar_paginas_con_respaldo(path, motor, registro)
+
+def validar_motor_pdf(motor: Optional[str] = None) -> str:
+    """
+    Normaliza el motor de extracción de PDF solicitado (por defecto Config.PDF_MOTOR)
+    """
+    motor = (motor or Config.PDF_MOTOR).strip().lower()
+    if motor not in MOTORES_PDF:
+        raise ValueError(f"Motor de extracción de PDF no soportado: {motor}. Opciones: {', '.join(MOTORES_PDF)}")
+    return motor
+
+def elegir_motor_pdf(path: str) -> str:
+    """
+    Modo `auto`: extrae con PyPDF2 unas pocas páginas de muestra y elige el motor
+    rápido si su texto tiene densidad suficiente; si no (PDF escaneado, texto
+    fragmentado o palabras pegadas) usa pdfplumber
+    """
+    try:
+        with open(path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_paginas = len(pdf_reader.pages)
+            if num_paginas == 0:
+                return MOTOR_PDF_LAYOUT
+            muestra = sorted({round(i * (num_paginas - 1) / max(1, Config.PDF_AUTO_PAGINAS_MUESTRA - 1))
+                              for i in range(Config.PDF_AUTO_PAGINAS_MUESTRA)})
+            texto = "".join(pdf_reader.pages[i].extract_text() or "" for i in muestra)
     except Exception as e:
-        print(f"Error con pdfplumber: {e}")
-        # Fallback a PyPDF2
+        print(f"No se pudo muestrear el PDF con PyPDF2: {e}")
+        return MOTOR_PDF_LAYOUT
+    
+    caracteres = sum(1 for c in texto if not c.isspace())
+    espacios = len(texto) - caracteres
+    densidad = caracteres / len(muestra)
+    # Con muy pocos espacios el texto suele venir con las palabras pegadas
+    if densidad >= Config.PDF_AUTO_DENSIDAD_MIN and espacios >= caracteres * _PROPORCION_MIN_ESPACIOS:
+        return MOTOR_PDF_RAPIDO
+    return MOTOR_PDF_LAYOUT
+
+def parsear_rango_paginas(texto: str) -> List[Tuple[int, int]]:
+    """
+    Convierte una especificación de páginas como "1-20,35,40-42" (base 1, extremos
+    incluidos) en rangos [inicio, fin) base 0, ordenados y sin solapamientos
+    """
+    rangos = []
+    for parte in texto.split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        desde, _, hasta = parte.partition('-')
         try:
-            with open(path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        content += page_text + "\n"
-        except Exception as e2:
-            print(f"Error con PyPDF2: {e2}")
-            raise ValueError(f"No se pudo extraer texto del PDF: {path}")
+            desde = int(desde)
+            hasta = int(hasta) if hasta.strip() else desde
+        except ValueError:
+            raise ValueError(f"Rango de páginas inválido: '{parte}' (formato esperado: 1-20,35)")
+        if desde < 1 or hasta < desde:
+            raise ValueError(f"Rango de páginas inválido: '{parte}' (formato esperado: 1-20,35)")
+        rangos.append((desde - 1, hasta))
+    if not rangos:
+        raise ValueError("Debe indicar al menos una página")
     
-    return content
+    rangos.sort()
+    unidos = [rangos[0]]
+    for inicio, fin in rangos[1:]:
+        if inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return unidos
 
-def extraer_texto_docx(path: str) -> str:
+def normalizar_limites(max_paginas: Optional[int] = None, paginas: Optional[str] = None,
+                       max_secciones: Optional[int] = None,
+                       max_caracteres: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
-    Extrae texto de un archivo DOCX
+    Valida las opciones de parseo parcial y las devuelve como diccionario (None si no
+    se pidió ningún límite):
+    - `paginas`: páginas a extraer de un PDF, p. ej. "1-20,35"
+    - `max_paginas`: cantidad máxima de páginas de PDF a extraer
+    - `max_secciones`: detener el parseo al completar N secciones
+    - `max_caracteres`: detener el parseo tras procesar M caracteres
+    Los DOCX no tienen páginas, por lo que solo aplican los dos últimos.
+    """
+    limites = {}
+    if paginas is not None and paginas.strip():
+        rangos = parsear_rango_paginas(paginas)
+        limites["paginas"] = ",".join(f"{i + 1}-{f}" if f - i > 1 else str(f) for i, f in rangos)
+    for nombre, valor in (("max_paginas", max_paginas), ("max_secciones", max_secciones),
+                          ("max_caracteres", max_caracteres)):
+        if valor is None:
+            continue
+        if valor < 1:
+            raise ValueError(f"{nombre} debe ser mayor que cero")
+        limites[nombre] = valor
+    return limites or None
+
+def _firma_limites(limites: Optional[Dict[str, Any]]) -> str:
+    """Parte de la clave de caché que distingue los parseos parciales"""
+    if not limites:
+        return ""
+    return "-" + "|".join(f"{clave}={limites[clave]}" for clave in sorted(limites))
+
+def _rangos_a_extraer(path: str, paginas: Optional[str], max_paginas: Optional[int]) -> List[Tuple[int, int]]:
+    """
+    Recorta los rangos pedidos al número real de páginas del PDF y a `max_paginas`
+    """
+    total = contar_paginas_pdf(path)
+    rangos = parsear_rango_paginas(paginas) if paginas else [(0, total or max_paginas or 0)]
+    recortados = []
+    restantes = max_paginas
+    for inicio, fin in rangos:
+        if total:
+            fin = min(fin, total)
+        if restantes is not None:
+            fin = min(fin, inicio + restantes)
+        if fin <= inicio:
+            continue
+        recortados.append((inicio, fin))
+        if restantes is not None:
+            restantes -= fin - inicio
+            if restantes <= 0:
+                break
+    return recortados
+
+def iterar_texto_pdf(path: str, motor: str = None, paralelo: bool = None,
+                     metadatos: Dict[str, Any] = None, paginas: Optional[str] = None,
+                     max_paginas: Optional[int] = None) -> Iterator[str]:
+    """
+    Genera el texto de un PDF página a página con el motor indicado (`fast`, `layout`
+    o `auto`, por defecto Config.PDF_MOTOR). Si una página falla con ese motor se
+    extrae con el otro. Con `paginas` ("1-20,35") y/o `max_paginas` solo se extraen
+    esas páginas. Si se entrega `metadatos`, se completa con el motor elegido y el
+    motor y tiempo de cada página, también si el consumidor deja de leer antes.
+    """
+    motor_solicitado = validar_motor_pdf(motor)
+    motor = elegir_motor_pdf(path) if motor_solicitado == MOTOR_PDF_AUTO else motor_solicitado
+    registro = []
+    
+    try:
+        if paginas or max_paginas:
+            for inicio, fin in _rangos_a_extraer(path, paginas, max_paginas):
+                yield from _iterar_paginas_con_respaldo(path, motor, registro, inicio, fin)
+        else:
+            yield from _iterar_paginas_pdf(path, motor, registro, paralelo)
+        
+        if registro and all(pagina["motor"] is None for pagina in registro):
+            raise ValueError(f"No se pudo extraer texto del PDF: {path}")
+    finally:
+        if metadatos is not None:
+            metadatos.update({
+                "motor_solicitado": motor_solicitado,
+                "motor": motor,
+                "total_paginas": len(registro),
+                "paginas_respaldo": sum(1 for p in registro if p["motor"] not in (None, motor)),
+                "paginas_fallidas": sum(1 for p in registro if p["motor"] is None),
+                "paginas_cache": sum(1 for p in registro if p.get("cache")),
+                "paginas": registro
+            })
+
+def extraer_texto_pdf(path: str, motor: str = None, paralelo: bool = None) -> str:
+    """
+    Extrae texto de un archivo PDF con el motor indicado (`fast`, `layout` o `auto`,
+    por defecto Config.PDF_MOTOR). Con `paralelo` (por defecto
+    Config.PDF_EXTRACCION_PARALELA) el motor `layout` reparte los PDFs grandes por
+    rangos de páginas entre varios procesos.
+    """
+    return "".join(iterar_texto_pdf(path, motor, paralelo))
+
+def iterar_texto_docx(path: str) -> Iterator[str]:
+    """
+    Genera el texto de un archivo DOCX por fragmentos (párrafos, filas de tablas,
+    headers y footers) usando python-docx
     """
     doc = Document(path)
-    content = ""
     
     # Extraer texto de párrafos con mejor manejo
     for paragraph in doc.paragraphs:
@@ -58,13 +612,13 @@ def extraer_texto_docx(path: str) -> str:
         if text:
             # Preservar saltos de línea importantes
             if paragraph.style.name.startswith('Heading'):
-                content += f"\n\n{text}\n"
+                yield FragmentoTitulo(f"\n\n{text}\n")
             else:
-                content += text + "\n"
+                yield text + "\n"
     
     # Extraer texto de tablas con mejor estructura
     for table in doc.tables:
-        content += "\n--- TABLA ---\n"
+        yield "\n--- TABLA ---\n"
         for row in table.rows:
             row_content = []
             for cell in row.cells:
@@ -72,8 +626,8 @@ def extraer_texto_docx(path: str) -> str:
                 if cell_text:
                     row_content.append(cell_text)
             if row_content:
-                content += " | ".join(row_content) + "\n"
-        content += "--- FIN TABLA ---\n"
+                yield " | ".join(row_content) + "\n"
+        yield "--- FIN TABLA ---\n"
     
     # Extraer texto de headers y footers si están disponibles
     try:
@@ -81,145 +635,395 @@ def extraer_texto_docx(path: str) -> str:
             if section.header:
                 for paragraph in section.header.paragraphs:
                     if paragraph.text.strip():
-                        content += f"HEADER: {paragraph.text.strip()}\n"
+                        yield f"HEADER: {paragraph.text.strip()}\n"
             if section.footer:
                 for paragraph in section.footer.paragraphs:
                     if paragraph.text.strip():
-                        content += f"FOOTER: {paragraph.text.strip()}\n"
+                        yield f"FOOTER: {paragraph.text.strip()}\n"
     except:
         pass  # Algunos documentos pueden no tener headers/footers accesibles
-    
-    return content
 
-def parse_licitacion_dinamica(path: str) -> Dict[str, Any]:
+def procesar_texto_docx(path: str, consumir, metadatos: Dict[str, Any] = None):
     """
-    Parsea un documento de licitación (DOCX o PDF) y extrae su contenido estructurado
+    Pasa a `consumir` el flujo de fragmentos de texto de un DOCX leído con el lector
+    OOXML directo. Si ese lector falla, el documento se vuelve a procesar desde el
+    principio con python-docx. Devuelve lo que devuelva `consumir`.
+    """
+    try:
+        resultado = consumir(iterar_texto_docx_ooxml(path))
+        lector = LECTOR_DOCX_OOXML
+    except Exception as e:
+        print(f"Lector OOXML falló en {os.path.basename(path)}, usando python-docx: {e}")
+        resultado = consumir(iterar_texto_docx(path))
+        lector = LECTOR_DOCX_PYTHON_DOCX
+    if metadatos is not None:
+        metadatos["lector"] = lector
+    return resultado
+
+def extraer_texto_docx(path: str) -> str:
+    """
+    Extrae texto de un archivo DOCX
+    """
+    return procesar_texto_docx(path, "".join)
+
+def iterar_lineas(fragmentos: Iterable[str]) -> Iterator[str]:
+    """
+    Convierte un flujo de fragmentos de texto en líneas, produciendo exactamente
+    las mismas líneas que `"".join(fragmentos).split('\n')`
+    """
+    pendiente = ""
+    for fragmento in fragmentos:
+        partes = (pendiente + fragmento).split('\n')
+        pendiente = partes.pop()
+        yield from partes
+    yield pendiente
+
+class DetectorSecciones:
+    """
+    Máquina de estados incremental que agrupa las líneas en secciones a medida que
+    llegan, sin necesidad de tener el documento completo en memoria. El texto original
+    solo se conserva (en un archivo temporal si es grande) para los casos de respaldo
+    en que no se detectan secciones.
+    Los títulos con evidencia real (estilo Heading del DOCX o numeración) se recuerdan
+    para la consolidación final de secciones.
     """
-    # Detectar tipo de archivo
-    tipo_archivo = detectar_tipo_archivo(path)
-    
-    # Extraer texto según el tipo de archivo
-    if tipo_archivo == 'docx':
-        content = extraer_texto_docx(path)
-    elif tipo_archivo == 'pdf':
-        content = extraer_texto_pdf(path)
-    else:
-        raise ValueError(f"Tipo de archivo no soportado: {tipo_archivo}")
-    
-    # Detectar secciones por múltiples patrones mejorados
-    secciones = {}
-    seccion_actual = None
-    buffer = []
     
-    lines = content.split('\n')
+    def __init__(self):
+        self.secciones = {}
+        self.titulos_estilo = set()
+        self.consolidacion = None
+        self._titulos_fuertes = set()
+        self.seccion_actual = None
+        self.buffer = []
+        self._respaldo = tempfile.SpooledTemporaryFile(
+            max_size=_MAX_RESPALDO_EN_MEMORIA, mode='w+', encoding='utf-8'
+        )
+        self._primera_linea = True
     
-    for line in lines:
+    def procesar_linea(self, line: str):
+        """Procesa una línea del documento"""
+        if self._primera_linea:
+            self._primera_linea = False
+        else:
+            self._respaldo.write('\n')
+        self._respaldo.write(line)
+        
         line_strip = line.strip()
         if not line_strip:
-            continue
-        
-        # Patrones mejorados para detectar títulos de sección
-        es_titulo = False
+            return
         
-        # Patrón 1: Todo en mayúsculas y más de 3 caracteres
-        if line_strip.isupper() and len(line_strip) > 3:
-            es_titulo = True
+        con_estilo = line_strip in self.titulos_estilo
+        if con_estilo or es_linea_titulo(line_strip):
+            if self.seccion_actual and self.buffer:
+                self._cerrar_seccion()
+                self.buffer = []
+            self.seccion_actual = line_strip.rstrip(':').strip()
+            if con_estilo or _tiene_numeracion(line_strip):
+                self._titulos_fuertes.add(self.seccion_actual)
+        else:
+            self.buffer.append(line_strip)
+    
+    def _cerrar_seccion(self):
+        contenido_seccion = '\n'.join(self.buffer).strip()
+        if contenido_seccion and len(contenido_seccion) > 10:
+            self.secciones[self.seccion_actual] = contenido_seccion
+    
+    def _contenido_original(self) -> str:
+        self._respaldo.seek(0)
+        return self._respaldo.read()
+    
+    def finalizar(self) -> Dict[str, Any]:
+        """Cierra la última sección, aplica los respaldos y devuelve las secciones limpias"""
+        try:
+            return self._finalizar()
+        finally:
+            self.cerrar()
+    
+    def cerrar(self):
+        """Libera la copia de respaldo del texto"""
+        self._respaldo.close()
+    
+    def _finalizar(self) -> Dict[str, Any]:
+        secciones = self.secciones
         
-        # Patrón 2: Termina en dos puntos y tiene mayúsculas
-        elif re.match(r"^[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+:$", line_strip):
-            es_titulo = True
+        # Agregar la última sección
+        if self.seccion_actual and self.buffer:
+            self._cerrar_seccion()
         
-        # Patrón 3: Números seguidos de punto y texto (1. TÍTULO)
-        elif re.match(r"^\d+\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
-            es_titulo = True
+        detectadas = bool(secciones)
         
-        # Patrón 4: Números romanos seguidos de punto (I. TÍTULO)
-        elif re.match(r"^[IVX]+\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
-            es_titulo = True
+        # Si no se detectaron secciones, intentar dividir por párrafos largos
+        if not secciones:
+            content = self._contenido_original()
+            parrafos = [p.strip() for p in content.split('\n\n') if p.strip()]
+            if len(parrafos) > 1:
+                for i, parrafo in enumerate(parrafos[:10]):  # Máximo 10 secciones
+                    if len(parrafo) > 50:  # Solo párrafos sustanciales
+                        secciones[f'Sección_{i+1}'] = parrafo
+            else:
+                # Si todo el contenido está en un solo bloque, dividirlo
+                if len(content.strip()) > 200:
+                    secciones['contenido'] = content.strip()
         
-        # Patrón 5: Letras seguidas de punto (A. TÍTULO)
-        elif re.match(r"^[A-Z]\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
-            es_titulo = True
+        # Limpiar y mejorar secciones
+        secciones_limpias = {}
+        for seccion, contenido in secciones.items():
+            contenido_limpio = contenido.strip()
+            if contenido_limpio and len(contenido_limpio) > 20:  # Mínimo 20 caracteres
+                # Limpiar líneas vacías múltiples
+                contenido_limpio = re.sub(r'\n\s*\n\s*\n', '\n\n', contenido_limpio)
+                secciones_limpias[seccion] = contenido_limpio
         
-        # Patrón 6: Palabras clave comunes en licitaciones (expandido)
-        palabras_clave = [
-            "OBJETIVO", "ALCANCE", "REQUISITOS", "ESPECIFICACIONES", "PLAZOS", 
-            "PRESUPUESTO", "CRITERIOS", "EVALUACIÓN", "CONDICIONES", "GARANTÍAS",
-            "METODOLOGÍA", "EQUIPO", "EXPERIENCIA", "REFERENCIAS", "ENTREGABLES",
-            "CRONOGRAMA", "FACTORES", "RIESGOS", "CALIDAD", "SOPORTE",
-            "DESCRIPCIÓN", "CARACTERÍSTICAS", "FUNCIONALIDADES", "USUARIOS",
-            "PERFILES", "ROLES", "PERMISOS", "INTEGRACIÓN", "DESARROLLO",
-            "IMPLEMENTACIÓN", "CAPACITACIÓN", "DOCUMENTACIÓN", "PRUEBAS",
-            "DESPLIEGUE", "MANTENIMIENTO", "SERVICIOS", "PRODUCTOS",
-            "SOLUCIÓN", "SISTEMA", "PLATAFORMA", "APLICACIÓN", "SOFTWARE",
-            "HARDWARE", "INFRAESTRUCTURA", "TECNOLOGÍA", "ARQUITECTURA",
-            "BASE DE DATOS", "INTERFAZ", "API", "WEB", "MÓVIL", "CLOUD",
-            "SEGURIDAD", "BACKUP", "RESPALDO", "MONITOREO", "REPORTES",
-            "ANÁLISIS", "ESTUDIO", "DIAGNÓSTICO", "PLAN", "ESTRATEGIA",
-            "PROCESO", "PROCEDIMIENTO", "POLÍTICA", "ESTÁNDAR", "NORMATIVA"
-        ]
+        if detectadas and secciones_limpias and Config.CONSOLIDAR_SECCIONES:
+            secciones_limpias = self._consolidar(secciones_limpias)
         
-        if any(palabra in line_strip.upper() for palabra in palabras_clave):
-            es_titulo = True
+        # Si aún no hay secciones, crear una sección con todo el contenido
+        if not secciones_limpias:
+            content = self._contenido_original().strip()
+            if content:
+                secciones_limpias['contenido_completo'] = content
         
-        # Patrón 7: Líneas que parecen títulos por su formato (corta y con mayúsculas)
-        elif (len(line_strip) < 100 and 
-              len(line_strip.split()) <= 8 and 
-              line_strip[0].isupper() and 
-              not line_strip.endswith('.') and
-              not line_strip.endswith(',') and
-              not re.search(r'\d+%', line_strip)):  # No porcentajes
-            es_titulo = True
+        return secciones_limpias
+    
+    def _consolidar(self, secciones: Dict[str, str]) -> Dict[str, str]:
+        """
+        Une a la sección anterior cada sección corta (menos de
+        Config.SECCIONES_MIN_CARACTERES) cuyo título no tiene evidencia real (estilo
+        Heading del DOCX o numeración), conservando el título como una línea del
+        contenido. Si aún quedan más de Config.SECCIONES_MAX, se unen también las
+        sobrantes: primero las que no tienen evidencia y, en cada grupo, las más cortas.
+        """
+        titulos = list(secciones)
+        contenidos = list(secciones.values())
+        fuertes = [titulo in self._titulos_fuertes for titulo in titulos]
         
-        # Patrón 8: Líneas que contienen palabras específicas de licitaciones
-        palabras_licitacion = [
-            "LICITACIÓN", "CONCURSO", "CONVOCATORIA", "BASES", "TÉRMINOS",
-            "CONDICIONES", "REQUISITOS", "ESPECIFICACIONES", "PLIEGO",
-            "PROPUESTA", "OFERTA", "PRESENTACIÓN", "EVALUACIÓN", "SELECCIÓN"
-        ]
+        absorbidas = {i for i in range(1, len(titulos))
+                      if not fuertes[i] and len(contenidos[i]) < Config.SECCIONES_MIN_CARACTERES}
+        sobrantes = len(titulos) - len(absorbidas) - Config.SECCIONES_MAX
+        if Config.SECCIONES_MAX and sobrantes > 0:
+            candidatas = sorted((i for i in range(1, len(titulos)) if i not in absorbidas),
+                                key=lambda i: (fuertes[i], len(contenidos[i])))
+            absorbidas.update(candidatas[:sobrantes])
         
-        if any(palabra in line_strip.upper() for palabra in palabras_licitacion):
-            es_titulo = True
+        consolidadas = {}
+        titulo_actual = None
+        partes = []
+        for i, titulo in enumerate(titulos):
+            if i in absorbidas:
+                partes.append(f"{titulo}\n{contenidos[i]}")
+                continue
+            if partes:
+                consolidadas[titulo_actual] = '\n'.join(partes)
+            titulo_actual = titulo
+            partes = [contenidos[i]]
+        consolidadas[titulo_actual] = '\n'.join(partes)
         
-        if es_titulo:
-            if seccion_actual and buffer:
-                contenido_seccion = '\n'.join(buffer).strip()
-                if contenido_seccion and len(contenido_seccion) > 10:
-                    secciones[seccion_actual] = contenido_seccion
-                buffer = []
-            seccion_actual = line_strip.rstrip(':').strip()
-        else:
-            buffer.append(line_strip)
+        self.consolidacion = {
+            "secciones_antes": len(secciones),
+            "secciones_despues": len(consolidadas),
+            "bytes_antes": _tamano_json(secciones),
+            "bytes_despues": _tamano_json(consolidadas),
+        }
+        return consolidadas
+
+def _tamano_json(secciones: Dict[str, str]) -> int:
+    return len(json.dumps(secciones, ensure_ascii=False).encode('utf-8'))
+
+def _firma_consolidacion() -> str:
+    """Parte de la clave de caché que depende de la configuración de consolidación"""
+    if not Config.CONSOLIDAR_SECCIONES:
+        return ""
+    return f"-consolidado{Config.SECCIONES_MAX}-{Config.SECCIONES_MIN_CARACTERES}"
+
+def seccionar_texto(fragmentos: Iterable[str], max_secciones: Optional[int] = None,
+                    max_caracteres: Optional[int] = None,
+                    metadatos: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Divide en secciones un flujo de fragmentos de texto, línea a línea. Con
+    `max_secciones` o `max_caracteres` deja de consumir el flujo (y por lo tanto de
+    extraer páginas) en cuanto se alcanza el límite (contando las secciones antes de
+    la consolidación).
+    """
+    detector = DetectorSecciones()
+    caracteres = 0
+    truncado = None
     
-    # Agregar la última sección
-    if seccion_actual and buffer:
-        contenido_seccion = '\n'.join(buffer).strip()
-        if contenido_seccion and len(contenido_seccion) > 10:
-            secciones[seccion_actual] = contenido_seccion
-    
-    # Si no se detectaron secciones, intentar dividir por párrafos largos
-    if not secciones:
-        parrafos = [p.strip() for p in content.split('\n\n') if p.strip()]
-        if len(parrafos) > 1:
-            for i, parrafo in enumerate(parrafos[:10]):  # Máximo 10 secciones
-                if len(parrafo) > 50:  # Solo párrafos sustanciales
-                    secciones[f'Sección_{i+1}'] = parrafo
-        else:
-            # Si todo el contenido está en un solo bloque, dividirlo
-            if len(content.strip()) > 200:
-                secciones['contenido'] = content.strip()
-    
-    # Limpiar y mejorar secciones
-    secciones_limpias = {}
-    for seccion, contenido in secciones.items():
-        contenido_limpio = contenido.strip()
-        if contenido_limpio and len(contenido_limpio) > 20:  # Mínimo 20 caracteres
-            # Limpiar líneas vacías múltiples
-            contenido_limpio = re.sub(r'\n\s*\n\s*\n', '\n\n', contenido_limpio)
-            secciones_limpias[seccion] = contenido_limpio
-    
-    # Si aún no hay secciones, crear una sección con todo el contenido
-    if not secciones_limpias and content.strip():
-        secciones_limpias['contenido_completo'] = content.strip()
-    
-    return secciones_limpias
+    def _registrar_titulos(fragmentos):
+        # Los párrafos con estilo de título llegan como FragmentoTitulo antes que sus líneas
+        for fragmento in fragmentos:
+            if isinstance(fragmento, FragmentoTitulo):
+                detector.titulos_estilo.add(fragmento.strip())
+            yield fragmento
+    
+    try:
+        for line in iterar_lineas(_registrar_titulos(fragmentos)):
+            detector.procesar_linea(line)
+            caracteres += len(line) + 1
+            if max_secciones and len(detector.secciones) >= max_secciones:
+                truncado = "max_secciones"
+                break
+            if max_caracteres and caracteres >= max_caracteres:
+                truncado = "max_caracteres"
+                break
+    except BaseException:
+        detector.cerrar()
+        raise
+    
+    if truncado and hasattr(fragmentos, 'close'):
+        # Cerrar el generador libera los lectores y completa sus metadatos
+        fragmentos.close()
+    if metadatos is not None and (max_secciones or max_caracteres):
+        metadatos["truncado"] = truncado
+        metadatos["caracteres_procesados"] = caracteres
+    secciones = detector.finalizar()
+    if metadatos is not None and detector.consolidacion:
+        metadatos["consolidacion"] = detector.consolidacion
+    return secciones
+
+def parsear_documento(path: str, usar_cache: bool = True, motor_pdf: str = None,
+                      limites: Optional[Dict[str, Any]] = None,
+                      pool: Optional[PoolParseoAislado] = None) -> Dict[str, Any]:
+    """
+    Parsea un documento (DOCX o PDF) y devuelve sus secciones junto con los metadatos
+    del parseo: `{"secciones": {...}, "metadatos": {...}}`. Para PDFs los metadatos
+    incluyen el motor y el tiempo de extracción de cada página.
+    `limites` (ver normalizar_limites) restringe las páginas a extraer o detiene el
+    parseo tras N secciones / M caracteres.
+    Los resultados se reutilizan desde la caché mientras no cambie el contenido del
+    archivo, la versión del parser, el motor usado ni los límites.
+    `pool` fuerza el parseo en ese pool de procesos aislados.
+    """
+    # Validar el tipo antes de leer el archivo para hashearlo
+    tipo_archivo = detectar_tipo_archivo(path)
+    motor_pdf = validar_motor_pdf(motor_pdf)
+    
+    if not (usar_cache and Config.PARSE_CACHE_ACTIVA):
+        resultado = _ejecutar_parseo(path, motor_pdf, limites, pool)
+        resultado["metadatos"]["cache"] = False
+        return resultado
+    
+    version = PARSER_VERSION if tipo_archivo != 'pdf' else f"{PARSER_VERSION}-{motor_pdf}"
+    clave = cache_parseo.calcular_clave(path, version + _firma_consolidacion() + _firma_limites(limites))
+    resultado = cache_parseo.obtener(clave)
+    if resultado is None:
+        resultado = _ejecutar_parseo(path, motor_pdf, limites, pool)
+        cache_parseo.guardar(clave, resultado)
+        resultado["metadatos"]["cache"] = False
+    else:
+        resultado["metadatos"]["cache"] = True
+    return resultado
+
+def parse_licitacion_dinamica(path: str, usar_cache: bool = True, motor_pdf: str = None,
+                              limites: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parsea un documento de licitación (DOCX o PDF) y extrae su contenido estructurado.
+    `motor_pdf` selecciona el motor de extracción de PDFs (por defecto Config.PDF_MOTOR)
+    y `limites` permite parsear solo una parte del documento.
+    """
+    return parsear_documento(path, usar_cache, motor_pdf, limites)["secciones"]
+
+def _ejecutar_parseo(path: str, motor_pdf: str, limites: Optional[Dict[str, Any]],
+                     pool: Optional[PoolParseoAislado] = None) -> Dict[str, Any]:
+    """
+    Parsea en un proceso aislado (`pool` o Config.PARSE_AISLADO) para que un documento
+    que cuelga o agota la memoria no afecte al servidor; si no, en el proceso actual
+    """
+    if pool is not None:
+        return pool.parsear(path, motor_pdf, limites)
+    if Config.PARSE_AISLADO:
+        return pool_parseo.parsear(path, motor_pdf, limites)
+    return _parsear_documento(path, motor_pdf, limites)
+
+def _parsear_documento(path: str, motor_pdf: str = None,
+                       limites: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Extrae el texto del documento página a página y lo divide en secciones sin
+    construir nunca el texto completo en memoria
+    """
+    # Detectar tipo de archivo
+    tipo_archivo = detectar_tipo_archivo(path)
+    metadatos = {"tipo": tipo_archivo}
+    limites = limites or {}
+    if limites:
+        metadatos["limites"] = dict(limites)
+    inicio = time.perf_counter()
+    
+    def _seccionar(fragmentos):
+        return seccionar_texto(fragmentos, limites.get("max_secciones"),
+                               limites.get("max_caracteres"), metadatos)
+    
+    # Extraer y seccionar según el tipo de archivo
+    if tipo_archivo == 'docx':
+        secciones = procesar_texto_docx(path, _seccionar, metadatos)
+    elif tipo_archivo == 'pdf':
+        secciones = _seccionar(iterar_texto_pdf(path, motor_pdf, metadatos=metadatos,
+                                                paginas=limites.get("paginas"),
+                                                max_paginas=limites.get("max_paginas")))
+    else:
+        raise ValueError(f"Tipo de archivo no soportado: {tipo_archivo}")
+    
+    metadatos["tiempo_s"] = round(time.perf_counter() - inicio, 4)
+    return {"secciones": secciones, "metadatos": metadatos}
+
+def calcular_workers_lote(num_archivos: int) -> int:
+    """
+    Decide cuántos procesos usar para parsear un lote de archivos (1 significa en serie)
+    """
+    cpus = os.cpu_count() or 1
+    max_workers = Config.PARSE_LOTE_MAX_WORKERS or cpus
+    return max(1, min(cpus, max_workers, num_archivos))
+
+def _parsear_para_lote(path: str, usar_cache: bool, motor_pdf: Optional[str],
+                       pool: Optional[PoolParseoAislado] = None) -> Dict[str, Any]:
+    """
+    Parsea un archivo del lote capturando cualquier error (incluido agotar el tiempo o
+    la memoria del worker), para que un documento defectuoso no interrumpa el resto
+    """
+    inicio = time.perf_counter()
+    try:
+        resultado = parsear_documento(path, usar_cache, motor_pdf, pool=pool)
+        secciones, metadatos, error = resultado["secciones"], resultado["metadatos"], None
+    except Exception as e:
+        secciones, metadatos, error = None, None, f"{type(e).__name__}: {e}"
+    return {
+        "path": path,
+        "secciones": secciones,
+        "metadatos": metadatos,
+        "error": error,
+        "tiempo_s": round(time.perf_counter() - inicio, 4),
+    }
+
+def parse_many(paths: Iterable[str], usar_cache: bool = True, motor_pdf: str = None,
+               max_workers: int = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parsea varios documentos repartiéndolos entre un pool de procesos aislados y genera
+    un resultado por archivo a medida que terminan (no en el orden de entrada):
+    `{"path", "secciones", "metadatos", "error", "tiempo_s"}`. Cada archivo tiene el
+    tiempo máximo (Config.PARSE_TIMEOUT_S) y el límite de memoria
+    (Config.PARSE_MEMORIA_MAX_MB) del parseo aislado; los que fallan o los exceden se
+    reportan con `secciones` en None y el mensaje en `error`.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    motor_pdf = validar_motor_pdf(motor_pdf)
+    workers = max_workers or calcular_workers_lote(len(paths))
+    
+    if workers <= 1 or len(paths) == 1:
+        for path in paths:
+            yield _parsear_para_lote(path, usar_cache, motor_pdf)
+        return
+    
+    # Cada worker ya parsea un archivo distinto: no abrir pools anidados por PDF. Los
+    # hilos solo esperan a su worker (y consultan la caché), el trabajo va en los procesos
+    pool = PoolParseoAislado(workers, Config.PARSE_TIMEOUT_S, Config.PARSE_MEMORIA_MAX_MB,
+                             ajustes={"PDF_EXTRACCION_PARALELA": False})
+    hilos = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parseo-lote")
+    try:
+        futuros = [hilos.submit(_parsear_para_lote, path, usar_cache, motor_pdf, pool) for path in paths]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+    finally:
+        # Si el consumidor deja de iterar, no seguir parseando los archivos pendientes
+        hilos.shutdown(wait=False, cancel_futures=True)
+        pool.cerrar(interrumpir=True)
@@ -0,0 +1,252 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from .corpus import SnapshotCorpus, calcular_hash_archivo, EXTENSIONES_CORPUS
+from .parser import parse_many
+
+TIPO_GENERADA = "generada"
+
+# Estado del parseo de cada documento: pendiente hasta que se parsea (al cargarlo, desde
+# el corpus o en el primer listado que lo necesite); las ofertas generadas no se parsean
+ESTADO_PENDIENTE = "pendiente"
+ESTADO_PARSEADO = "parseado"
+ESTADO_ERROR = "error"
+ESTADO_SIN_PARSEO = "sin_parseo"
+
+# Versión del esquema: si cambia, el registro se reconstruye desde los directorios
+_VERSION_ESQUEMA = 1
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    archivo TEXT NOT NULL,
+    tamano INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    fecha REAL NOT NULL,
+    sha256 TEXT,
+    estado TEXT NOT NULL,
+    error TEXT,
+    secciones INTEGER,
+    datos TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS documentos_tipo_archivo ON documentos (tipo, archivo);
+CREATE INDEX IF NOT EXISTS documentos_tipo_estado ON documentos (tipo, estado);
+PRAGMA user_version = {_VERSION_ESQUEMA};
+"""
+
+class RegistroDocumentos:
+    """
+    Registro persistente (SQLite en modo WAL) de los documentos cargados: metadatos del
+    archivo, hash del contenido, estado del parseo, número de secciones y el resultado
+    del parseo serializado en JSON. Lo mantienen los endpoints de carga y eliminación,
+    de modo que los listados y los conteos son consultas indexadas en lugar de recorrer
+    los directorios y volver a parsear cada archivo. `sincronizar` lo concilia con los
+    directorios (archivos copiados a mano) y lo reconstruye si la base no existe.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._lock_escritura = threading.Lock()
+        self._lock_preparacion = threading.Lock()
+        self._preparado = False
+        self.reconstruido = False
+
+    def _conexion(self) -> sqlite3.Connection:
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            if not self._preparado:
+                self._preparar()
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            conexion.execute("PRAGMA journal_mode = WAL")
+            conexion.execute("PRAGMA synchronous = NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    def _preparar(self):
+        """Crea el esquema (o lo recrea si es de otra versión); si no existía hay que reconstruirlo"""
+        with self._lock_preparacion:
+            if self._preparado:
+                return
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            try:
+                version = conexion.execute("PRAGMA user_version").fetchone()[0]
+                if version != _VERSION_ESQUEMA:
+                    conexion.executescript("DROP TABLE IF EXISTS documentos;")
+                    self.reconstruido = True
+                conexion.executescript(_ESQUEMA)
+            finally:
+                conexion.close()
+            self._preparado = True
+
+    @staticmethod
+    def _fila_parseo(tipo: str, datos: Optional[Dict[str, Any]],
+                     error: Optional[str]) -> Tuple[str, Optional[str], Optional[int], Optional[str]]:
+        """(estado, error, secciones, datos serializados) de un resultado de parseo"""
+        if tipo == TIPO_GENERADA:
+            return ESTADO_SIN_PARSEO, None, None, None
+        if error is not None:
+            return ESTADO_ERROR, error, None, None
+        if datos is None:
+            return ESTADO_PENDIENTE, None, None, None
+        return ESTADO_PARSEADO, None, len(datos), json.dumps(datos, ensure_ascii=False)
+
+    def registrar(self, tipo: str, path: str, datos: Optional[Dict[str, Any]] = None,
+                  error: Optional[str] = None, sha256: Optional[str] = None):
+        """
+        Registra (o reemplaza) un archivo recién cargado con su resultado de parseo;
+        sin `datos` ni `error` queda pendiente de parsear
+        """
+        estado = os.stat(path)
+        if sha256 is None:
+            sha256 = calcular_hash_archivo(path)
+        fila = (tipo, os.path.basename(path), estado.st_size, estado.st_mtime_ns, estado.st_ctime, sha256)
+        with self._lock_escritura:
+            conexion = self._conexion()
+            with conexion:
+                conexion.execute(
+                    "INSERT OR REPLACE INTO documentos (tipo, archivo, tamano, mtime_ns, fecha, sha256, estado, "
+                    "error, secciones, datos) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    fila + self._fila_parseo(tipo, datos, error))
+
+    def eliminar(self, tipo: str, archivo: str) -> bool:
+        """Quita un archivo del registro; devuelve False si no estaba"""
+        with self._lock_escritura:
+            conexion = self._conexion()
+            with conexion:
+                return conexion.execute("DELETE FROM documentos WHERE tipo = ? AND archivo = ?",
+                                        (tipo, archivo)).rowcount > 0
+
+    def sincronizar(self, directorios: Dict[str, str], snapshot: Optional[SnapshotCorpus] = None) -> Dict[str, int]:
+        """
+        Concilia el registro con `directorios` (tipo -> directorio) comparando tamaño y
+        mtime: agrega los archivos nuevos, quita los que ya no están y deja pendientes
+        los modificados. Los documentos que el `snapshot` del corpus ya parseó (mismo
+        tamaño y mtime) toman de él su resultado en vez de quedar pendientes. Solo
+        recorre los directorios; no parsea ni hashea documentos salvo los generados.
+        """
+        en_disco = {}
+        for tipo, directorio in directorios.items():
+            for filename in os.listdir(directorio):
+                if not filename.endswith(EXTENSIONES_CORPUS):
+                    continue
+                try:
+                    estado = os.stat(os.path.join(directorio, filename))
+                except OSError:
+                    continue  # eliminado durante el escaneo
+                en_disco[(tipo, filename)] = (estado.st_size, estado.st_mtime_ns, estado.st_ctime)
+
+        cambios = {"nuevos": 0, "modificados": 0, "eliminados": 0, "completados": 0}
+        with self._lock_escritura:
+            conexion = self._conexion()
+            marcadores = ", ".join("?" * len(directorios))
+            registrados = {(tipo, archivo): (tamano, mtime_ns, estado) for tipo, archivo, tamano, mtime_ns, estado in
+                           conexion.execute(f"SELECT tipo, archivo, tamano, mtime_ns, estado FROM documentos "
+                                            f"WHERE tipo IN ({marcadores})", list(directorios))}
+            eliminados = [clave for clave in registrados if clave not in en_disco]
+            filas = []
+            for (tipo, filename), (tamano, mtime_ns, fecha) in en_disco.items():
+                registrado = registrados.get((tipo, filename))
+                sin_cambios = registrado is not None and registrado[:2] == (tamano, mtime_ns)
+                if sin_cambios and registrado[2] != ESTADO_PENDIENTE:
+                    continue
+                path = os.path.join(directorios[tipo], filename)
+                entrada = snapshot.entrada(path) if snapshot is not None else None
+                sha256, datos, error = None, None, None
+                if entrada is not None and entrada.tipo == tipo and \
+                        (entrada.tamano, entrada.mtime_ns) == (tamano, mtime_ns):
+                    sha256 = entrada.sha256
+                    if entrada.documento is None:
+                        error = "No se pudo parsear el documento"
+                    else:
+                        datos = dict(entrada.documento.items())
+                elif tipo == TIPO_GENERADA:
+                    try:
+                        sha256 = calcular_hash_archivo(path)
+                    except OSError:
+                        continue
+                elif sin_cambios:
+                    continue  # sigue pendiente
+                if sin_cambios:
+                    cambios["completados"] += 1
+                else:
+                    cambios["modificados" if registrado is not None else "nuevos"] += 1
+                filas.append((tipo, filename, tamano, mtime_ns, fecha, sha256)
+                             + self._fila_parseo(tipo, datos, error))
+            if not (eliminados or filas):
+                return cambios
+            with conexion:
+                conexion.executemany("DELETE FROM documentos WHERE tipo = ? AND archivo = ?", eliminados)
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO documentos (tipo, archivo, tamano, mtime_ns, fecha, sha256, estado, "
+                    "error, secciones, datos) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas)
+            cambios["eliminados"] = len(eliminados)
+        return cambios
+
+    def pendientes(self, tipo: str) -> List[str]:
+        """Archivos del tipo cuyo parseo está pendiente"""
+        return [archivo for archivo, in self._conexion().execute(
+            "SELECT archivo FROM documentos WHERE tipo = ? AND estado = ?", (tipo, ESTADO_PENDIENTE))]
+
+    def parsear_pendientes(self, tipo: str, directorio: str) -> int:
+        """Parsea los documentos pendientes del tipo (en paralelo, ver parse_many) y guarda el resultado"""
+        archivos = self.pendientes(tipo)
+        if not archivos:
+            return 0
+        paths = {os.path.join(directorio, archivo): archivo for archivo in archivos}
+        parseados = 0
+        for resultado in parse_many(paths):
+            path = resultado["path"]
+            try:
+                sha256 = calcular_hash_archivo(path)
+            except OSError:
+                continue  # eliminado mientras tanto; lo quitará la próxima sincronización
+            estado, error, secciones, datos = self._fila_parseo(tipo, resultado["secciones"], resultado["error"])
+            with self._lock_escritura:
+                conexion = self._conexion()
+                with conexion:
+                    # Si mientras tanto se volvió a cargar, el registro nuevo no se pisa
+                    conexion.execute(
+                        "UPDATE documentos SET sha256 = ?, estado = ?, error = ?, secciones = ?, datos = ? "
+                        "WHERE tipo = ? AND archivo = ? AND estado = ?",
+                        (sha256, estado, error, secciones, datos, tipo, paths[path], ESTADO_PENDIENTE))
+            parseados += 1
+        return parseados
+
+    def listado_json(self, tipo: str) -> Tuple[str, int]:
+        """
+        Documentos del tipo ya serializados como lista JSON (`{"archivo", "datos"}` o
+        `{"archivo", "error"}`) y su número. Los datos se copian tal como están
+        guardados, sin deserializarlos.
+        """
+        elementos = []
+        for archivo, estado, error, datos in self._conexion().execute(
+                "SELECT archivo, estado, error, datos FROM documentos WHERE tipo = ? ORDER BY archivo", (tipo,)):
+            archivo = json.dumps(archivo, ensure_ascii=False)
+            if estado == ESTADO_PARSEADO:
+                elementos.append(f'{{"archivo": {archivo}, "datos": {datos}}}')
+            else:
+                error = error if estado == ESTADO_ERROR else "Documento pendiente de procesar"
+                elementos.append(f'{{"archivo": {archivo}, "error": {json.dumps(error, ensure_ascii=False)}}}')
+        return "[" + ", ".join(elementos) + "]", len(elementos)
+
+    def listar(self, tipo: str) -> List[Dict[str, Any]]:
+        """Metadatos (sin el resultado del parseo) de los documentos del tipo"""
+        return [{"archivo": archivo, "tamano": tamano, "fecha": fecha, "sha256": sha256, "estado": estado,
+                 "secciones": secciones}
+                for archivo, tamano, fecha, sha256, estado, secciones in self._conexion().execute(
+                    "SELECT archivo, tamano, fecha, sha256, estado, secciones FROM documentos "
+                    "WHERE tipo = ? ORDER BY archivo", (tipo,))]
+
+    def conteos(self) -> Dict[str, Dict[str, int]]:
+        """Número de documentos de cada tipo por estado del parseo"""
+        conteos: Dict[str, Dict[str, int]] = {}
+        for tipo, estado, cantidad in self._conexion().execute(
+                "SELECT tipo, estado, count(*) FROM documentos GROUP BY tipo, estado"):
+            conteos.setdefault(tipo, {})[estado] = cantidad
+        return conteos
@@ -0,0 +1,246 @@
+import os
+import atexit
+import threading
+import multiprocessing
+from typing import Dict, Any, Optional, List
+from ..config import Config
+
+try:
+    import resource
+except ImportError:  # Windows: sin límites de memoria por proceso
+    resource = None
+
+class ErrorWorkerParseo(RuntimeError):
+    """El proceso aislado de parseo murió, excedió su memoria o su tiempo"""
+
+class TiempoParseoAgotado(ErrorWorkerParseo):
+    """El parseo superó el tiempo máximo permitido"""
+
+def contexto_procesos():
+    """
+    Contexto de multiprocessing para los procesos de parseo. Se crean desde un servidor
+    con varios hilos: con fork heredarían locks tomados en ese momento (p. ej. el de la
+    caché de páginas), así que se usa forkserver (o spawn donde no existe).
+    """
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+def configuracion_proceso(ajustes: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Config y directorios de caché del proceso actual (más `ajustes`), para replicarlos
+    en los procesos hijos: sin fork no heredan lo que se cambió en tiempo de ejecución
+    """
+    from .cache import cache_parseo, cache_paginas
+
+    valores = {nombre: valor for nombre, valor in vars(Config).items() if nombre.isupper()}
+    valores.update(ajustes or {})
+    return {"config": valores, "cache_parseo": cache_parseo.directorio, "cache_paginas": cache_paginas.directorio}
+
+def aplicar_configuracion(configuracion: Dict[str, Any]):
+    """Aplica en el proceso actual una configuración obtenida con configuracion_proceso"""
+    from .cache import cache_parseo, cache_paginas
+
+    for nombre, valor in configuracion["config"].items():
+        setattr(Config, nombre, valor)
+    cache_parseo.directorio = configuracion["cache_parseo"]
+    cache_paginas.directorio = configuracion["cache_paginas"]
+
+def _memoria_virtual_actual() -> int:
+    """Tamaño actual del espacio de direcciones del proceso en bytes (0 si no se conoce)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _limitar_memoria(memoria_mb: int):
+    """Limita el espacio de direcciones del proceso a su tamaño actual + `memoria_mb`"""
+    if resource is None or memoria_mb <= 0:
+        return
+    limite = _memoria_virtual_actual() + memoria_mb * 1024 * 1024
+    _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+    if maximo != resource.RLIM_INFINITY:
+        limite = min(limite, maximo)
+    resource.setrlimit(resource.RLIMIT_AS, (limite, maximo))
+
+def _bucle_worker(conexion, memoria_mb: int, configuracion: Dict[str, Any]):
+    """
+    Bucle del proceso de parseo: recibe (path, motor_pdf, limites), parsea y devuelve
+    ("ok", resultado) o ("error", excepción). Termina tras un MemoryError, ya que el
+    estado del intérprete puede haber quedado inconsistente.
+    """
+    from .parser import _parsear_documento
+
+    aplicar_configuracion(configuracion)
+    _limitar_memoria(memoria_mb)
+    while True:
+        try:
+            tarea = conexion.recv()
+        except (EOFError, OSError):
+            return
+        if tarea is None:
+            return
+        path, motor_pdf, limites = tarea
+        try:
+            respuesta = ("ok", _parsear_documento(path, motor_pdf, limites))
+        except MemoryError:
+            try:
+                conexion.send(("error", ErrorWorkerParseo(
+                    f"El parseo excedió el límite de memoria ({memoria_mb} MB)")))
+            except Exception:
+                pass
+            return
+        except Exception as e:
+            respuesta = ("error", e)
+        try:
+            conexion.send(respuesta)
+        except Exception as e:
+            # Excepción o resultado que no se puede serializar
+            conexion.send(("error", ErrorWorkerParseo(f"{type(e).__name__}: {e}")))
+
+class _Worker:
+    def __init__(self, contexto, memoria_mb: int, configuracion: Dict[str, Any]):
+        self.conexion, extremo_hijo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_bucle_worker, args=(extremo_hijo, memoria_mb, configuracion),
+                                        name="parseo-aislado")
+        self.proceso.start()
+        extremo_hijo.close()
+
+    def activo(self) -> bool:
+        return self.proceso.is_alive()
+
+    def terminar(self):
+        if self.proceso.is_alive():
+            self.proceso.kill()
+        self.proceso.join(timeout=5)
+        self.conexion.close()
+
+class PoolParseoAislado:
+    """
+    Pool de procesos reutilizables que parsean documentos fuera del proceso del
+    servidor, con un tiempo máximo por documento y un límite de espacio de
+    direcciones (RLIMIT_AS) por proceso. Un worker que muere, agota la memoria o
+    excede el tiempo se descarta y se reemplaza en la siguiente petición, y quien
+    llamó recibe un ErrorWorkerParseo en lugar de bloquear el servidor.
+    Cada worker parte de la configuración del proceso al crearlo, con `ajustes` encima.
+    """
+
+    def __init__(self, max_workers: int, timeout_s: float, memoria_mb: int,
+                 ajustes: Optional[Dict[str, Any]] = None):
+        self.max_workers = max(1, max_workers)
+        self.timeout_s = timeout_s
+        self.memoria_mb = memoria_mb
+        self.ajustes = ajustes
+        self._contexto = contexto_procesos()
+        self._libres: List[_Worker] = []
+        self._ocupados = set()
+        self._total = 0
+        self._condicion = threading.Condition()
+        self._registrado_atexit = False
+        self._cerrado = False
+
+    def _tomar(self) -> _Worker:
+        with self._condicion:
+            while True:
+                if self._cerrado:
+                    raise ErrorWorkerParseo("El pool de parseo está cerrado")
+                while self._libres:
+                    worker = self._libres.pop()
+                    if worker.activo():
+                        self._ocupados.add(worker)
+                        return worker
+                    worker.terminar()
+                    self._total -= 1
+                if self._total < self.max_workers:
+                    self._total += 1
+                    break
+                self._condicion.wait()
+        try:
+            worker = _Worker(self._contexto, self.memoria_mb, configuracion_proceso(self.ajustes))
+        except Exception:
+            self._descartar(None)
+            raise
+        with self._condicion:
+            self._ocupados.add(worker)
+            # Tras arrancar el primer worker, para que `cerrar` corra antes que el atexit de
+            # multiprocessing (que espera a los procesos hijos no daemon)
+            if not self._registrado_atexit:
+                atexit.register(self.cerrar)
+                self._registrado_atexit = True
+        return worker
+
+    def _devolver(self, worker: _Worker):
+        with self._condicion:
+            self._ocupados.discard(worker)
+            if not self._cerrado:
+                self._libres.append(worker)
+                self._condicion.notify()
+                return
+        self._descartar(worker)
+
+    def _descartar(self, worker: Optional[_Worker]):
+        if worker is not None:
+            worker.terminar()
+        with self._condicion:
+            self._ocupados.discard(worker)
+            self._total -= 1
+            self._condicion.notify()
+
+    def parsear(self, path: str, motor_pdf: Optional[str] = None,
+                limites: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Parsea el documento en un worker aislado y devuelve `{"secciones", "metadatos"}`"""
+        nombre = os.path.basename(path)
+        worker = self._tomar()
+        try:
+            worker.conexion.send((path, motor_pdf, limites))
+            if not worker.conexion.poll(self.timeout_s):
+                raise TiempoParseoAgotado(
+                    f"El parseo de {nombre} superó el tiempo máximo de {self.timeout_s:g}s")
+            estado, carga = worker.conexion.recv()
+        except ErrorWorkerParseo:
+            self._descartar(worker)
+            raise
+        except (EOFError, OSError) as e:
+            worker.proceso.join(timeout=1)
+            codigo = worker.proceso.exitcode
+            self._descartar(worker)
+            raise ErrorWorkerParseo(
+                f"El proceso de parseo de {nombre} terminó inesperadamente (código {codigo}); "
+                f"el documento puede estar dañado o exceder el límite de memoria "
+                f"({self.memoria_mb} MB)") from e
+        except BaseException:
+            # Interrumpido con la tarea en curso: el worker no se puede reutilizar
+            self._descartar(worker)
+            raise
+
+        if estado == "error" and isinstance(carga, ErrorWorkerParseo):
+            self._descartar(worker)
+            raise carga
+        self._devolver(worker)
+        if estado == "error":
+            raise carga
+        return carga
+
+    def cerrar(self, interrumpir: bool = False):
+        """
+        Cierra el pool y termina los workers libres. Los ocupados se descartan al terminar
+        su tarea o, con `interrumpir`, se matan ya y su llamada recibe un ErrorWorkerParseo.
+        """
+        with self._condicion:
+            self._cerrado = True
+            libres, self._libres = self._libres, []
+            self._total -= len(libres)
+            ocupados = list(self._ocupados) if interrumpir else []
+            self._condicion.notify_all()
+            if self._registrado_atexit:
+                atexit.unregister(self.cerrar)
+                self._registrado_atexit = False
+        for worker in libres:
+            worker.terminar()
+        for worker in ocupados:
+            # Solo se mata el proceso: la llamada en curso ve la conexión cerrada y lo descarta
+            if worker.activo():
+                worker.proceso.kill()
+
+pool_parseo = PoolParseoAislado(Config.PARSE_AISLADO_WORKERS, Config.PARSE_TIMEOUT_S,
+                                Config.PARSE_MEMORIA_MAX_MB)
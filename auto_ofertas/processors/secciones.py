@@ -0,0 +1,161 @@
+import difflib
+import itertools
+import threading
+from functools import lru_cache
+from typing import Dict, Callable, Iterable, List, Optional, Tuple
+
+from .busqueda import STOPWORDS, palabras, raiz
+
+# Secciones canónicas de ofertas y licitaciones y las formas habituales de titularlas
+# (en minúsculas y sin tildes). El orden desempata títulos que calzan con dos secciones.
+SECCIONES_CANONICAS = {
+    "resumen_ejecutivo": ("resumen ejecutivo", "resumen", "sintesis de la propuesta"),
+    "introduccion": ("introduccion", "presentacion de la propuesta", "antecedentes generales"),
+    "objetivos": ("objetivos", "objetivo general", "objetivos especificos", "proposito"),
+    "alcance": ("alcance", "alcance del servicio", "alcance del proyecto", "entregables"),
+    "solucion_propuesta": ("solucion propuesta", "propuesta tecnica", "solucion", "arquitectura de la solucion"),
+    "metodologia": ("metodologia", "metodologia de trabajo", "enfoque metodologico", "plan de trabajo"),
+    "plan_implementacion": ("plan de implementacion", "cronograma", "carta gantt", "roadmap", "plazos", "hitos"),
+    "organizacion": ("organizacion del proyecto", "estructura organizacional", "gobierno del proyecto",
+                     "roles y responsabilidades"),
+    "equipo": ("equipo de trabajo", "equipo", "curriculum", "cv", "perfiles profesionales"),
+    "factores_exito": ("factores clave para el exito", "factores criticos de exito", "supuestos"),
+    "empresa": ("presentacion de la empresa", "antecedentes de la empresa", "experiencia", "referencias",
+                "quienes somos"),
+    "especificaciones_tecnicas": ("especificaciones tecnicas", "requisitos tecnicos", "requerimientos tecnicos",
+                                  "requerimientos", "requisitos", "tecnologias"),
+    "calidad": ("aseguramiento de calidad", "calidad", "pruebas"),
+    "riesgos": ("gestion de riesgos", "riesgos", "plan de mitigacion"),
+    "capacitacion": ("capacitacion", "transferencia tecnologica", "transferencia de conocimiento"),
+    "garantias_soporte": ("garantias", "soporte", "mesa de ayuda", "mantencion", "niveles de servicio"),
+    "presupuesto": ("presupuesto", "oferta economica", "inversion", "condiciones de pago", "costos", "precio"),
+    "criterios_evaluacion": ("criterios de evaluacion", "evaluacion de ofertas", "pauta de evaluacion"),
+    "sostenibilidad": ("sostenibilidad", "medio ambiente"),
+    "diversidad_inclusion": ("diversidad e inclusion", "diversidad", "inclusion"),
+}
+
+# Similitud mínima (difflib) para aceptar una palabra con errores de tipeo
+_SIMILITUD_PALABRA = 0.85
+_ROMANOS = frozenset("i ii iii iv v vi vii viii ix x xi xii xiii xiv xv".split())
+
+def _significativas(titulo: str) -> Tuple[str, ...]:
+    """Palabras normalizadas del título sin numeración ("3.", "IV.", "1.2") ni stopwords"""
+    lista = palabras(titulo)
+    while lista and (lista[0].isdigit() or lista[0] in _ROMANOS):
+        lista.pop(0)
+    return tuple(palabra for palabra in lista if palabra not in STOPWORDS and not palabra.isdigit())
+
+_ALIAS: Dict[Tuple[str, ...], str] = {}
+for _canonica, _formas in SECCIONES_CANONICAS.items():
+    for _forma in _formas:
+        _ALIAS.setdefault(_significativas(_forma), _canonica)
+# Las formas también se comparan por raíz ("objetivo" calza con "objetivos")
+_ALIAS_RAICES = {tuple(raiz(palabra) for palabra in alias): canonica for alias, canonica in _ALIAS.items()}
+_VOCABULARIO = sorted({palabra for alias in _ALIAS for palabra in alias})
+_RAICES = frozenset(raiz(palabra) for palabra in _VOCABULARIO)
+
+@lru_cache(maxsize=4096)
+def _raiz_catalogo(palabra: str) -> Optional[str]:
+    """Raíz del catálogo que corresponde a `palabra` (directamente o corrigiendo un error de tipeo)"""
+    raiz_palabra = raiz(palabra)
+    if raiz_palabra in _RAICES:
+        return raiz_palabra
+    if len(palabra) < 5:
+        return None
+    parecidas = difflib.get_close_matches(palabra, _VOCABULARIO, n=1, cutoff=_SIMILITUD_PALABRA)
+    return raiz(parecidas[0]) if parecidas else None
+
+@lru_cache(maxsize=20000)
+def seccion_canonica(titulo: str) -> Optional[str]:
+    """
+    Sección canónica de un título (p. ej. "METODOLOGÍA", "Metodologia de Trabajo" y
+    "3. Metodología" -> "metodologia") o None si no corresponde a ninguna. Pliega
+    tildes y mayúsculas, ignora la numeración y las stopwords y acepta plurales y
+    errores de tipeo; si el título contiene varias formas gana la de más palabras y,
+    a igualdad, la que aparece antes en el título.
+    """
+    significativas = _significativas(titulo)
+    if not significativas:
+        return None
+    canonica = _ALIAS.get(significativas)
+    if canonica is not None:
+        return canonica
+    raices = [_raiz_catalogo(palabra) for palabra in significativas]
+    mejor, mejor_orden = None, None
+    for alias, canonica in _ALIAS_RAICES.items():
+        if not all(raiz_alias in raices for raiz_alias in alias):
+            continue
+        orden = (-len(alias), raices.index(alias[0]))
+        if mejor_orden is None or orden < mejor_orden:
+            mejor, mejor_orden = canonica, orden
+    return mejor
+
+class IndiceSecciones:
+    """
+    Índice sección canónica -> {documento: títulos originales}. Los títulos se
+    normalizan una vez al indexar cada documento, de modo que reunir los ejemplos
+    históricos de una sección es una búsqueda en un diccionario en lugar de recorrer
+    los títulos de todo el corpus. Solo guarda títulos: el contenido se lee del
+    documento al consultar.
+    """
+
+    def __init__(self):
+        self._secciones: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._documentos: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    def agregar(self, clave: str, titulos: Iterable[str]):
+        """Agrega (o reemplaza) los títulos del documento `clave`"""
+        por_canonica: Dict[str, List[str]] = {}
+        for titulo in titulos:
+            canonica = seccion_canonica(titulo)
+            if canonica is not None:
+                por_canonica.setdefault(canonica, []).append(titulo)
+        with self._lock:
+            self._quitar(clave)
+            self._documentos[clave] = tuple(por_canonica)
+            for canonica, titulos_canonica in por_canonica.items():
+                self._secciones.setdefault(canonica, {})[clave] = tuple(titulos_canonica)
+
+    def quitar(self, clave: str) -> bool:
+        with self._lock:
+            return self._quitar(clave)
+
+    def _quitar(self, clave: str) -> bool:
+        canonicas = self._documentos.pop(clave, None)
+        if canonicas is None:
+            return False
+        for canonica in canonicas:
+            documentos = self._secciones[canonica]
+            del documentos[clave]
+            if not documentos:
+                del self._secciones[canonica]
+        return True
+
+    def titulos(self, canonica: str, k: int, admitir: Optional[Callable[[str], bool]] = None,
+                preferir: Iterable[str] = ()) -> List[Tuple[str, str]]:
+        """
+        Hasta `k` pares (documento, título original) de la sección canónica, primero los
+        de los documentos en `preferir` (en ese orden) y luego en orden de indexación
+        """
+        resultado: List[Tuple[str, str]] = []
+        vistos = set()
+        with self._lock:
+            documentos = self._secciones.get(canonica, {})
+            for clave in itertools.chain(preferir, documentos):
+                if len(resultado) >= k:
+                    break
+                if clave in vistos or clave not in documentos:
+                    continue
+                vistos.add(clave)
+                if admitir is None or admitir(clave):
+                    resultado.append((clave, documentos[clave][0]))
+        return resultado
+
+    def conteos(self) -> Dict[str, int]:
+        """Número de documentos indexados con cada sección canónica"""
+        with self._lock:
+            return {canonica: len(documentos) for canonica, documentos in self._secciones.items()}
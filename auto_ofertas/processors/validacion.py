@@ -0,0 +1,146 @@
+import os
+import re
+import time
+import zipfile
+from typing import Dict, Any
+import PyPDF2
+from ..config import Config
+
+# Firmas de los formatos aceptados y de los documentos Office cifrados / legacy (OLE)
+_FIRMA_PDF = b"%PDF-"
+_FIRMA_ZIP = b"PK\x03\x04"
+_FIRMA_OLE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# El encabezado %PDF- puede aparecer dentro del primer KB; %%EOF cerca del final
+_BYTES_ENCABEZADO = 1024
+_BYTES_COLA = 2048
+
+# Operadores que muestran texto (Tj, TJ, ', ") aplicados a una cadena o a un arreglo
+_OPERADOR_TEXTO = re.compile(rb"[)\]>]\s*(?:Tj|TJ|'|\")")
+
+class ArchivoInvalido(ValueError):
+    """El archivo subido no puede procesarse; el mensaje explica el motivo"""
+
+def _leer_extremos(path: str):
+    with open(path, 'rb') as f:
+        inicio = f.read(_BYTES_ENCABEZADO)
+        f.seek(max(0, os.path.getsize(path) - _BYTES_COLA))
+        fin = f.read()
+    return inicio, fin
+
+def _detectar_formato(inicio: bytes) -> str:
+    if inicio.startswith(_FIRMA_ZIP):
+        return 'docx'
+    if _FIRMA_PDF in inicio:
+        return 'pdf'
+    if inicio.startswith(_FIRMA_OLE):
+        return 'ole'
+    return 'desconocido'
+
+def _inspeccionar_docx(path: str, propiedades: Dict[str, Any]):
+    try:
+        with zipfile.ZipFile(path) as paquete:
+            entradas = paquete.infolist()
+            propiedades["entradas_zip"] = len(entradas)
+            nombres = {entrada.filename for entrada in entradas}
+            if "[Content_Types].xml" not in nombres or not any(n.startswith("word/") for n in nombres):
+                raise ArchivoInvalido("El archivo ZIP no es un documento Word (.docx)")
+            # Verificar el CRC de las partes XML (las que se parsean), no de imágenes y adjuntos
+            for entrada in entradas:
+                if entrada.filename.endswith(('.xml', '.rels')):
+                    with paquete.open(entrada) as parte:
+                        while parte.read(1024 * 1024):
+                            pass
+            propiedades["tamano_descomprimido_bytes"] = sum(e.file_size for e in entradas)
+    except ArchivoInvalido:
+        raise
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, EOFError, NotImplementedError) as e:
+        raise ArchivoInvalido(f"El DOCX está truncado o dañado: {e}")
+
+def _tiene_fuentes(recursos) -> bool:
+    if recursos is None:
+        return False
+    fuentes = recursos.get_object().get('/Font')
+    return fuentes is not None and len(fuentes.get_object()) > 0
+
+def _tiene_texto(contenido, recursos, profundidad: int = 0) -> bool:
+    """
+    Un flujo de contenido tiene texto si muestra cadenas (Tj, TJ...) con fuentes en sus
+    recursos; también se revisan los formularios (XObject) que dibuja.
+    """
+    if contenido is not None and _tiene_fuentes(recursos) and _OPERADOR_TEXTO.search(contenido.get_data()):
+        return True
+    objetos = recursos.get_object().get('/XObject') if recursos is not None else None
+    if objetos is None or profundidad >= 2:
+        return False
+    for objeto in objetos.get_object().values():
+        objeto = objeto.get_object()
+        if objeto.get('/Subtype') == '/Form' and _tiene_texto(objeto, objeto.get('/Resources'), profundidad + 1):
+            return True
+    return False
+
+def _inspeccionar_pdf(path: str, inicio: bytes, fin: bytes, propiedades: Dict[str, Any]):
+    encabezado = inicio[inicio.find(_FIRMA_PDF):][:8]
+    propiedades["version_pdf"] = encabezado[len(_FIRMA_PDF):].decode('ascii', 'replace').strip()
+    try:
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            propiedades["cifrado"] = reader.is_encrypted
+            if reader.is_encrypted and not reader.decrypt(""):
+                raise ArchivoInvalido("El PDF está protegido con contraseña")
+            paginas = len(reader.pages)
+            propiedades["paginas"] = paginas
+            if paginas == 0:
+                raise ArchivoInvalido("El PDF no tiene páginas")
+            if Config.VALIDACION_MAX_PAGINAS and paginas > Config.VALIDACION_MAX_PAGINAS:
+                raise ArchivoInvalido(
+                    f"El PDF tiene {paginas} páginas; el máximo permitido es {Config.VALIDACION_MAX_PAGINAS}")
+            # Se revisa una muestra de páginas repartidas en el documento; solo si ninguna
+            # tiene texto se recorre el resto, hasta encontrar la primera que lo tenga
+            muestra = sorted({round(i * (paginas - 1) / max(1, Config.PDF_AUTO_PAGINAS_MUESTRA - 1))
+                              for i in range(max(1, Config.PDF_AUTO_PAGINAS_MUESTRA))})
+            con_texto = lambda indice: _tiene_texto(reader.pages[indice].get_contents(),
+                                                    reader.pages[indice].get('/Resources'))
+            propiedades["paginas_muestreadas"] = len(muestra)
+            propiedades["capa_texto"] = any(con_texto(indice) for indice in muestra) or \
+                any(con_texto(indice) for indice in range(paginas) if indice not in muestra)
+    except ArchivoInvalido:
+        raise
+    except Exception as e:
+        if b"%%EOF" not in fin:
+            raise ArchivoInvalido(f"El PDF está truncado: {e}")
+        raise ArchivoInvalido(f"El PDF está dañado: {e}")
+    if not propiedades["capa_texto"]:
+        raise ArchivoInvalido("El PDF no tiene capa de texto (documento escaneado); se requiere OCR")
+
+def inspeccionar_archivo(path: str, nombre_original: str = None) -> Dict[str, Any]:
+    """
+    Validación previa al parseo: revisa la firma del archivo, la integridad del ZIP de
+    los DOCX y, en los PDF, el cifrado, el número de páginas y la presencia de capa de
+    texto, sin extraer el contenido. Devuelve las propiedades detectadas o lanza
+    ArchivoInvalido con el motivo del rechazo.
+    """
+    inicio_validacion = time.perf_counter()
+    nombre = nombre_original or os.path.basename(path)
+    extension = os.path.splitext(nombre)[1].lower().lstrip('.')
+    tamano = os.path.getsize(path)
+    if tamano == 0:
+        raise ArchivoInvalido(f"El archivo {nombre} está vacío")
+
+    inicio, fin = _leer_extremos(path)
+    formato = _detectar_formato(inicio)
+    if formato == 'ole':
+        raise ArchivoInvalido(
+            f"{nombre} es un documento Office protegido con contraseña o en formato .doc antiguo")
+    if formato == 'desconocido':
+        raise ArchivoInvalido(f"{nombre} no es un PDF ni un DOCX válido")
+    if formato != extension:
+        raise ArchivoInvalido(f"El contenido de {nombre} corresponde a un {formato.upper()}, no a un .{extension}")
+
+    propiedades = {"tipo": formato, "tamano_bytes": tamano}
+    if formato == 'docx':
+        _inspeccionar_docx(path, propiedades)
+    else:
+        _inspeccionar_pdf(path, inicio, fin, propiedades)
+    propiedades["tiempo_ms"] = round((time.perf_counter() - inicio_validacion) * 1000, 2)
+    return propiedades
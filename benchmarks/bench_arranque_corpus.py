@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque con el snapshot del corpus histórico en disco.
+
+Genera un corpus de N documentos (unas decenas distintos, el resto copias para no
+tardar en generarlo), lo sincroniza una vez para llenar la caché de parseo y el
+archivo de snapshot, y mide un reinicio:
+  - sin snapshot: sincronizar desde cero (hash + caché de parseo de cada archivo)
+  - con snapshot: leer el archivo y validarlo contra el directorio (stat de cada archivo)
+Verifica además que ambos corpus quedan con los mismos documentos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_arranque_corpus [--documentos 5000] [--distintos 50]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from auto_ofertas.processors.cache import cache_parseo, cache_paginas
+from auto_ofertas.processors.corpus import CorpusHistorico, TIPO_OFERTA, TIPO_LICITACION
+from benchmarks.fixtures import generar_docx, generar_pdf
+
+def generar_corpus(ofertas_dir: str, licitaciones_dir: str, documentos: int, distintos: int):
+    for numero in range(documentos):
+        base = numero % distintos
+        if base % 2 == 0:
+            destino = os.path.join(ofertas_dir, f"oferta_{numero}.docx")
+            origen = os.path.join(ofertas_dir, f"oferta_{base}.docx")
+            generador = lambda: generar_docx(destino, 60, 1, 20, semilla=base)
+        else:
+            destino = os.path.join(licitaciones_dir, f"licitacion_{numero}.pdf")
+            origen = os.path.join(licitaciones_dir, f"licitacion_{base}.pdf")
+            generador = lambda: generar_pdf(destino, 3, semilla=base)
+        if numero < distintos:
+            generador()
+        else:
+            shutil.copyfile(origen, destino)
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=5000)
+    argumentos.add_argument("--distintos", type=int, default=50)
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache_parseo.directorio = os.path.join(directorio, "cache")
+        cache_paginas.directorio = os.path.join(directorio, "cache_paginas")
+        ruta_snapshot = os.path.join(directorio, "corpus.snapshot")
+        ofertas_dir = os.path.join(directorio, "ofertas")
+        licitaciones_dir = os.path.join(directorio, "licitaciones")
+        os.makedirs(ofertas_dir)
+        os.makedirs(licitaciones_dir)
+        directorios = {TIPO_OFERTA: ofertas_dir, TIPO_LICITACION: licitaciones_dir}
+
+        print(f"📄 Generando {opciones.documentos} documentos...")
+        generar_corpus(ofertas_dir, licitaciones_dir, opciones.documentos, opciones.distintos)
+        inicial = CorpusHistorico(ruta_snapshot)
+        inicial.sincronizar(directorios)
+        inicial.guardar_pendiente()
+        print(f"💾 Snapshot: {os.path.getsize(ruta_snapshot) / 1024 / 1024:.1f} MB")
+
+        inicio = time.perf_counter()
+        sin_snapshot = CorpusHistorico()
+        sin_snapshot.sincronizar(directorios)
+        tiempo_sin = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        con_snapshot = CorpusHistorico(ruta_snapshot)
+        cambios = con_snapshot.sincronizar(directorios)
+        tiempo_con = time.perf_counter() - inicio
+
+        if cambios["sin_cambios"] != opciones.documentos or \
+                sin_snapshot.manifiesto() != con_snapshot.manifiesto():
+            raise SystemExit(f"❌ El corpus leído del snapshot no coincide con el directorio: {cambios}")
+        if [dict(d) for d in sin_snapshot.documentos(TIPO_OFERTA)] != \
+                [dict(d) for d in con_snapshot.documentos(TIPO_OFERTA)]:
+            raise SystemExit("❌ Los documentos del snapshot difieren de los parseados")
+
+    print(f"\n📊 Reinicio con {opciones.documentos} documentos históricos")
+    print(f"   Sin snapshot (caché de parseo caliente): {tiempo_sin:.2f}s")
+    print(f"   Con snapshot:                            {tiempo_con:.2f}s ({tiempo_sin / tiempo_con:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la selección de ofertas históricas para el prompt.
+
+Construye un corpus sintético de N ofertas repartidas en temas (cada tema con su
+vocabulario propio sobre un texto común) y, para licitaciones de cada tema, compara:
+  - antes: las 3 primeras ofertas del corpus
+  - BM25: las 3 ofertas más relevantes según el índice invertido
+reportando la precisión (ofertas del mismo tema), el tiempo de construir el índice,
+la latencia por consulta y el costo de agregar / quitar una oferta.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_busqueda_historicos [--ofertas 5000] [--consultas 50]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from auto_ofertas.processors.corpus import CorpusHistorico, EntradaManifiesto, TIPO_OFERTA
+from auto_ofertas.processors.documento import DocumentoParseado
+from benchmarks.fixtures import PALABRAS, TITULOS
+
+TEMAS = {
+    "salud": "hospital pacientes clínica atención médica fichas enfermería urgencias camas diagnóstico",
+    "educacion": "estudiantes docentes competencias rúbricas evaluación carreras aprendizaje campus académico",
+    "mineria": "faena yacimiento mineral extracción chancado relaves geología perforación tronadura",
+    "transporte": "buses recorridos pasajeros validadores tarifas flota paraderos conductores rutas",
+    "finanzas": "pagos tesorería contabilidad conciliación facturas presupuesto auditoría impuestos balance",
+    "energia": "subestación transmisión medidores consumo eléctrico turbinas paneles solares potencia",
+    "retail": "inventario tiendas ventas bodega productos catálogo reposición clientes góndolas",
+    "municipal": "vecinos municipalidad permisos patentes trámites alcaldía ordenanzas juntas comunal",
+}
+VOCABULARIO_COMUN = PALABRAS + ("sistema plataforma desarrollo implementación usuarios módulo integración "
+                                "reportes gestión soporte capacitación datos seguridad").split()
+
+def generar_documento(aleatorio: random.Random, tema: str, secciones: int = 12, palabras: int = 80) -> dict:
+    propias = TEMAS[tema].split()
+    documento = {}
+    for indice in range(secciones):
+        texto = [aleatorio.choice(propias) if aleatorio.random() < 0.15 else aleatorio.choice(VOCABULARIO_COMUN)
+                 for _ in range(palabras)]
+        documento[f"{TITULOS[indice % len(TITULOS)]} {indice}"] = " ".join(texto)
+    return documento
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--ofertas", type=int, default=5000)
+    argumentos.add_argument("--consultas", type=int, default=50)
+    opciones = argumentos.parse_args()
+
+    aleatorio = random.Random(7)
+    temas = list(TEMAS)
+    tema_de = {}
+    entradas = {}
+    for numero in range(opciones.ofertas):
+        path = f"/historicos/oferta_{numero}.docx"
+        tema_de[path] = temas[aleatorio.randrange(len(temas))]
+        documento = DocumentoParseado(path, generar_documento(aleatorio, tema_de[path]))
+        entradas[path] = EntradaManifiesto(TIPO_OFERTA, path, 0, 0, "", documento)
+    corpus = CorpusHistorico()
+    # Publicar un snapshot incluye poner al día los índices
+    inicio = time.perf_counter()
+    corpus._publicar(lambda actuales: actuales.update(entradas))
+    construccion = time.perf_counter() - inicio
+
+    aciertos_antes = aciertos_bm25 = 0
+    latencias = []
+    for numero in range(opciones.consultas):
+        tema = temas[numero % len(temas)]
+        consulta = "\n".join(f"{titulo}\n{texto}" for titulo, texto in generar_documento(aleatorio, tema).items())
+        inicio = time.perf_counter()
+        elegidas = corpus.buscar(TIPO_OFERTA, consulta, 3)
+        latencias.append(time.perf_counter() - inicio)
+        aciertos_bm25 += sum(tema_de[oferta.archivo_origen] == tema for oferta in elegidas)
+        aciertos_antes += sum(tema_de[oferta.archivo_origen] == tema for oferta in corpus.snapshot.ofertas[:3])
+
+    nueva = "/historicos/oferta_nueva.docx"
+    documento = DocumentoParseado(nueva, generar_documento(aleatorio, "salud"))
+    inicio = time.perf_counter()
+    corpus._publicar(lambda actuales: actuales.__setitem__(
+        nueva, EntradaManifiesto(TIPO_OFERTA, nueva, 0, 0, "", documento)))
+    agregar = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    corpus.eliminar(nueva)
+    quitar = time.perf_counter() - inicio
+
+    total = opciones.consultas * 3
+    print(f"📊 {opciones.ofertas} ofertas históricas, {opciones.consultas} licitaciones de {len(temas)} temas")
+    print(f"   Precisión de los 3 ejemplos: antes {aciertos_antes / total:.0%}, BM25 {aciertos_bm25 / total:.0%}")
+    print(f"   Construcción del índice:     {construccion:.2f}s")
+    print(f"   Consulta (mediana / máx.):   {statistics.median(latencias) * 1000:.1f}ms / {max(latencias) * 1000:.1f}ms")
+    print(f"   Agregar / quitar una oferta: {agregar * 1000:.1f}ms / {quitar * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda de texto completo (GET /buscar/) sobre el corpus histórico.
+
+Indexa un corpus sintético de N documentos (ofertas y licitaciones por temas, con
+fechas repartidas en varios años) y mide la latencia (p50 / p95) de consultas de
+distinto tipo: términos frecuentes y raros, frases, prefijos, filtros por tipo y
+fecha, y páginas profundas. También mide la indexación inicial y la resincronización
+tras cambiar un documento.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_busqueda_texto [--documentos 10000] [--repeticiones 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from auto_ofertas.processors.busqueda_texto import IndiceTextoCompleto
+from auto_ofertas.processors.corpus import EntradaManifiesto, TIPO_OFERTA, TIPO_LICITACION
+from auto_ofertas.processors.documento import DocumentoParseado
+from benchmarks.bench_busqueda_historicos import TEMAS, generar_documento
+
+CONSULTAS = [
+    ("término frecuente", {"consulta": "proveedor"}),
+    ("término de un tema", {"consulta": "relaves"}),
+    ("varios términos", {"consulta": "pacientes urgencias capacitación"}),
+    ("frase", {"consulta": '"informes mensuales"'}),
+    ("prefijo", {"consulta": "implementa*"}),
+    ("OR / NOT", {"consulta": "buses OR tarifas NOT conductores"}),
+    ("filtro por tipo", {"consulta": "garantías", "tipo": TIPO_LICITACION}),
+    ("filtro por fecha", {"consulta": "hospital", "desde": "2022-01-01", "hasta": "2022-12-31"}),
+    ("página 50", {"consulta": "contrato", "pagina": 50}),
+]
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=10000)
+    argumentos.add_argument("--repeticiones", type=int, default=20)
+    opciones = argumentos.parse_args()
+
+    aleatorio = random.Random(3)
+    temas = list(TEMAS)
+    inicio_fechas = datetime(2019, 1, 1).timestamp()
+    entradas = {}
+    for numero in range(opciones.documentos):
+        tipo = TIPO_OFERTA if numero % 2 == 0 else TIPO_LICITACION
+        path = f"/historicos/{tipo}_{numero}.docx"
+        documento = DocumentoParseado(path, generar_documento(aleatorio, temas[numero % len(temas)]))
+        mtime_ns = int((inicio_fechas + aleatorio.uniform(0, 5 * 365 * 86400)) * 1e9)
+        entradas[path] = EntradaManifiesto(tipo, os.path.basename(path), 0, mtime_ns, f"sha-{numero}", documento)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        indice = IndiceTextoCompleto(os.path.join(directorio, "busqueda.sqlite3"))
+        inicio = time.perf_counter()
+        indice.sincronizar(entradas)
+        indexacion = time.perf_counter() - inicio
+
+        cambiado = next(iter(entradas))
+        entrada = entradas[cambiado]
+        entradas[cambiado] = EntradaManifiesto(entrada.tipo, entrada.filename, 0, entrada.mtime_ns, "sha-nuevo",
+                                               entrada.documento)
+        inicio = time.perf_counter()
+        indice.sincronizar(entradas)
+        resincronizacion = time.perf_counter() - inicio
+
+        print(f"📊 {opciones.documentos} documentos ({opciones.documentos * 12} secciones)")
+        print(f"   Indexación inicial: {indexacion:.1f}s, resincronizar 1 documento: {resincronizacion * 1000:.0f}ms\n")
+        print(f"{'consulta':<20} {'resultados':>10} {'p50':>8} {'p95':>8}")
+        todas = []
+        for nombre, parametros in CONSULTAS:
+            latencias = []
+            for _ in range(opciones.repeticiones):
+                inicio = time.perf_counter()
+                resultado = indice.buscar(**parametros)
+                latencias.append(time.perf_counter() - inicio)
+            todas += latencias
+            latencias.sort()
+            print(f"{nombre:<20} {resultado['total']:>10} {statistics.median(latencias) * 1000:>6.1f}ms "
+                  f"{latencias[int(len(latencias) * 0.95) - 1] * 1000:>6.1f}ms")
+        todas.sort()
+        print(f"\n   p95 global: {todas[int(len(todas) * 0.95) - 1] * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la caché de texto por página de PDF.
+
+Genera un documento base y una versión con erratas en unas pocas páginas, parsea
+la base (llenando la caché por página) y mide el parseo de la errata con y sin
+caché por página. La caché por documento se desactiva para aislar el efecto.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_cache_paginas [--paginas 300] [--modificadas 3]
+"""
+
+import argparse
+import os
+import tempfile
+
+from auto_ofertas.config import Config
+from auto_ofertas.processors.cache import CacheParseo
+from auto_ofertas.processors import parser
+from benchmarks.fixtures import generar_pdf
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--paginas", type=int, default=300)
+    argumentos.add_argument("--modificadas", type=int, default=3)
+    opciones = argumentos.parse_args()
+
+    Config.PARSE_AISLADO = False
+    with tempfile.TemporaryDirectory() as directorio:
+        parser.cache_paginas = CacheParseo(os.path.join(directorio, "cache"), 32 * 1024 * 1024)
+        modificadas = {opciones.paginas * (i + 1) // (opciones.modificadas + 1) for i in range(opciones.modificadas)}
+        base = generar_pdf(os.path.join(directorio, "base.pdf"), opciones.paginas)
+        errata = generar_pdf(os.path.join(directorio, "errata.pdf"), opciones.paginas, paginas_modificadas=modificadas)
+
+        Config.PAGINAS_CACHE_ACTIVA = False
+        sin_cache = parser.parsear_documento(errata, usar_cache=False)
+        Config.PAGINAS_CACHE_ACTIVA = True
+        parser.parsear_documento(base, usar_cache=False)
+        parser.cache_paginas.limpiar_memoria()
+        con_cache = parser.parsear_documento(errata, usar_cache=False)
+
+    if con_cache["secciones"] != sin_cache["secciones"]:
+        raise SystemExit("❌ La caché por página cambió las secciones extraídas")
+    tiempo_sin, tiempo_con = sin_cache["metadatos"]["tiempo_s"], con_cache["metadatos"]["tiempo_s"]
+    print(f"📊 Errata de {len(modificadas)} páginas sobre un PDF de {opciones.paginas} páginas")
+    print(f"   Sin caché por página: {tiempo_sin:8.2f}s")
+    print(f"   Con caché por página: {tiempo_con:8.2f}s "
+          f"({con_cache['metadatos']['paginas_cache']} páginas desde caché)")
+    print(f"   Mejora:               {tiempo_sin / tiempo_con:8.1f}x (secciones idénticas)")
+
+if __name__ == "__main__":
+    main()
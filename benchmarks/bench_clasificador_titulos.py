@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark del clasificador de títulos de sección.
+
+Compara las líneas por segundo del clasificador original (listas de palabras
+reconstruidas en cada línea, varios re.match y ~80 búsquedas de subcadenas) con
+el clasificador precompilado de auto_ofertas.processors.parser, y verifica que
+ambos clasifican igual cada línea.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_clasificador_titulos [--lineas 20000] [--repeticiones 5]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from auto_ofertas.processors.parser import es_linea_titulo
+
+def es_linea_titulo_original(line_strip: str) -> bool:
+    """Copia literal de la lógica de detección anterior, usada como referencia"""
+    es_titulo = False
+    if line_strip.isupper() and len(line_strip) > 3:
+        es_titulo = True
+    elif re.match(r"^[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+:$", line_strip):
+        es_titulo = True
+    elif re.match(r"^\d+\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
+        es_titulo = True
+    elif re.match(r"^[IVX]+\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
+        es_titulo = True
+    elif re.match(r"^[A-Z]\.\s*[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑa-záéíóúñ\s]+$", line_strip):
+        es_titulo = True
+    palabras_clave = [
+        "OBJETIVO", "ALCANCE", "REQUISITOS", "ESPECIFICACIONES", "PLAZOS",
+        "PRESUPUESTO", "CRITERIOS", "EVALUACIÓN", "CONDICIONES", "GARANTÍAS",
+        "METODOLOGÍA", "EQUIPO", "EXPERIENCIA", "REFERENCIAS", "ENTREGABLES",
+        "CRONOGRAMA", "FACTORES", "RIESGOS", "CALIDAD", "SOPORTE",
+        "DESCRIPCIÓN", "CARACTERÍSTICAS", "FUNCIONALIDADES", "USUARIOS",
+        "PERFILES", "ROLES", "PERMISOS", "INTEGRACIÓN", "DESARROLLO",
+        "IMPLEMENTACIÓN", "CAPACITACIÓN", "DOCUMENTACIÓN", "PRUEBAS",
+        "DESPLIEGUE", "MANTENIMIENTO", "SERVICIOS", "PRODUCTOS",
+        "SOLUCIÓN", "SISTEMA", "PLATAFORMA", "APLICACIÓN", "SOFTWARE",
+        "HARDWARE", "INFRAESTRUCTURA", "TECNOLOGÍA", "ARQUITECTURA",
+        "BASE DE DATOS", "INTERFAZ", "API", "WEB", "MÓVIL", "CLOUD",
+        "SEGURIDAD", "BACKUP", "RESPALDO", "MONITOREO", "REPORTES",
+        "ANÁLISIS", "ESTUDIO", "DIAGNÓSTICO", "PLAN", "ESTRATEGIA",
+        "PROCESO", "PROCEDIMIENTO", "POLÍTICA", "ESTÁNDAR", "NORMATIVA"
+    ]
+    if any(palabra in line_strip.upper() for palabra in palabras_clave):
+        es_titulo = True
+    elif (len(line_strip) < 100 and
+          len(line_strip.split()) <= 8 and
+          line_strip[0].isupper() and
+          not line_strip.endswith('.') and
+          not line_strip.endswith(',') and
+          not re.search(r'\d+%', line_strip)):
+        es_titulo = True
+    palabras_licitacion = [
+        "LICITACIÓN", "CONCURSO", "CONVOCATORIA", "BASES", "TÉRMINOS",
+        "CONDICIONES", "REQUISITOS", "ESPECIFICACIONES", "PLIEGO",
+        "PROPUESTA", "OFERTA", "PRESENTACIÓN", "EVALUACIÓN", "SELECCIÓN"
+    ]
+    if any(palabra in line_strip.upper() for palabra in palabras_licitacion):
+        es_titulo = True
+    return es_titulo
+
+PALABRAS_CUERPO = (
+    "el proveedor deberá entregar los informes mensuales según lo indicado en las "
+    "bases técnicas del servicio contratado para la institución con un 15% de avance "
+    "durante la ejecución del contrato y sus respectivas garantías de calidad"
+).split()
+
+TITULOS = [
+    "1. Objetivo General", "II. ALCANCE DEL SERVICIO", "A. Requisitos técnicos",
+    "Metodología de trabajo:", "CRONOGRAMA", "Equipo de trabajo", "Anexo técnico",
+]
+
+def generar_lineas(cantidad: int, semilla: int = 42):
+    """Genera líneas sintéticas con una mezcla realista de cuerpo de texto y títulos"""
+    aleatorio = random.Random(semilla)
+    lineas = []
+    for _ in range(cantidad):
+        if aleatorio.random() < 0.08:
+            lineas.append(aleatorio.choice(TITULOS))
+        else:
+            palabras = [aleatorio.choice(PALABRAS_CUERPO) for _ in range(aleatorio.randint(4, 18))]
+            linea = " ".join(palabras)
+            lineas.append(linea[0].upper() + linea[1:] + aleatorio.choice([".", ",", "", ";"]))
+    return lineas
+
+def medir(clasificador, lineas, repeticiones: int) -> float:
+    """Devuelve las líneas por segundo del mejor de N recorridos"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for linea in lineas:
+            clasificador(linea)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return len(lineas) / mejor
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--lineas", type=int, default=20000)
+    argumentos.add_argument("--repeticiones", type=int, default=5)
+    opciones = argumentos.parse_args()
+
+    lineas = generar_lineas(opciones.lineas)
+
+    diferencias = [l for l in lineas if es_linea_titulo(l) != es_linea_titulo_original(l)]
+    if diferencias:
+        raise SystemExit(f"❌ Los clasificadores difieren en {len(diferencias)} líneas, ej.: {diferencias[:3]}")
+
+    antes = medir(es_linea_titulo_original, lineas, opciones.repeticiones)
+    despues = medir(es_linea_titulo, lineas, opciones.repeticiones)
+
+    print(f"📊 Clasificador de títulos ({len(lineas)} líneas, mejor de {opciones.repeticiones})")
+    print(f"   Antes:   {antes:,.0f} líneas/s")
+    print(f"   Después: {despues:,.0f} líneas/s")
+    print(f"   Mejora:  {despues / antes:.1f}x (clasificación idéntica)")
+
+if __name__ == "__main__":
+    main()
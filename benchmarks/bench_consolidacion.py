@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la consolidación de secciones sobre el corpus de fixtures.
+
+Genera cada forma de documento de la suite (DOCX y PDF) y la parsea sin caché con
+la consolidación desactivada y activada, reportando el número de secciones y el
+tamaño en bytes del JSON de secciones (lo que ocupan el corpus, los listados y los
+prompts) antes y después.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_consolidacion [--escala 1] [--maximo 40] [--minimo 200]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+from auto_ofertas.config import Config
+from auto_ofertas.processors.parser import parse_licitacion_dinamica
+from benchmarks.fixtures import FORMAS, generar_docx_forma, generar_pdf_forma
+
+def generar_corpus(directorio: str, escala: int) -> list:
+    paths = []
+    for forma in FORMAS:
+        for formato, generador in (("docx", generar_docx_forma), ("pdf", generar_pdf_forma)):
+            paths.append(generador(os.path.join(directorio, f"{forma}.{formato}"), forma, escala))
+    return paths
+
+def medir(path: str, consolidar: bool) -> tuple:
+    Config.CONSOLIDAR_SECCIONES = consolidar
+    secciones = parse_licitacion_dinamica(path, usar_cache=False)
+    return len(secciones), len(json.dumps(secciones, ensure_ascii=False).encode("utf-8"))
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--escala", type=int, default=1)
+    argumentos.add_argument("--maximo", type=int, default=Config.SECCIONES_MAX)
+    argumentos.add_argument("--minimo", type=int, default=Config.SECCIONES_MIN_CARACTERES)
+    opciones = argumentos.parse_args()
+
+    Config.PARSE_AISLADO = False
+    Config.SECCIONES_MAX = opciones.maximo
+    Config.SECCIONES_MIN_CARACTERES = opciones.minimo
+
+    totales = [0, 0, 0, 0]
+    print(f"{'documento':<26} {'secciones':>17} {'bytes JSON':>25}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for path in generar_corpus(directorio, opciones.escala):
+            secciones_antes, bytes_antes = medir(path, False)
+            secciones_despues, bytes_despues = medir(path, True)
+            for indice, valor in enumerate((secciones_antes, secciones_despues, bytes_antes, bytes_despues)):
+                totales[indice] += valor
+            print(f"{os.path.basename(path):<26} {secciones_antes:>7} -> {secciones_despues:<7} "
+                  f"{bytes_antes:>11,} -> {bytes_despues:<11,}")
+
+    secciones_antes, secciones_despues, bytes_antes, bytes_despues = totales
+    print(f"\n📊 Corpus de fixtures (máximo {opciones.maximo} secciones, mínimo {opciones.minimo} caracteres)")
+    print(f"   Secciones: {secciones_antes} -> {secciones_despues} "
+          f"({(1 - secciones_despues / secciones_antes) * 100:.1f}% menos)")
+    print(f"   Bytes:     {bytes_antes:,} -> {bytes_despues:,} "
+          f"({(1 - bytes_despues / bytes_antes) * 100:.1f}% menos)")
+
+if __name__ == "__main__":
+    main()
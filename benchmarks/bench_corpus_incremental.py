@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la carga de una oferta según el tamaño del corpus histórico.
+
+Para corpus de distinto tamaño mide lo que cuesta incorporar una oferta nueva:
+  - antes: recargar todo el corpus (parse_many sobre todos los archivos, con la
+    caché de parseo caliente), como hacía /cargar-oferta/
+  - sincronización incremental: escanear el manifiesto y parsear solo el archivo nuevo
+  - registro directo: incorporar el documento ya parseado por el endpoint
+y verifica que el corpus no queda con duplicados.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_corpus_incremental [--documentos 25 100 200]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from auto_ofertas.processors.cache import cache_parseo, cache_paginas
+from auto_ofertas.processors.corpus import CorpusHistorico, TIPO_OFERTA, TIPO_LICITACION
+from auto_ofertas.processors.parser import parse_licitacion_dinamica
+from benchmarks.fixtures import generar_docx, generar_pdf
+
+def generar_corpus(ofertas_dir: str, licitaciones_dir: str, desde: int, hasta: int):
+    for numero in range(desde, hasta):
+        if numero % 2 == 0:
+            generar_docx(os.path.join(ofertas_dir, f"oferta_{numero}.docx"), 60, 1, 20, semilla=numero)
+        else:
+            generar_pdf(os.path.join(licitaciones_dir, f"licitacion_{numero}.pdf"), 3, semilla=numero)
+
+def cronometrar(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, nargs="+", default=[25, 100, 200])
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Cachés y documentos en un directorio temporal para no tocar uploads/
+        cache_parseo.directorio = os.path.join(directorio, "cache")
+        cache_paginas.directorio = os.path.join(directorio, "cache_paginas")
+        ofertas_dir = os.path.join(directorio, "ofertas")
+        licitaciones_dir = os.path.join(directorio, "licitaciones")
+        os.makedirs(ofertas_dir)
+        os.makedirs(licitaciones_dir)
+        directorios = {TIPO_OFERTA: ofertas_dir, TIPO_LICITACION: licitaciones_dir}
+
+        corpus = CorpusHistorico()
+        generados = 0
+        print(f"{'corpus':>7} {'recarga completa':>17} {'sinc. incremental':>18} {'registro directo':>17}")
+        for documentos in sorted(opciones.documentos):
+            generar_corpus(ofertas_dir, licitaciones_dir, generados, documentos)
+            generados = documentos
+            corpus.sincronizar(directorios)  # también calienta la caché de parseo
+
+            recarga = cronometrar(lambda: CorpusHistorico().sincronizar(directorios))
+
+            nueva = os.path.join(ofertas_dir, f"oferta_nueva_{documentos}.docx")
+            generar_docx(nueva, 60, 1, 20, semilla=10_000 + documentos)
+            incremental = cronometrar(lambda: corpus.sincronizar(directorios))
+
+            corpus.eliminar(nueva)
+            secciones = parse_licitacion_dinamica(nueva, usar_cache=False)
+            registro = cronometrar(lambda: corpus.registrar(TIPO_OFERTA, nueva, secciones))
+
+            archivos = [entrada["archivo"] for entrada in corpus.manifiesto()]
+            if len(archivos) != len(set(archivos)) or len(archivos) != documentos + 1:
+                raise SystemExit("❌ El corpus quedó con duplicados o archivos faltantes")
+            os.remove(nueva)
+            corpus.eliminar(nueva)
+            print(f"{documentos:>7} {recarga * 1000:>15.1f}ms {incremental * 1000:>16.1f}ms {registro * 1000:>15.2f}ms")
+
+if __name__ == "__main__":
+    main()
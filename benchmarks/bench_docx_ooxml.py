@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extracción de texto de DOCX: lector OOXML directo vs python-docx.
+
+Genera DOCX sintéticos con tablas grandes y extrae su texto en un proceso nuevo
+con cada lector, reportando el tiempo y el pico de memoria residente (RSS), y
+verifica que ambos producen exactamente el mismo texto.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_docx_ooxml [--tablas 1 5 20] [--filas 200]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.fixtures import generar_docx
+
+CODIGO_HIJO = """
+import hashlib, json, resource, sys, time
+from auto_ofertas.processors.parser import iterar_texto_docx
+from auto_ofertas.processors.ooxml import iterar_texto_docx_ooxml
+lector, path = sys.argv[1], sys.argv[2]
+inicio = time.perf_counter()
+iterador = iterar_texto_docx_ooxml(path) if lector == "ooxml" else iterar_texto_docx(path)
+sha = hashlib.sha256()
+for fragmento in iterador:
+    sha.update(fragmento.encode("utf-8"))
+tiempo = time.perf_counter() - inicio
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"tiempo": tiempo, "rss_mb": rss_mb, "sha": sha.hexdigest()}))
+"""
+
+def medir(lector: str, path: str) -> dict:
+    """Extrae el texto en un proceso nuevo para aislar el pico de memoria"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_HIJO, lector, path],
+        cwd=raiz, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--tablas", type=int, nargs="+", default=[1, 5, 20])
+    argumentos.add_argument("--filas", type=int, default=200)
+    argumentos.add_argument("--parrafos", type=int, default=500)
+    opciones = argumentos.parse_args()
+
+    print(f"{'tablas':>7} {'lector':>12} {'tiempo (s)':>11} {'RSS pico (MB)':>14}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for tablas in opciones.tablas:
+            path = generar_docx(os.path.join(directorio, f"licitacion_{tablas}.docx"),
+                                opciones.parrafos, tablas, opciones.filas)
+            resultados = {lector: medir(lector, path) for lector in ("python-docx", "ooxml")}
+            for lector, resultado in resultados.items():
+                print(f"{tablas:>7} {lector:>12} {resultado['tiempo']:>11.2f} {resultado['rss_mb']:>14.1f}")
+            if resultados["ooxml"]["sha"] != resultados["python-docx"]["sha"]:
+                raise SystemExit(f"❌ Los lectores producen textos distintos con {tablas} tablas")
+            print(f"{'':>7} mejora: {resultados['python-docx']['tiempo'] / resultados['ooxml']['tiempo']:.1f}x (texto idéntico)")
+
+if __name__ == "__main__":
+    main()
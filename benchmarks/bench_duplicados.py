@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la detección de duplicados (MinHash/LSH) del corpus histórico.
+
+Construye un corpus sintético de N ofertas y agrega copias exactas y copias con una
+fracción de palabras cambiadas. Mide:
+  - el costo de calcular las firmas e indexarlas
+  - la latencia de buscar duplicados de un documento con LSH frente a comparar su
+    firma con todas las del corpus (búsqueda lineal)
+  - cuántas copias se detectan al cargarlas y cuántos documentos distintos se marcan
+    por error
+  - el tiempo del informe de duplicados sobre todo el corpus
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_duplicados [--ofertas 10000] [--copias 200] [--cambios 0.01]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from auto_ofertas.processors.busqueda import texto_secciones
+from auto_ofertas.processors.duplicados import IndiceMinHash, firma_minhash, similitud_firmas
+from benchmarks.bench_busqueda_historicos import TEMAS, generar_documento
+
+UMBRAL = 0.8
+
+def modificar(aleatorio: random.Random, texto: str, fraccion: float) -> str:
+    palabras = texto.split(" ")
+    for _ in range(int(len(palabras) * fraccion)):
+        palabras[aleatorio.randrange(len(palabras))] = aleatorio.choice(("modificado", "revisado", "nuevo"))
+    return " ".join(palabras)
+
+def percentil(valores, p: float) -> float:
+    valores = sorted(valores)
+    return valores[max(0, int(len(valores) * p) - 1)]
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--ofertas", type=int, default=10000)
+    argumentos.add_argument("--copias", type=int, default=200)
+    argumentos.add_argument("--cambios", type=float, default=0.01, help="fracción de palabras cambiadas")
+    opciones = argumentos.parse_args()
+
+    aleatorio = random.Random(11)
+    temas = list(TEMAS)
+    textos = {f"oferta_{numero}": texto_secciones(generar_documento(aleatorio, temas[numero % len(temas)]))
+              for numero in range(opciones.ofertas)}
+
+    indice = IndiceMinHash()
+    inicio = time.perf_counter()
+    for clave, texto in textos.items():
+        indice.agregar(clave, texto)
+    construccion = time.perf_counter() - inicio
+
+    # Mitad copias exactas, mitad casi exactas; se consultan antes de indexarlas
+    originales = aleatorio.sample(list(textos), opciones.copias)
+    copias = [(original, textos[original] if numero % 2 == 0 else modificar(aleatorio, textos[original],
+                                                                              opciones.cambios))
+              for numero, original in enumerate(originales)]
+    firmas = {clave: firma_minhash(texto)[0] for clave, texto in textos.items()}
+
+    latencias_lsh, latencias_lineal = [], []
+    detectadas = falsos = 0
+    for original, texto in copias:
+        inicio = time.perf_counter()
+        encontrados = indice.duplicados(texto, UMBRAL)
+        latencias_lsh.append(time.perf_counter() - inicio)
+        detectadas += any(clave == original for clave, _, _ in encontrados)
+        falsos += sum(clave != original for clave, _, _ in encontrados)
+
+        inicio = time.perf_counter()
+        firma = firma_minhash(texto)[0]
+        [clave for clave, otra in firmas.items() if similitud_firmas(firma, otra) >= UMBRAL]
+        latencias_lineal.append(time.perf_counter() - inicio)
+
+    for numero, (original, texto) in enumerate(copias):
+        indice.agregar(f"copia_{numero}", texto)
+    inicio = time.perf_counter()
+    grupos = indice.grupos(UMBRAL)
+    informe = time.perf_counter() - inicio
+
+    print(f"📊 {opciones.ofertas} ofertas, {opciones.copias} copias ({opciones.cambios:.0%} de palabras cambiadas "
+          f"en la mitad)\n")
+    print(f"   Firmas + índice: {construccion:.1f}s ({construccion / opciones.ofertas * 1000:.2f}ms por documento)")
+    print(f"   Búsqueda LSH:    p50 {statistics.median(latencias_lsh) * 1000:.2f}ms, "
+          f"p95 {percentil(latencias_lsh, 0.95) * 1000:.2f}ms")
+    print(f"   Búsqueda lineal: p50 {statistics.median(latencias_lineal) * 1000:.2f}ms, "
+          f"p95 {percentil(latencias_lineal, 0.95) * 1000:.2f}ms")
+    print(f"   Copias detectadas: {detectadas}/{len(copias)}, documentos distintos marcados: {falsos}")
+    print(f"   Informe del corpus: {informe * 1000:.0f}ms, {len(grupos)} grupos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del corpus histórico en memoria.
+
+Construye un corpus sintético de documentos parseados (cada uno deserializado por
+separado, como llegan desde el parser o la caché) y mide con tracemalloc la
+memoria que ocupan:
+  - antes: un dict por documento con `archivo_origen` mezclado como sección
+  - después: DocumentoParseado (__slots__, títulos internados, buffer único)
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_memoria_corpus [--documentos 5000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from auto_ofertas.processors.documento import DocumentoParseado
+from benchmarks.fixtures import TITULOS, frase
+
+TITULOS_SECCION = TITULOS + [
+    "Presupuesto", "Criterios de Evaluación", "Entregables", "Plazos de Entrega",
+    "Soporte y Mantenimiento", "Experiencia de la Empresa", "Anexo Técnico",
+]
+
+def generar_documentos_json(documentos: int, semilla: int = 42) -> list:
+    """Genera cada documento serializado, para deserializarlo de forma independiente"""
+    aleatorio = random.Random(semilla)
+    serializados = []
+    for numero in range(documentos):
+        titulos = aleatorio.sample(TITULOS_SECCION, aleatorio.randint(4, 10))
+        secciones = {titulo: " ".join(frase(aleatorio) for _ in range(aleatorio.randint(2, 12)))
+                     for titulo in titulos}
+        serializados.append((f"documento_{numero}.docx", json.dumps(secciones, ensure_ascii=False)))
+    return serializados
+
+def construir_dicts(serializados: list) -> list:
+    corpus = []
+    for filename, serializado in serializados:
+        documento = json.loads(serializado)
+        documento['archivo_origen'] = filename
+        corpus.append(documento)
+    return corpus
+
+def construir_compacto(serializados: list) -> list:
+    return [DocumentoParseado(filename, json.loads(serializado)) for filename, serializado in serializados]
+
+def medir(constructor, serializados: list) -> int:
+    """Devuelve los bytes retenidos por el corpus construido"""
+    gc.collect()
+    tracemalloc.start()
+    corpus = constructor(serializados)
+    gc.collect()
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del corpus
+    return actual
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=5000)
+    opciones = argumentos.parse_args()
+
+    serializados = generar_documentos_json(opciones.documentos)
+    muestra = serializados[0]
+    if construir_compacto([muestra])[0].como_dict() != construir_dicts([muestra])[0]:
+        raise SystemExit("❌ La vista de compatibilidad no reproduce el diccionario original")
+
+    antes = medir(construir_dicts, serializados)
+    despues = medir(construir_compacto, serializados)
+
+    print(f"📊 Memoria del corpus ({opciones.documentos} documentos)")
+    print(f"   Antes (dicts):              {antes / 1024 / 1024:8.1f} MB")
+    print(f"   Después (DocumentoParseado): {despues / 1024 / 1024:8.1f} MB")
+    print(f"   Reducción:                  {(1 - despues / antes) * 100:8.1f}%")
+
+if __name__ == "__main__":
+    main()
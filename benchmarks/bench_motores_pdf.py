@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los motores de extracción de PDF (fast, layout y auto).
+
+Genera un corpus de PDFs sintéticos de distintos tamaños y, para cada motor,
+reporta el rendimiento (páginas por segundo) y el tamaño del texto extraído.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_motores_pdf [--paginas 5 20 60]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from auto_ofertas.processors.parser import MOTORES_PDF, extraer_texto_pdf, elegir_motor_pdf
+from benchmarks.fixtures import generar_pdf
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--paginas", type=int, nargs="+", default=[5, 20, 60])
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        corpus = [generar_pdf(os.path.join(directorio, f"licitacion_{n}.pdf"), n, semilla=n)
+                  for n in opciones.paginas]
+        total_paginas = sum(opciones.paginas)
+
+        print(f"📚 Corpus: {len(corpus)} PDFs, {total_paginas} páginas")
+        for path, paginas in zip(corpus, opciones.paginas):
+            print(f"   {os.path.basename(path)}: auto elige '{elegir_motor_pdf(path)}'")
+
+        print(f"\n{'motor':>8} {'tiempo (s)':>11} {'páginas/s':>10} {'caracteres':>11}")
+        for motor in MOTORES_PDF:
+            inicio = time.perf_counter()
+            caracteres = sum(len(extraer_texto_pdf(path, motor=motor, paralelo=False)) for path in corpus)
+            tiempo = time.perf_counter() - inicio
+            print(f"{motor:>8} {tiempo:>11.2f} {total_paginas / tiempo:>10.1f} {caracteres:>11,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark de parse_many: parseo de un corpus sintético con distinto número de workers.
+
+Genera un corpus de DOCX y PDFs pequeños (como el histórico de ofertas y
+licitaciones) y lo parsea sin caché con 1, 2, ... N procesos, reportando el
+tiempo total, los documentos por segundo y la aceleración respecto a 1 worker.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_parse_many [--documentos 200] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from auto_ofertas.processors.parser import parse_many
+from benchmarks.fixtures import generar_docx, generar_pdf
+
+def generar_corpus(directorio: str, documentos: int) -> list:
+    """Genera el corpus alternando DOCX con tablas y PDFs de pocas páginas"""
+    paths = []
+    for numero in range(documentos):
+        if numero % 2 == 0:
+            paths.append(generar_docx(os.path.join(directorio, f"oferta_{numero}.docx"), 60, 1, 20, semilla=numero))
+        else:
+            paths.append(generar_pdf(os.path.join(directorio, f"licitacion_{numero}.pdf"), 3, semilla=numero))
+    return paths
+
+def main():
+    cpus = os.cpu_count() or 1
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=200)
+    argumentos.add_argument("--workers", type=int, nargs="+",
+                            default=sorted({1, max(1, cpus // 2), cpus}))
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        paths = generar_corpus(directorio, opciones.documentos)
+        print(f"📊 parse_many sobre {len(paths)} documentos ({cpus} CPUs)")
+        print(f"{'workers':>8} {'tiempo (s)':>11} {'docs/s':>8} {'aceleración':>12} {'errores':>8}")
+        base = None
+        for workers in opciones.workers:
+            inicio = time.perf_counter()
+            errores = sum(1 for r in parse_many(paths, usar_cache=False, max_workers=workers) if r["error"])
+            tiempo = time.perf_counter() - inicio
+            base = base or tiempo
+            print(f"{workers:>8} {tiempo:>11.2f} {len(paths) / tiempo:>8.1f} {base / tiempo:>11.2f}x {errores:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark del costo del parseo aislado en procesos (Config.PARSE_AISLADO).
+
+Parsea sin caché los mismos documentos en el proceso actual y en el pool de
+workers aislados, y reporta la latencia p50 de cada modo y el costo adicional por
+documento (envío de la tarea, serialización del resultado y arranque del primer
+worker, que se mide aparte).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_parseo_aislado [--repeticiones 20]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from auto_ofertas.config import Config
+from auto_ofertas.processors.parser import parsear_documento
+from auto_ofertas.processors.sandbox import pool_parseo
+from benchmarks.fixtures import generar_docx_forma, generar_pdf_forma
+
+def medir(path: str, repeticiones: int) -> dict:
+    """Alterna ambos modos en cada repetición para que la variación de la máquina afecte a los dos"""
+    latencias = {False: [], True: []}
+    for _ in range(repeticiones):
+        for aislado in (False, True):
+            Config.PARSE_AISLADO = aislado
+            inicio = time.perf_counter()
+            parsear_documento(path, usar_cache=False)
+            latencias[aislado].append(time.perf_counter() - inicio)
+    return {modo: statistics.median(valores) for modo, valores in latencias.items()}
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--repeticiones", type=int, default=20)
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        documentos = {
+            "docx pequeño": generar_docx_forma(os.path.join(directorio, "a.docx"), "lineas_cortas", 1),
+            "docx tablas": generar_docx_forma(os.path.join(directorio, "b.docx"), "tablas_grandes", 1),
+            "pdf 5 páginas": generar_pdf_forma(os.path.join(directorio, "c.pdf"), "muchos_headers", 1),
+        }
+
+        Config.PARSE_AISLADO = True
+        inicio = time.perf_counter()
+        parsear_documento(documentos["docx pequeño"], usar_cache=False)
+        arranque = time.perf_counter() - inicio
+
+        print(f"📊 Parseo aislado vs en proceso (p50 de {opciones.repeticiones})")
+        print(f"   Primer parseo aislado (incluye arrancar el worker): {arranque * 1000:.1f} ms")
+        print(f"{'documento':>16} {'en proceso (ms)':>16} {'aislado (ms)':>13} {'costo (ms)':>11}")
+        for nombre, path in documentos.items():
+            medianas = medir(path, opciones.repeticiones)
+            en_proceso, aislado = medianas[False], medianas[True]
+            print(f"{nombre:>16} {en_proceso * 1000:>16.2f} {aislado * 1000:>13.2f} "
+                  f"{(aislado - en_proceso) * 1000:>+11.2f}")
+        pool_parseo.cerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark del registro de documentos (SQLite) frente a recorrer los directorios.
+
+Genera un corpus de N documentos (unas decenas distintos, el resto copias), lo carga
+en el corpus histórico para llenar la caché de parseo y mide:
+  - el listado de ofertas y licitaciones como lo hacían los endpoints (os.listdir +
+    parsear cada archivo, con la caché de parseo ya llena) y desde el registro
+  - los conteos de /estado/ con os.listdir y con el registro
+  - la reconstrucción del registro desde los directorios con el corpus ya cargado
+Verifica además que ambos listados devuelven los mismos datos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_registro [--documentos 2000] [--distintos 40] [--repeticiones 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from auto_ofertas.processors.cache import cache_parseo, cache_paginas
+from auto_ofertas.processors.corpus import CorpusHistorico, TIPO_OFERTA, TIPO_LICITACION
+from auto_ofertas.processors.parser import parse_licitacion_dinamica
+from auto_ofertas.processors.registro import RegistroDocumentos
+from benchmarks.bench_arranque_corpus import generar_corpus
+
+def listado_directorio(directorio: str) -> list:
+    documentos = []
+    for filename in os.listdir(directorio):
+        if filename.endswith('.docx') or filename.endswith('.pdf'):
+            try:
+                documentos.append({"archivo": filename,
+                                   "datos": parse_licitacion_dinamica(os.path.join(directorio, filename))})
+            except Exception as e:
+                documentos.append({"archivo": filename, "error": str(e)})
+    return documentos
+
+def medir(funcion, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=2000)
+    argumentos.add_argument("--distintos", type=int, default=40)
+    argumentos.add_argument("--repeticiones", type=int, default=5)
+    opciones = argumentos.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache_parseo.directorio = os.path.join(directorio, "cache")
+        cache_paginas.directorio = os.path.join(directorio, "cache_paginas")
+        ofertas_dir = os.path.join(directorio, "ofertas")
+        licitaciones_dir = os.path.join(directorio, "licitaciones")
+        os.makedirs(ofertas_dir)
+        os.makedirs(licitaciones_dir)
+        directorios = {TIPO_OFERTA: ofertas_dir, TIPO_LICITACION: licitaciones_dir}
+
+        print(f"📄 Generando {opciones.documentos} documentos...")
+        generar_corpus(ofertas_dir, licitaciones_dir, opciones.documentos, opciones.distintos)
+        corpus = CorpusHistorico()
+        corpus.sincronizar(directorios)
+
+        registro = RegistroDocumentos(os.path.join(directorio, "registro.sqlite3"))
+        inicio = time.perf_counter()
+        registro.sincronizar(directorios, corpus.snapshot)
+        reconstruccion = time.perf_counter() - inicio
+
+        for tipo, carpeta in directorios.items():
+            anterior = sorted(listado_directorio(carpeta), key=lambda documento: documento["archivo"])
+            lista, _ = registro.listado_json(tipo)
+            assert json.loads(lista) == anterior, f"Los listados de {tipo} no coinciden"
+
+        listado_anterior = medir(lambda: [listado_directorio(carpeta) for carpeta in directorios.values()],
+                                 opciones.repeticiones)
+        listado_registro = medir(lambda: [registro.listado_json(tipo) for tipo in directorios],
+                                 opciones.repeticiones)
+        conteo_anterior = medir(lambda: [len([f for f in os.listdir(carpeta) if f.endswith(('.docx', '.pdf'))])
+                                         for carpeta in directorios.values()], opciones.repeticiones)
+        conteo_registro = medir(registro.conteos, opciones.repeticiones)
+
+    print(f"\n📊 {opciones.documentos} documentos (mediana de {opciones.repeticiones} repeticiones)\n")
+    print(f"   Listados con os.listdir + parseo (caché llena): {listado_anterior * 1000:8.1f} ms")
+    print(f"   Listados desde el registro:                     {listado_registro * 1000:8.1f} ms")
+    print(f"   Conteos con os.listdir:                         {conteo_anterior * 1000:8.2f} ms")
+    print(f"   Conteos desde el registro:                      {conteo_registro * 1000:8.2f} ms")
+    print(f"   Reconstrucción del registro (corpus cargado):   {reconstruccion * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark del índice de secciones canónicas del corpus histórico.
+
+Construye un corpus sintético de N ofertas cuyas secciones se titulan con variantes
+reales ("METODOLOGÍA", "3. Metodología de Trabajo", "IV. Metodolgía propuesta"...) y
+compara, para reunir los ejemplos de una sección:
+  - recorrer todos los títulos del corpus buscando la palabra clave como subcadena
+    (lo que hacían los helpers de generación)
+  - una consulta al índice por sección canónica
+Informa también el costo de indexar los títulos y cuántas secciones encuentra cada uno.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_secciones [--ofertas 10000] [--consultas 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from auto_ofertas.processors.secciones import IndiceSecciones
+
+# Variantes de título por sección canónica, con tildes, numeración y errores de tipeo
+VARIANTES = {
+    "metodologia": ["METODOLOGÍA", "Metodologia de Trabajo", "3. Metodología", "IV. Metodolgía propuesta",
+                    "Enfoque metodológico", "Plan de trabajo"],
+    "equipo": ["EQUIPO DE TRABAJO", "Equipo", "5. Equipo de trabajo y CVs", "Perfiles profesionales"],
+    "plan_implementacion": ["Plan de Implementación", "CRONOGRAMA", "Carta Gantt", "6. Roadmap y hitos"],
+    "factores_exito": ["Factores Claves para el Éxito", "FACTORES CRÍTICOS DE ÉXITO", "Supuestos"],
+    "presupuesto": ["Oferta Económica", "INVERSIÓN Y CONDICIONES DE PAGO", "Presupuesto"],
+}
+OTROS = ["Anexo 1", "Formularios", "Declaración jurada", "Bases administrativas"]
+
+# Palabra clave de cada sección para la búsqueda por subcadena
+CLAVES = {"metodologia": "metodolog", "equipo": "equipo", "plan_implementacion": "implementaci",
+          "factores_exito": "factores", "presupuesto": "presupuesto"}
+
+def percentil(valores, p: float) -> float:
+    valores = sorted(valores)
+    return valores[max(0, int(len(valores) * p) - 1)]
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--ofertas", type=int, default=10000)
+    argumentos.add_argument("--consultas", type=int, default=200)
+    opciones = argumentos.parse_args()
+
+    aleatorio = random.Random(5)
+    documentos = {}
+    esperadas = {canonica: 0 for canonica in VARIANTES}
+    for numero in range(opciones.ofertas):
+        titulos = [aleatorio.choice(OTROS) for _ in range(8)]
+        for canonica, variantes in VARIANTES.items():
+            if aleatorio.random() < 0.8:
+                titulos.append(aleatorio.choice(variantes))
+                esperadas[canonica] += 1
+        documentos[f"oferta_{numero}"] = titulos
+
+    indice = IndiceSecciones()
+    inicio = time.perf_counter()
+    for clave, titulos in documentos.items():
+        indice.agregar(clave, titulos)
+    construccion = time.perf_counter() - inicio
+
+    canonicas = list(VARIANTES)
+    latencias_recorrido, latencias_indice = [], []
+    for consulta in range(opciones.consultas):
+        canonica = canonicas[consulta % len(canonicas)]
+        inicio = time.perf_counter()
+        [(clave, titulo) for clave, titulos in documentos.items() for titulo in titulos
+         if CLAVES[canonica] in titulo.lower()]
+        latencias_recorrido.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        indice.titulos(canonica, 3)
+        latencias_indice.append(time.perf_counter() - inicio)
+
+    print(f"📊 {opciones.ofertas} ofertas, {sum(len(titulos) for titulos in documentos.values())} títulos\n")
+    print(f"   Indexación: {construccion:.2f}s ({construccion / opciones.ofertas * 1000:.3f}ms por documento)")
+    print(f"   Recorrido por subcadena: p50 {statistics.median(latencias_recorrido) * 1000:.2f}ms, "
+          f"p95 {percentil(latencias_recorrido, 0.95) * 1000:.2f}ms")
+    print(f"   Índice canónico:         p50 {statistics.median(latencias_indice) * 1000:.3f}ms, "
+          f"p95 {percentil(latencias_indice, 0.95) * 1000:.3f}ms")
+    print("\n   Documentos con la sección (esperados / subcadena / índice):")
+    conteos = indice.conteos()
+    for canonica in canonicas:
+        por_subcadena = sum(any(CLAVES[canonica] in titulo.lower() for titulo in titulos)
+                            for titulos in documentos.values())
+        print(f"     {canonica:<20} {esperadas[canonica]:>6} / {por_subcadena:>6} / {conteos.get(canonica, 0):>6}")
+
+if __name__ == "__main__":
+    main()
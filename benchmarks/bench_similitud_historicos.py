@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la similitud de una licitación nueva con el corpus histórico.
+
+Genera un corpus sintético con un vocabulario realista: `--vocabulario` palabras
+distintas con frecuencias de Zipf (unas pocas en casi todos los documentos y una
+cola larga de términos raros), `--tokens` palabras por documento y un 15% de
+palabras propias de uno de 8 temas. Mide el tiempo de construir la matriz TF-IDF
+hasheada y de puntuar una licitación contra todo el corpus, con la consulta
+limitada a sus características de mayor peso (MatrizTfidf.MAX_CARACTERISTICAS_CONSULTA)
+y recorriéndolas todas, la proporción de los k vecinos exactos que se recuperan
+(recall@k), la proporción de licitaciones cuyo documento más similar es de su
+mismo tema, y compara los puntajes con un coseno calculado documento por documento.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_similitud_historicos [--documentos 10000] [--consultas 50]
+        [--vocabulario 20000] [--tokens 800]
+"""
+
+import argparse
+import itertools
+import math
+import random
+import statistics
+import time
+
+from auto_ofertas.processors.busqueda import MatrizTfidf, frecuencias_terminos
+
+TEMAS = 8
+PALABRAS_POR_TEMA = 200
+PROPORCION_TEMA = 0.15
+EXPONENTE_ZIPF = 1.07
+K = 5
+
+def generar_vocabulario(aleatorio: random.Random, tamano: int) -> list:
+    """`tamano` palabras distintas de tres o cuatro sílabas (sobreviven a la tokenización)"""
+    silabas = [consonante + vocal for consonante in "bcdfglmnprstvz" for vocal in "aeiou"]
+    combinaciones = [("".join(s) for s in itertools.product(silabas, repeat=3)),
+                     ("".join(s) for s in itertools.product(silabas, repeat=4))]
+    palabras = list(itertools.islice(itertools.chain(*combinaciones), tamano * 2))
+    return aleatorio.sample(palabras, tamano)
+
+def coseno_directo(matriz: MatrizTfidf, consulta: dict, clave: str) -> float:
+    """Coseno TF-IDF recorriendo la fila del documento (referencia para verificar)"""
+    doc = matriz._ids[clave]
+    pesos_consulta = {c: p * matriz._idf_de(c) for c, p in matriz._vector(consulta).items()}
+    pesos_documento = {c: matriz._columnas[c][doc] * matriz._idf_de(c) for c in matriz._filas[doc]}
+    producto = sum(p * pesos_documento.get(c, 0.0) for c, p in pesos_consulta.items())
+    return producto / (math.sqrt(sum(p * p for p in pesos_consulta.values())) *
+                       math.sqrt(sum(p * p for p in pesos_documento.values())))
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--documentos", type=int, default=10000)
+    argumentos.add_argument("--consultas", type=int, default=50)
+    argumentos.add_argument("--vocabulario", type=int, default=20000)
+    argumentos.add_argument("--tokens", type=int, default=800)
+    opciones = argumentos.parse_args()
+
+    aleatorio = random.Random(11)
+    vocabulario = generar_vocabulario(aleatorio, opciones.vocabulario)
+    acumulados = list(itertools.accumulate(1 / rango ** EXPONENTE_ZIPF for rango in range(1, len(vocabulario) + 1)))
+    # Las palabras propias de cada tema salen de la cola (términos poco frecuentes en general)
+    cola = vocabulario[len(vocabulario) // 10:]
+    propias = [aleatorio.sample(cola, PALABRAS_POR_TEMA) for _ in range(TEMAS)]
+    de_tema = round(opciones.tokens * PROPORCION_TEMA)
+
+    def generar(tema: int) -> dict:
+        texto = (aleatorio.choices(vocabulario, cum_weights=acumulados, k=opciones.tokens - de_tema) +
+                 aleatorio.choices(propias[tema], k=de_tema))
+        return frecuencias_terminos(" ".join(texto))
+
+    tema_de = {}
+    frecuencias = {}
+    for numero in range(opciones.documentos):
+        clave = f"documento_{numero}"
+        tema_de[clave] = aleatorio.randrange(TEMAS)
+        frecuencias[clave] = generar(tema_de[clave])
+
+    # Como en la carga del corpus: el idf se recalcula una vez al final del lote
+    matriz = MatrizTfidf()
+    inicio = time.perf_counter()
+    for clave, terminos in frecuencias.items():
+        matriz.agregar(clave, terminos, diferir_idf=True)
+    matriz.recalcular_idf()
+    construccion = time.perf_counter() - inicio
+
+    latencias, latencias_completas = [], []
+    recuperados = 0
+    aciertos = 0
+    error_maximo = 0.0
+    for numero in range(opciones.consultas):
+        tema = numero % TEMAS
+        consulta = generar(tema)
+        inicio = time.perf_counter()
+        vecinos = matriz.similares(consulta, K)
+        latencias.append(time.perf_counter() - inicio)
+        # Referencia: la misma consulta con todas sus características
+        matriz.MAX_CARACTERISTICAS_CONSULTA = 0
+        inicio = time.perf_counter()
+        exactos = matriz.similares(consulta, K)
+        latencias_completas.append(time.perf_counter() - inicio)
+        del matriz.MAX_CARACTERISTICAS_CONSULTA
+        recuperados += len({clave for clave, _ in vecinos} & {clave for clave, _ in exactos})
+        aciertos += tema_de[vecinos[0][0]] == tema
+        for clave, similitud in vecinos:
+            error_maximo = max(error_maximo, abs(similitud - coseno_directo(matriz, consulta, clave)))
+
+    terminos = statistics.mean(len(f) for f in frecuencias.values())
+    print(f"📊 {opciones.documentos} documentos ({terminos:.0f} términos distintos de media, vocabulario de "
+          f"{opciones.vocabulario}), {opciones.consultas} licitaciones de {TEMAS} temas")
+    print(f"   Construcción de la matriz:            {construccion:.2f}s")
+    print(f"   Puntuar contra todo el corpus:        {statistics.median(latencias) * 1000:.1f}ms mediana, "
+          f"{max(latencias) * 1000:.1f}ms máx. ({MatrizTfidf.MAX_CARACTERISTICAS_CONSULTA} características)")
+    print(f"   Con todas las características:        {statistics.median(latencias_completas) * 1000:.1f}ms mediana, "
+          f"{max(latencias_completas) * 1000:.1f}ms máx.")
+    print(f"   Vecinos exactos recuperados (@{K}):     {recuperados / (opciones.consultas * K):.0%}")
+    print(f"   Más similar del mismo tema:           {aciertos / opciones.consultas:.0%}")
+    print(f"   Diferencia con el coseno directo:     {error_maximo:.2e}")
+
+if __name__ == "__main__":
+    main()
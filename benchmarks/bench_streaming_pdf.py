@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria y tiempo del parseo de PDFs grandes.
+
+Para cada cantidad de páginas genera un PDF sintético y lo parsea en un proceso
+nuevo, reportando el tiempo y el pico de memoria residente (RSS) de:
+  - streaming: parse_licitacion_dinamica (extracción página a página hacia el
+    detector incremental de secciones)
+  - texto_completo: extraer_texto_pdf seguido del seccionado del texto completo
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_streaming_pdf [--paginas 50 200 1000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.fixtures import generar_pdf
+
+CODIGO_HIJO = """
+import json, resource, sys, time
+from auto_ofertas.processors.parser import parse_licitacion_dinamica, extraer_texto_pdf, seccionar_texto
+modo, path = sys.argv[1], sys.argv[2]
+inicio = time.perf_counter()
+if modo == "streaming":
+    secciones = parse_licitacion_dinamica(path, usar_cache=False)
+else:
+    secciones = seccionar_texto([extraer_texto_pdf(path)])
+tiempo = time.perf_counter() - inicio
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"tiempo": tiempo, "rss_mb": rss_mb, "secciones": len(secciones)}))
+"""
+
+def medir(modo: str, path: str) -> dict:
+    """Parsea el archivo en un proceso nuevo para aislar el pico de memoria"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_HIJO, modo, path],
+        cwd=raiz, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--paginas", type=int, nargs="+", default=[50, 200, 1000])
+    opciones = argumentos.parse_args()
+
+    print(f"{'páginas':>8} {'modo':>15} {'tiempo (s)':>11} {'RSS pico (MB)':>14} {'secciones':>10}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for paginas in opciones.paginas:
+            path = generar_pdf(os.path.join(directorio, f"licitacion_{paginas}.pdf"), paginas)
+            for modo in ("streaming", "texto_completo"):
+                resultado = medir(modo, path)
+                print(f"{paginas:>8} {modo:>15} {resultado['tiempo']:>11.2f} "
+                      f"{resultado['rss_mb']:>14.1f} {resultado['secciones']:>10}")
+
+if __name__ == "__main__":
+    main()
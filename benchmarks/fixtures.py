@@ -0,0 +1,155 @@
+"""
+Generación de documentos sintéticos (licitaciones) para los benchmarks del parser
+"""
+
+import random
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+PALABRAS = (
+    "el proveedor deberá entregar los informes mensuales según lo indicado en las "
+    "bases técnicas del servicio contratado para la institución durante la ejecución "
+    "del contrato y sus respectivas garantías de calidad con plazos definidos"
+).split()
+
+TITULOS = [
+    "Objetivo General", "Alcance del Servicio", "Requisitos Técnicos",
+    "Metodología de Trabajo", "Cronograma", "Equipo de Trabajo", "Garantías",
+]
+
+def frase(aleatorio: random.Random, minimo: int = 8, maximo: int = 16) -> str:
+    """Genera una frase de cuerpo de texto que no es detectada como título"""
+    palabras = [aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(minimo, maximo))]
+    return " ".join(palabras) + "."
+
+def generar_pdf(path: str, paginas: int, lineas_por_pagina: int = 45, semilla: int = 42,
+                paginas_modificadas=()) -> str:
+    """
+    Genera un PDF con capa de texto, con un título numerado cada pocas páginas.
+    `paginas_modificadas` (base 0) simula una errata: esas páginas cambian de texto y
+    las demás quedan idénticas a las generadas con la misma semilla.
+    """
+    aleatorio = random.Random(semilla)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    _, alto = A4
+    for numero in range(paginas):
+        y = alto - 50
+        if numero % 3 == 0:
+            pdf.drawString(50, y, f"{numero // 3 + 1}. {aleatorio.choice(TITULOS)}")
+            y -= 16
+        for _ in range(lineas_por_pagina):
+            texto = frase(aleatorio)
+            if numero in paginas_modificadas:
+                texto = "Errata: " + texto
+            pdf.drawString(50, y, texto)
+            y -= 16
+        pdf.showPage()
+    pdf.save()
+    return path
+
+def generar_docx(path: str, parrafos: int, tablas: int = 0, filas_por_tabla: int = 200,
+                 columnas: int = 5, semilla: int = 42) -> str:
+    """Genera un DOCX con títulos, párrafos de cuerpo y tablas grandes"""
+    from docx import Document
+
+    aleatorio = random.Random(semilla)
+    doc = Document()
+    for numero in range(parrafos):
+        if numero % 20 == 0:
+            doc.add_heading(f"{numero // 20 + 1}. {aleatorio.choice(TITULOS)}", level=1)
+        doc.add_paragraph(frase(aleatorio))
+    for _ in range(tablas):
+        tabla = doc.add_table(rows=filas_por_tabla, cols=columnas)
+        # Table._cells calcula la grilla una sola vez (row.cells la recalcula por fila)
+        for celda in tabla._cells:
+            celda.text = frase(aleatorio, 2, 6)
+    doc.sections[0].header.paragraphs[0].text = "Licitación pública de servicios"
+    doc.sections[0].footer.paragraphs[0].text = "Documento sintético de benchmark"
+    doc.save(path)
+    return path
+
+# Formas de documento para la suite de benchmarks
+FORMAS = ("lineas_cortas", "tablas_grandes", "parrafos_largos", "muchos_headers")
+
+def generar_docx_forma(path: str, forma: str, escala: int = 1, semilla: int = 42) -> str:
+    """Genera un DOCX con la forma indicada; `escala` multiplica su tamaño"""
+    from docx import Document
+    from docx.enum.section import WD_SECTION
+
+    if forma == "tablas_grandes":
+        return generar_docx(path, 20 * escala, tablas=escala, filas_por_tabla=300, columnas=6, semilla=semilla)
+
+    aleatorio = random.Random(semilla)
+    doc = Document()
+    if forma == "lineas_cortas":
+        for numero in range(400 * escala):
+            if numero % 40 == 0:
+                doc.add_heading(aleatorio.choice(TITULOS), level=1)
+            doc.add_paragraph(frase(aleatorio, 2, 5))
+    elif forma == "parrafos_largos":
+        for numero in range(40 * escala):
+            if numero % 5 == 0:
+                doc.add_heading(aleatorio.choice(TITULOS), level=1)
+            doc.add_paragraph(" ".join(frase(aleatorio) for _ in range(30)))
+    elif forma == "muchos_headers":
+        for numero in range(20 * escala):
+            seccion = doc.sections[0] if numero == 0 else doc.add_section(WD_SECTION.NEW_PAGE)
+            seccion.header.is_linked_to_previous = False
+            seccion.footer.is_linked_to_previous = False
+            seccion.header.paragraphs[0].text = f"Licitación pública - capítulo {numero + 1}"
+            seccion.footer.paragraphs[0].text = f"Página {numero + 1} - documento de benchmark"
+            doc.add_heading(aleatorio.choice(TITULOS), level=1)
+            for _ in range(10):
+                doc.add_paragraph(frase(aleatorio))
+    else:
+        raise ValueError(f"Forma de documento desconocida: {forma}")
+    doc.save(path)
+    return path
+
+def generar_pdf_forma(path: str, forma: str, escala: int = 1, semilla: int = 42) -> str:
+    """Genera un PDF con la forma indicada; `escala` multiplica su número de páginas"""
+    aleatorio = random.Random(semilla)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    ancho, alto = A4
+    for numero in range(5 * escala):
+        y = alto - 50
+        if forma == "lineas_cortas":
+            pdf.setFont("Helvetica", 8)
+            for indice in range(90):
+                texto = aleatorio.choice(TITULOS) if indice % 30 == 0 else frase(aleatorio, 2, 5)
+                pdf.drawString(50, y, texto)
+                y -= 8.5
+        elif forma == "tablas_grandes":
+            pdf.setFont("Helvetica", 7)
+            columnas = 6
+            ancho_columna = (ancho - 80) / columnas
+            for _ in range(60):
+                for columna in range(columnas):
+                    pdf.drawString(40 + columna * ancho_columna + 2, y, frase(aleatorio, 1, 3)[:28])
+                pdf.line(40, y - 3, ancho - 40, y - 3)
+                y -= 12
+        elif forma == "parrafos_largos":
+            pdf.setFont("Helvetica", 7)
+            texto = pdf.beginText(40, y)
+            for _ in range(80):
+                linea = ""
+                while len(linea) < 130:
+                    linea += frase(aleatorio) + " "
+                texto.textLine(linea)
+            pdf.drawText(texto)
+        elif forma == "muchos_headers":
+            pdf.setFont("Helvetica", 8)
+            pdf.drawString(50, alto - 30, f"Licitación pública - capítulo {numero + 1}")
+            pdf.drawString(50, 25, f"Página {numero + 1} - documento de benchmark")
+            if numero % 2 == 0:
+                pdf.drawString(50, y, f"{numero // 2 + 1}. {aleatorio.choice(TITULOS)}")
+                y -= 12
+            for _ in range(50):
+                pdf.drawString(50, y, frase(aleatorio))
+                y -= 12
+        else:
+            raise ValueError(f"Forma de documento desconocida: {forma}")
+        pdf.showPage()
+    pdf.save()
+    return path
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del parser con detección de regresiones.
+
+Genera licitaciones sintéticas (python-docx y reportlab) de varias formas
+(líneas cortas, tablas grandes, párrafos largos, muchos headers/footers) y
+tamaños, y mide sobre cada una extraer_texto_docx / extraer_texto_pdf y
+parse_licitacion_dinamica (sin cachés de parseo ni de páginas). Cada caso corre
+en un proceso nuevo y reporta throughput (MB/s del archivo de entrada), latencia
+p50/p95 y pico de memoria residente (RSS).
+
+Los resultados se guardan en JSON y se comparan con una baseline versionada
+(benchmarks/baseline.json): la suite termina con código 1 si algún caso es más
+lento o usa más memoria que la baseline por encima de la tolerancia, y con código 2
+sin comparar si la baseline se midió con otra versión del parser (hay que
+regenerarla).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.suite [--tamanos pequeno mediano] [--repeticiones 5]
+    python -m benchmarks.suite --actualizar-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from auto_ofertas.processors.parser import PARSER_VERSION, _firma_consolidacion
+from benchmarks.fixtures import FORMAS, generar_docx_forma, generar_pdf_forma
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(RAIZ, "benchmarks", "baseline.json")
+SALIDA = os.path.join(RAIZ, "benchmarks", "resultados", "ultimo.json")
+
+# Factor de escala de cada tamaño (páginas de PDF = 5 x escala)
+TAMANOS = {"pequeno": 1, "mediano": 4, "grande": 16}
+
+FUNCIONES = {
+    "docx": ("extraer_texto_docx", "parse_licitacion_dinamica"),
+    "pdf": ("extraer_texto_pdf", "parse_licitacion_dinamica"),
+}
+
+CODIGO_HIJO = """
+import json, resource, sys, time
+from auto_ofertas.processors import parser
+funcion, path, repeticiones = sys.argv[1], sys.argv[2], int(sys.argv[3])
+if funcion == "parse_licitacion_dinamica":
+    ejecutar = lambda: parser.parse_licitacion_dinamica(path, usar_cache=False)
+else:
+    ejecutar = lambda: getattr(parser, funcion)(path)
+ejecutar()  # calentamiento
+latencias = []
+for _ in range(repeticiones):
+    inicio = time.perf_counter()
+    ejecutar()
+    latencias.append(time.perf_counter() - inicio)
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"latencias": latencias, "rss_mb": rss_mb}))
+"""
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados) + 0.5)) - 1))
+    return ordenados[indice]
+
+def medir_caso(funcion: str, path: str, repeticiones: int) -> dict:
+    """Ejecuta un caso en un proceso nuevo para aislar el pico de memoria"""
+    # Sin cachés: cada repetición extrae y parsea de nuevo y no se escribe nada en
+    # uploads/.cache. Por entorno, para que también lo vean los workers de parseo aislado
+    entorno = dict(os.environ, PARSE_CACHE_ACTIVA="false", PAGINAS_CACHE_ACTIVA="false")
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_HIJO, funcion, path, str(repeticiones)],
+        cwd=RAIZ, capture_output=True, text=True, check=True, env=entorno
+    )
+    medicion = json.loads(salida.stdout.strip().splitlines()[-1])
+    latencias = medicion["latencias"]
+    tamano_mb = os.path.getsize(path) / 1024 / 1024
+    return {
+        "p50_s": round(percentil(latencias, 50), 5),
+        "p95_s": round(percentil(latencias, 95), 5),
+        "throughput_mb_s": round(tamano_mb * len(latencias) / sum(latencias), 4),
+        "rss_mb": round(medicion["rss_mb"], 1),
+        "tamano_archivo_kb": round(tamano_mb * 1024, 1),
+    }
+
+def version_parser() -> str:
+    """Versión del parser y de la configuración de consolidación que se mide"""
+    return f"{PARSER_VERSION}{_firma_consolidacion()}"
+
+def commit_actual() -> str:
+    """Commit del repositorio (con `-modificado` si hay cambios sin confirmar) o None"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-modificado" if cambios else commit
+
+def ejecutar_suite(tamanos: list, repeticiones: int, formas: list) -> dict:
+    casos = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamano in tamanos:
+            escala = TAMANOS[tamano]
+            for forma in formas:
+                for formato, generador in (("docx", generar_docx_forma), ("pdf", generar_pdf_forma)):
+                    path = generador(os.path.join(directorio, f"{forma}_{tamano}.{formato}"), forma, escala)
+                    for funcion in FUNCIONES[formato]:
+                        nombre = f"{formato}/{forma}/{tamano}/{funcion}"
+                        casos[nombre] = medir_caso(funcion, path, repeticiones)
+                        r = casos[nombre]
+                        print(f"{nombre:<60} p50 {r['p50_s']:>8.4f}s  p95 {r['p95_s']:>8.4f}s  "
+                              f"{r['throughput_mb_s']:>8.3f} MB/s  RSS {r['rss_mb']:>6.1f} MB")
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "version_parser": version_parser(),
+        "commit": commit_actual(),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeticiones": repeticiones,
+        "casos": casos,
+    }
+
+def comparar(resultados: dict, baseline: dict, tolerancia: float, tolerancia_memoria: float) -> list:
+    """Devuelve la lista de regresiones respecto a la baseline"""
+    regresiones = []
+    print(f"\n{'caso':<60} {'p50 vs base':>12} {'RSS vs base':>12}")
+    for nombre, actual in resultados["casos"].items():
+        base = baseline["casos"].get(nombre)
+        if base is None:
+            print(f"{nombre:<60} {'(sin baseline)':>25}")
+            continue
+        delta_tiempo = actual["p50_s"] / base["p50_s"] - 1 if base["p50_s"] else 0.0
+        delta_memoria = actual["rss_mb"] / base["rss_mb"] - 1 if base["rss_mb"] else 0.0
+        marca = ""
+        if delta_tiempo > tolerancia:
+            regresiones.append(f"{nombre}: p50 {base['p50_s']:.4f}s -> {actual['p50_s']:.4f}s")
+            marca += " ⚠️ tiempo"
+        if delta_memoria > tolerancia_memoria:
+            regresiones.append(f"{nombre}: RSS {base['rss_mb']:.1f} MB -> {actual['rss_mb']:.1f} MB")
+            marca += " ⚠️ memoria"
+        print(f"{nombre:<60} {delta_tiempo:>+11.1%} {delta_memoria:>+11.1%}{marca}")
+    return regresiones
+
+def main():
+    argumentos = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos.add_argument("--tamanos", nargs="+", choices=list(TAMANOS), default=["pequeno", "mediano"])
+    argumentos.add_argument("--formas", nargs="+", choices=list(FORMAS), default=list(FORMAS))
+    argumentos.add_argument("--repeticiones", type=int, default=5)
+    argumentos.add_argument("--salida", default=SALIDA, help="JSON donde guardar los resultados")
+    argumentos.add_argument("--baseline", default=BASELINE, help="JSON de referencia para comparar")
+    argumentos.add_argument("--tolerancia", type=float, default=0.25,
+                            help="aumento máximo aceptado de la latencia p50 (0.25 = 25%%)")
+    argumentos.add_argument("--tolerancia-memoria", type=float, default=0.15,
+                            help="aumento máximo aceptado del pico de RSS (0.15 = 15%%)")
+    argumentos.add_argument("--actualizar-baseline", action="store_true",
+                            help="guardar los resultados como nueva baseline")
+    opciones = argumentos.parse_args()
+
+    resultados = ejecutar_suite(opciones.tamanos, opciones.repeticiones, opciones.formas)
+
+    os.makedirs(os.path.dirname(os.path.abspath(opciones.salida)), exist_ok=True)
+    with open(opciones.salida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en {opciones.salida}")
+
+    if opciones.actualizar_baseline:
+        with open(opciones.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"📌 Baseline actualizada: {opciones.baseline}")
+        return
+
+    if not os.path.exists(opciones.baseline):
+        print("Sin baseline para comparar (usar --actualizar-baseline para crearla)")
+        return
+    with open(opciones.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version_parser") != resultados["version_parser"]:
+        print(f"\n⛔ La baseline ({baseline.get('commit') or 'commit desconocido'}) se midió con la versión "
+              f"{baseline.get('version_parser') or 'desconocida'} del parser y la actual es "
+              f"{resultados['version_parser']}: no se compara. Regenerarla con --actualizar-baseline")
+        sys.exit(2)
+    regresiones = comparar(resultados, baseline, opciones.tolerancia, opciones.tolerancia_memoria)
+    if regresiones:
+        print("\n❌ Regresiones respecto a la baseline:")
+        for regresion in regresiones:
+            print(f"   {regresion}")
+        sys.exit(1)
+    print("\n✅ Sin regresiones respecto a la baseline")
+
+if __name__ == "__main__":
+    main()